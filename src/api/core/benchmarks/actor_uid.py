@@ -0,0 +1,71 @@
+"""Benchmark the `actor.uid` column computation.
+
+Usage:
+
+    python core/benchmarks/actor_uid.py --statements 1000000
+"""
+
+import hashlib
+import time
+from typing import Callable, Literal, Tuple
+
+import click
+import numpy as np
+import pandas as pd
+from warren.conf import settings
+from warren.xapi import StatementsTransformer
+
+
+def add_actor_uid_column_apply(statements: pd.DataFrame) -> pd.DataFrame:
+    """Former row-wise implementation, kept as a reference."""
+    statements = statements.copy()
+    columns = settings.XAPI_ACTOR_IDENTIFIER_PATHS.intersection(statements.columns)
+
+    def get_uid(row):
+        return hashlib.sha256(
+            "-".join([str(row[col]) for col in columns]).encode()
+        ).hexdigest()
+
+    statements["actor.uid"] = statements.apply(get_uid, axis=1)
+    return statements
+
+
+def build_statements(size: int, actors: int) -> pd.DataFrame:
+    """Build normalized statements with `size` rows and `actors` distinct agents."""
+    names = np.random.default_rng(42).integers(0, actors, size=size)
+    return pd.DataFrame(
+        {
+            "actor.account.name": pd.Series(names).map("student-{}".format),
+            "actor.account.homePage": "http://fun-mooc.fr",
+            "verb.id": "https://w3id.org/xapi/video/verbs/played",
+        }
+    )
+
+
+def timeit(func: Callable, statements: pd.DataFrame) -> float:
+    """Return `func` execution time in seconds."""
+    start = time.perf_counter()
+    func(statements)
+    return time.perf_counter() - start
+
+
+@click.command()
+@click.option("--statements", "size", default=1_000_000, help="Statements count.")
+@click.option("--actors", default=10_000, help="Distinct actors count.")
+def main(size: int, actors: int):
+    """Compare actor uid implementations."""
+    statements = build_statements(size, actors)
+    click.echo(f"{size} statements, {actors} actors")
+
+    click.echo(
+        f"apply (sha256):      {timeit(add_actor_uid_column_apply, statements):.2f}s"
+    )
+    algorithms: Tuple[Literal["sha256", "blake2b"], ...] = ("sha256", "blake2b")
+    for algorithm in algorithms:
+        settings.XAPI_ACTOR_UID_HASH = algorithm
+        elapsed = timeit(StatementsTransformer.add_actor_uid_column, statements)
+        click.echo(f"vectorized ({algorithm}): {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""Benchmark cache hits of non-incremental indicators endpoints.
+
+Compare returning the cached document parsed to the indicator return type
+(and serialized back to JSON by FastAPI) with returning it as is.
+
+Usage:
+
+    python core/benchmarks/cache_hit.py --requests 1000 --activities 50
+"""
+
+import asyncio
+import datetime
+import json
+import time
+from typing import Callable, List
+
+import click
+import httpx
+from fastapi import FastAPI, Response
+from pydantic.json import pydantic_encoder
+from warren.models import DailyCount, DailyCounts
+
+
+def build_document(activities: int, days: int) -> List[dict]:
+    """Build a cached course views document."""
+    start = datetime.date(2023, 1, 1)
+    views = DailyCounts(
+        total=days,
+        counts=[
+            DailyCount(date=start + datetime.timedelta(days=day), count=1)
+            for day in range(days)
+        ],
+    )
+    return [
+        {"iri": f"uuid://activity-{index}", "modname": "mod_url", "views": views}
+        for index in range(activities)
+    ]
+
+
+def build_app(cached: str) -> FastAPI:
+    """Build an application serving the cached document."""
+    app = FastAPI()
+
+    @app.get("/parsed")
+    async def parsed():
+        return [
+            {**activity, "views": DailyCounts.parse_obj(activity["views"])}
+            for activity in json.loads(cached)
+        ]
+
+    @app.get("/raw")
+    async def raw():
+        return Response(content=cached, media_type="application/json")
+
+    return app
+
+
+async def timeit(get: Callable, url: str, requests: int):
+    """Return wall and CPU times (in seconds) of `requests` GET requests."""
+    start, cpu = time.perf_counter(), time.process_time()
+    for _ in range(requests):
+        response = await get(url)
+        response.raise_for_status()
+    return time.perf_counter() - start, time.process_time() - cpu
+
+
+async def run(requests: int, activities: int, days: int):
+    """Run the benchmark."""
+    cached = json.dumps(build_document(activities, days), default=pydantic_encoder)
+    # Starlette and httpx ASGI application signatures differ in their typing only
+    transport = httpx.ASGITransport(app=build_app(cached))  # type: ignore[arg-type]
+    async with httpx.AsyncClient(transport=transport, base_url="http://t") as client:
+        for url in ("/parsed", "/raw"):
+            elapsed, cpu = await timeit(client.get, url, requests)
+            click.echo(
+                f"{url:8} {elapsed / requests * 1000:.2f}ms/request "
+                f"({cpu:.2f}s CPU)"
+            )
+
+
+@click.command()
+@click.option("--requests", default=1_000, help="Requests count.")
+@click.option("--activities", default=50, help="Course activities count.")
+@click.option("--days", default=30, help="Days count per activity.")
+def main(requests: int, activities: int, days: int):
+    """Compare parsed and raw cache hits responses."""
+    click.echo(f"{requests} requests, {activities} activities, {days} days")
+    asyncio.run(run(requests, activities, days))
+
+
+if __name__ == "__main__":
+    main()
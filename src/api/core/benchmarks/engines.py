@@ -0,0 +1,86 @@
+"""Benchmark dataframe engines on daily event indicators.
+
+Usage:
+
+    python core/benchmarks/engines.py --statements 100000
+"""
+
+import copy
+import importlib.util
+import time
+from typing import Literal, Tuple
+
+import click
+from warren.conf import settings
+from warren.factories.base import BaseXapiStatementFactory
+from warren.filters import DatetimeRange
+from warren.indicators import DailyEvent, DailyUniqueEvent
+
+VERB_ID = "https://w3id.org/xapi/video/verbs/played"
+
+
+class DailyPlays(DailyEvent):
+    """Daily plays indicator."""
+
+    verb_id = VERB_ID
+
+
+class DailyUniquePlays(DailyUniqueEvent):
+    """Daily unique plays indicator."""
+
+    verb_id = VERB_ID
+
+
+def build_statements(size: int, actors: int) -> list:
+    """Build `size` raw statements for `actors` distinct agents over 28 days."""
+    template = BaseXapiStatementFactory.build(
+        mutations=[{"verb": {"id": VERB_ID}}]
+    ).dict()
+    statements = []
+    for index in range(size):
+        statement = copy.deepcopy(template)
+        statement["timestamp"] = (
+            f"2023-01-{index % 28 + 1:02d}T{index % 24:02d}:00:00+00:00"
+        )
+        statement["actor"] = {
+            "objectType": "Agent",
+            "account": {
+                "name": f"student-{index % actors}",
+                "homePage": "http://fun-mooc.fr",
+            },
+        }
+        statements.append(statement)
+    return statements
+
+
+@click.command()
+@click.option("--statements", "size", default=100_000, help="Statements count.")
+@click.option("--actors", default=1_000, help="Distinct actors count.")
+def main(size: int, actors: int):
+    """Compare dataframe engines on the same synthetic statements."""
+    statements = build_statements(size, actors)
+    span_range = DatetimeRange(
+        since="2023-01-01T00:00:00+02:00", until="2023-01-28T23:59:59+02:00"
+    )
+    click.echo(f"{size} statements, {actors} actors")
+
+    engines: Tuple[Literal["pandas", "polars", "pyarrow"], ...] = (
+        "pandas",
+        "polars",
+        "pyarrow",
+    )
+    for engine in engines:
+        if engine != "pandas" and importlib.util.find_spec(engine) is None:
+            click.echo(f"{engine}: not installed")
+            continue
+        settings.DATAFRAME_ENGINE = engine
+        for klass in (DailyPlays, DailyUniquePlays):
+            indicator = klass(object_id="uuid://foo", span_range=span_range)
+            start = time.perf_counter()
+            indicator.compute_from_statements(statements)
+            elapsed = time.perf_counter() - start
+            click.echo(f"{engine} {klass.__name__}: {elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
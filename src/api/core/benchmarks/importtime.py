@@ -0,0 +1,46 @@
+"""Benchmark Warren modules import time.
+
+Usage:
+
+    python core/benchmarks/importtime.py --module warren.cli --module warren.api
+"""
+
+import subprocess
+import sys
+from typing import Dict, Tuple
+
+import click
+
+
+def importtime(module: str) -> Dict[str, int]:
+    """Get the cumulative import time (in µs) of modules imported by `module`."""
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    timings = {}
+    for line in output.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        timings[name.strip()] = int(cumulative)
+    return timings
+
+
+@click.command()
+@click.option("--module", "modules", multiple=True, default=("warren.cli",))
+@click.option("--top", default=10, help="Slowest imported modules to display.")
+def main(modules: Tuple[str, ...], top: int):
+    """Display the import time of `modules` and their slowest dependencies."""
+    for module in modules:
+        timings = importtime(module)
+        click.echo(f"{module}: {timings[module] / 1e6:.3f}s")
+        slowest = sorted(timings.items(), key=lambda item: item[1], reverse=True)
+        for name, cumulative in slowest[1 : top + 1]:
+            click.echo(f"  {cumulative / 1e6:.3f}s {name}")
+
+
+if __name__ == "__main__":
+    main()
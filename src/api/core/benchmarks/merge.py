@@ -0,0 +1,148 @@
+"""Benchmark merging daily counts of cached frames.
+
+Usage:
+
+    python core/benchmarks/merge.py --days 365 --users 200000 --active 1000
+
+Execution times, peak memory allocations (`tracemalloc`) and cached frames
+sizes are reported.
+"""
+
+import datetime
+import hashlib
+import json
+import time
+import tracemalloc
+from functools import reduce
+from itertools import groupby
+from typing import Any, Callable, List, Set, Tuple
+
+import click
+import numpy as np
+from warren.models import (
+    DailyCounts,
+    DailyCountsArray,
+    DailyUniqueCount,
+    DailyUniqueCounts,
+    DailyUniqueCountsArray,
+)
+
+
+def merge_counts_groupby(a: DailyCounts, b: DailyCounts) -> DailyCounts:
+    """Former pairwise implementation, kept as a reference."""
+    counts = sorted(a.counts + b.counts, key=lambda x: x.date)
+    a.counts = [
+        reduce(lambda x, y: x + y, v) for _, v in groupby(counts, lambda dc: dc.date)
+    ]
+    a.total = sum(dc.count for dc in a.counts)
+    return a
+
+
+def merge_unique_counts_sets(
+    a: DailyUniqueCounts, b: DailyUniqueCounts
+) -> DailyUniqueCounts:
+    """Former pairwise implementation using users sets, kept as a reference."""
+    counts = sorted(a.counts + b.counts, key=lambda x: x.date)
+    a.counts = [
+        reduce(lambda x, y: x + y, v) for _, v in groupby(counts, lambda dc: dc.date)
+    ]
+    users: Set[str] = set()
+    a.total = 0
+    for count in a.counts:
+        count.users = count.users - users
+        count.count = len(count.users)
+        a.total += count.count
+        users |= count.users
+    return a
+
+
+def build_frames(days: int, users: int, active: int) -> List[DailyUniqueCounts]:
+    """Build a daily unique counts frame per day, with `active` users a day."""
+    rng = np.random.default_rng(42)
+    start = datetime.date(2023, 1, 1)
+    # Actors uids are sha256 hexadecimal digests
+    uids = [hashlib.sha256(f"user-{u}".encode()).hexdigest() for u in range(users)]
+    frames = []
+    for day in range(days):
+        day_users = {uids[u] for u in rng.integers(0, users, size=active)}
+        frames.append(
+            DailyUniqueCounts(
+                total=len(day_users),
+                counts=[
+                    DailyUniqueCount(
+                        date=start + datetime.timedelta(days=day),
+                        count=len(day_users),
+                        users=day_users,
+                    )
+                ],
+            )
+        )
+    return frames
+
+
+def timeit(func: Callable, *args) -> float:
+    """Return `func` execution time in seconds."""
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def profile(func: Callable, *args) -> Tuple[Any, float, float]:
+    """Return `func` result, execution time (seconds) and peak memory (MiB)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak / 2**20
+
+
+@click.command()
+@click.option("--days", default=365, help="Cached frames (days) count.")
+@click.option("--users", default=200_000, help="Distinct users pool size.")
+@click.option("--active", default=1_000, help="Active users per day.")
+def main(days: int, users: int, active: int):
+    """Compare daily counts merging implementations."""
+    unique_frames = build_frames(days, users, active)
+    frames = [frame.to_daily_counts() for frame in unique_frames]
+    click.echo(f"{days} frames, {users} users pool, {active} active users a day")
+
+    elapsed = timeit(lambda: reduce(merge_counts_groupby, [f.copy() for f in frames]))
+    click.echo(f"daily counts groupby:       {elapsed:.2f}s")
+    elapsed = timeit(
+        lambda: DailyCountsArray.sum(
+            DailyCountsArray.from_counts(frame.counts) for frame in frames
+        ).to_daily_counts()
+    )
+    click.echo(f"daily counts array:         {elapsed:.2f}s")
+
+    copies = [frame.copy(deep=True) for frame in unique_frames]
+    sets, elapsed, peak = profile(lambda: reduce(merge_unique_counts_sets, copies))
+    click.echo(f"daily unique counts sets:   {elapsed:.2f}s, {peak:.0f} MiB peak")
+
+    # Cached frames store interned users ids (interned in memory here)
+    uids = dict(
+        enumerate(sorted({u for f in unique_frames for u in f.counts[0].users}))
+    )
+    ids = {uid: user for user, uid in uids.items()}
+    values = [
+        DailyUniqueCountsArray.from_counts(frame.counts, ids).to_cached_value()
+        for frame in unique_frames
+    ]
+    array, elapsed, peak = profile(
+        lambda: DailyUniqueCountsArray.sum(
+            DailyUniqueCountsArray.from_cached_value(value) for value in values
+        ).to_daily_unique_counts(uids)
+    )
+    click.echo(f"daily unique counts array:  {elapsed:.2f}s, {peak:.0f} MiB peak")
+    assert array.total == sets.total  # noqa: S101
+
+    size = sum(len(frame.json()) for frame in unique_frames) / 2**20
+    click.echo(f"cached users uids:          {size:.1f} MiB")
+    size = sum(len(json.dumps(value)) for value in values) / 2**20
+    click.echo(f"cached users ids:           {size:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Benchmark statements normalization.
+
+Usage:
+
+    python core/benchmarks/normalize.py --statements 100000
+"""
+
+import copy
+import time
+
+import click
+from warren.factories.base import BaseXapiStatementFactory
+from warren.indicators.mixins import BaseDailyEvent
+from warren.xapi import StatementsTransformer
+
+
+def build_statements(size: int, actors: int) -> list:
+    """Build `size` raw statements for `actors` distinct agents."""
+    template = BaseXapiStatementFactory.build().dict()
+    statements = []
+    for index in range(size):
+        statement = copy.deepcopy(template)
+        statement["timestamp"] = f"2023-01-{index % 28 + 1:02d}T10:00:00+00:00"
+        statement["actor"] = {
+            "objectType": "Agent",
+            "account": {
+                "name": f"student-{index % actors}",
+                "homePage": "http://fun-mooc.fr",
+            },
+        }
+        statements.append(statement)
+    return statements
+
+
+@click.command()
+@click.option("--statements", "size", default=100_000, help="Statements count.")
+@click.option("--actors", default=1_000, help="Distinct actors count.")
+def main(size: int, actors: int):
+    """Compare preprocessing with pd.json_normalize and the columnar normalizer."""
+    statements = build_statements(size, actors)
+    click.echo(f"{size} statements, {actors} actors")
+
+    start = time.perf_counter()
+    StatementsTransformer.preprocess(statements)
+    click.echo(f"json_normalize: {time.perf_counter() - start:.2f}s")
+
+    start = time.perf_counter()
+    StatementsTransformer.preprocess(statements, paths=BaseDailyEvent.statement_paths)
+    click.echo(f"columnar:       {time.perf_counter() - start:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
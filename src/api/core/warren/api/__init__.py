@@ -10,6 +10,8 @@ from sentry_sdk.integrations.starlette import StarletteIntegration
 
 from warren.conf import settings
 from warren.db import get_engine
+from warren.indicators.jobs import workers
+from warren.tracing import ServerTimingMiddleware
 
 from .. import __version__
 from .health import router as health_router
@@ -32,7 +34,9 @@ async def lifespan(app: FastAPI):
                 FastApiIntegration(),
             ],
         )
+    workers.start()
     yield
+    await workers.stop()
     engine.dispose()
 
 
@@ -43,9 +47,14 @@ app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.ALLOWED_HOSTS,
     allow_credentials=True,
-    allow_methods=["GET"],
+    # Indicators batches, jobs and top rankings are requested with POST
+    allow_methods=["GET", "POST"],
     allow_headers=["*"],
+    # Response headers read by API clients (HTTP cache validators, admission
+    # control, tracing and keyset pagination)
+    expose_headers=["ETag", "Retry-After", "Server-Timing", "X-Next-Cursor"],
 )
+app.add_middleware(ServerTimingMiddleware)
 
 # Health checks
 app.include_router(health_router)
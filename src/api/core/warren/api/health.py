@@ -3,11 +3,13 @@
 import logging
 
 from fastapi import APIRouter, Response, status
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
 from pydantic import BaseModel
 from ralph.backends.data.base import DataBackendStatus
 
-from warren.backends import lrs_client
+from warren.backends import get_lrs_client
 from warren.db import is_alive as is_db_alive
+from warren.metrics import get_registry
 
 logger = logging.getLogger(__name__)
 
@@ -45,8 +47,19 @@ async def heartbeat(response: Response) -> Heartbeat:
     """
     statuses = Heartbeat(
         data=DataBackendStatus.OK if is_db_alive() else DataBackendStatus.ERROR,
-        lrs=await lrs_client.status(),
+        lrs=await get_lrs_client().status(),
     )
     if not statuses.is_alive:
         response.status_code = status.HTTP_500_INTERNAL_SERVER_ERROR
     return statuses
+
+
+@router.get("/__metrics__")
+async def metrics() -> Response:
+    """Prometheus metrics.
+
+    Return metrics of all API workers in the Prometheus text format.
+    """
+    return Response(
+        content=generate_latest(get_registry()), media_type=CONTENT_TYPE_LATEST
+    )
@@ -3,10 +3,14 @@
 import logging
 import sys
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
 
+from warren.exceptions import AdmissionException, QuotaExceededException
 from warren.xi.routers import experiences, relations
 
+from . import ingestion, jobs
+
 if sys.version_info < (3, 10):
     from importlib_metadata import entry_points
 else:
@@ -16,10 +20,33 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
+
+@app.exception_handler(AdmissionException)
+async def admission_exception_handler(
+    request: Request, exception: AdmissionException
+) -> JSONResponse:
+    """Ask clients to retry indicators computations that were not admitted."""
+    return JSONResponse(
+        status_code=(
+            status.HTTP_429_TOO_MANY_REQUESTS
+            if isinstance(exception, QuotaExceededException)
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        ),
+        content={"detail": str(exception)},
+        headers={"Retry-After": str(exception.retry_after)},
+    )
+
+
 # FIXME - extract the experience index in a dedicated package
 app.include_router(experiences.router)
 app.include_router(relations.router)
 
+# Statements ingestion
+app.include_router(ingestion.router)
+
+# Indicators jobs
+app.include_router(jobs.router)
+
 # Load plugin routers
 for router in entry_points(group="warren.routers"):
     app.include_router(router.load())
@@ -0,0 +1,70 @@
+"""Warren API v1 statements ingestion router."""
+
+import logging
+import secrets
+from typing import List, Union
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from pydantic import BaseModel
+from typing_extensions import Annotated  # python <3.9 compat
+
+from warren.conf import settings
+from warren.indicators.ingestion import ingest_statements
+from warren.models import XAPI_STATEMENT
+
+router = APIRouter(
+    prefix="/ingestion",
+)
+
+logger = logging.getLogger(__name__)
+
+http_basic = HTTPBasic()
+
+
+class IngestionReport(BaseModel):
+    """Statements ingestion report."""
+
+    statements: int
+    updated: int
+
+
+def check_credentials(
+    credentials: Annotated[HTTPBasicCredentials, Depends(http_basic)],
+) -> None:
+    """Check the ingestion endpoint HTTP basic auth credentials."""
+    if (
+        settings.INGESTION_AUTH_BASIC_USERNAME is None
+        or settings.INGESTION_AUTH_BASIC_PASSWORD is None
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Statements ingestion is disabled",
+        )
+    is_username_valid = secrets.compare_digest(
+        credentials.username.encode(), settings.INGESTION_AUTH_BASIC_USERNAME.encode()
+    )
+    is_password_valid = secrets.compare_digest(
+        credentials.password.encode(), settings.INGESTION_AUTH_BASIC_PASSWORD.encode()
+    )
+    if not (is_username_valid and is_password_valid):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Basic"},
+        )
+
+
+@router.post("/statements", dependencies=[Depends(check_credentials)])
+async def statements(
+    statements: Union[List[XAPI_STATEMENT], XAPI_STATEMENT],
+) -> IngestionReport:
+    """Update cached daily event indicators with pushed xAPI statements.
+
+    This endpoint is meant to be fed by an LRS forwarding hook.
+    """
+    if not isinstance(statements, list):
+        statements = [statements]
+    logger.debug("Ingesting %d statements", len(statements))
+    updated = await ingest_statements(statements)
+    return IngestionReport(statements=len(statements), updated=updated)
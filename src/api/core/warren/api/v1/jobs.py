@@ -0,0 +1,84 @@
+"""Warren API v1 indicators jobs router."""
+
+import asyncio
+import logging
+from typing import Any
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlmodel import Session
+from typing_extensions import Annotated  # python <3.9 compat
+
+from warren.conf import settings
+from warren.db import get_session
+from warren.indicators.models import Job, JobRead, JobStatus
+from warren.models import LTIToken
+from warren.utils import get_lti_token
+
+router = APIRouter(
+    prefix="/jobs",
+    dependencies=[Depends(get_lti_token)],
+)
+
+logger = logging.getLogger(__name__)
+
+
+def get_job(job_id: UUID, session: Session, token: LTIToken) -> Job:
+    """Get a job given its ID or raise a 404 HTTP error.
+
+    Jobs submitted from another LTI consumer site or course are not found.
+    """
+    job = session.get(Job, job_id)
+    if job is None or (job.consumer_site, job.course_id) != (
+        token.consumer_site,
+        token.course_id,
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job not found"
+        )
+    return job
+
+
+@router.get("/{job_id}")
+async def read_job(
+    job_id: UUID,
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    session: Session = Depends(get_session),
+    wait: Annotated[float, Query(ge=0, le=settings.JOBS_MAX_WAIT)] = 0,
+) -> JobRead:
+    """Get a job status.
+
+    If `wait` is set, the response is delayed up to `wait` seconds, until the
+    job is done or has failed (long-polling).
+    """
+    job = get_job(job_id, session, token)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + wait
+    while job.status in (JobStatus.PENDING, JobStatus.RUNNING):
+        remaining = deadline - loop.time()
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(settings.JOBS_POLL_INTERVAL, remaining))
+        session.refresh(job)
+    return job
+
+
+@router.get("/{job_id}/result")
+async def read_job_result(
+    job_id: UUID,
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    session: Session = Depends(get_session),
+) -> Any:
+    """Get the result of a done job."""
+    job = get_job(job_id, session, token)
+    if job.status == JobStatus.FAILED:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job has failed: {job.error}",
+        )
+    if job.status != JobStatus.DONE:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.value}",
+        )
+    return job.result
@@ -1,17 +1,254 @@
 """Backends for warren."""
 
+import asyncio
+import logging
+import time
+from collections import deque
+from functools import lru_cache
+from itertools import count
+from typing import AsyncIterator, Dict, List, Literal, Optional, Sequence
+from urllib.parse import ParseResult, parse_qs, urlparse
+
+from httpx import HTTPError, Response
 from ralph.backends.data.async_lrs import AsyncLRSDataBackend
-from ralph.backends.data.lrs import LRSDataBackendSettings, LRSHeaders
+from ralph.backends.data.lrs import (
+    LRSDataBackendSettings,
+    LRSHeaders,
+    StatementResponse,
+)
+from ralph.backends.lrs.base import LRSStatementsQuery
+from ralph.exceptions import BackendException
 
 from warren.conf import settings
 
-lrs_client_settings = LRSDataBackendSettings(
-    BASE_URL=settings.LRS_HOSTS,
-    USERNAME=settings.LRS_AUTH_BASIC_USERNAME,
-    PASSWORD=settings.LRS_AUTH_BASIC_PASSWORD,
-    HEADERS=LRSHeaders(
-        X_EXPERIENCE_API_VERSION="1.0.3", CONTENT_TYPE="application/json"
-    ),
-)
+logger = logging.getLogger(__name__)
+
+LoadBalancingStrategy = Literal["round-robin", "least-outstanding"]
+
+
+class LoadBalancedLRSDataBackend(AsyncLRSDataBackend):
+    """Asynchronous LRS data backend balancing reads across several LRS hosts.
+
+    Each read is sent to a single host, picked using the configured load
+    balancing strategy, and following pages are requested from that same host.
+    When hedged requests are enabled, a page request that takes longer than
+    the configured latency percentile is re-issued to another host and the
+    first successful response wins.
+    """
+
+    name = "load_balanced_async_lrs"
+
+    def __init__(  # noqa: PLR0913
+        self,
+        settings: Optional[LRSDataBackendSettings] = None,
+        hosts: Optional[Sequence[str]] = None,
+        strategy: LoadBalancingStrategy = "round-robin",
+        hedging: bool = False,
+        hedging_percentile: float = 95.0,
+        hedging_min_samples: int = 20,
+        latency_window: int = 1000,
+    ) -> None:
+        """Instantiate the load balanced LRS backend client.
+
+        Args:
+            settings (LRSDataBackendSettings or None): The LRS data backend
+                settings. Its `BASE_URL` is used when no `hosts` are provided.
+            hosts (list of str): LRS hosts URLs to balance reads across.
+            strategy (str): Host selection strategy, either "round-robin" or
+                "least-outstanding" (pick the host with the fewest in-flight
+                requests).
+            hedging (bool): Whether slow page requests should be re-issued to
+                another host.
+            hedging_percentile (float): The observed page latency percentile
+                after which a page request is hedged.
+            hedging_min_samples (int): The minimal number of observed page
+                latencies required before hedging requests.
+            latency_window (int): The number of recent page latencies used to
+                estimate the hedging delay.
+        """
+        super().__init__(settings)
+        self.hosts: List[str] = list(hosts or [self.base_url])
+        self.strategy = strategy
+        self.hedging = hedging
+        self.hedging_percentile = hedging_percentile
+        self.hedging_min_samples = hedging_min_samples
+        self.latencies: deque = deque(maxlen=latency_window)
+        self.outstanding: Dict[str, int] = {host: 0 for host in self.hosts}
+        self._counter = count()
+
+    def select_host(self, exclude: Optional[str] = None) -> str:
+        """Select the LRS host the next request should be sent to.
+
+        Args:
+            exclude (str): A host that should not be selected (if possible).
+        """
+        candidates = [host for host in self.hosts if host != exclude] or self.hosts
+        offset = next(self._counter) % len(candidates)
+        # Rotate candidates so that ties are broken in a round-robin fashion
+        candidates = candidates[offset:] + candidates[:offset]
+        if self.strategy == "least-outstanding":
+            return min(candidates, key=lambda host: self.outstanding.get(host, 0))
+        return candidates[0]
+
+    @property
+    def hedging_delay(self) -> Optional[float]:
+        """Page latency (in seconds) after which a request should be hedged.
+
+        Returns None if hedging is disabled, if there is no other host to hedge
+        to or if not enough latencies have been observed yet.
+        """
+        if (
+            not self.hedging
+            or len(self.hosts) < 2  # noqa: PLR2004
+            or len(self.latencies) < self.hedging_min_samples
+        ):
+            return None
+        latencies = sorted(self.latencies)
+        rank = round(self.hedging_percentile / 100 * (len(latencies) - 1))
+        return latencies[rank]
+
+    async def _get(self, host: str, path: str, query_params: dict) -> Response:
+        """Request a statements page from `host` and record its latency."""
+        target = ParseResult(
+            scheme=urlparse(host).scheme,
+            netloc=urlparse(host).netloc,
+            path=path,
+            query="",
+            params="",
+            fragment="",
+        ).geturl()
+
+        self.outstanding[host] = self.outstanding.get(host, 0) + 1
+        start = time.perf_counter()
+        try:
+            response = await self.client.get(target, params=query_params)
+            response.raise_for_status()
+        finally:
+            # Cancelled (hedged) requests are at least as slow as their elapsed
+            # time: not recording it would underestimate the hedging delay
+            self.outstanding[host] -= 1
+            self.latencies.append(time.perf_counter() - start)
+        return response
+
+    async def _get_page(self, host: str, path: str, query_params: dict) -> Response:
+        """Request a statements page, hedging the request if it is too slow."""
+        primary = asyncio.ensure_future(self._get(host, path, dict(query_params)))
+        delay = self.hedging_delay
+        if delay is None:
+            return await primary
+
+        done, _ = await asyncio.wait({primary}, timeout=delay)
+        if done:
+            return primary.result()
+
+        other = self.select_host(exclude=host)
+        logger.debug("Hedging statements request from %s to %s", host, other)
+        secondary = asyncio.ensure_future(self._get(other, path, dict(query_params)))
+        pending = {primary, secondary}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            # Wait for losing requests to be released
+            await asyncio.gather(*pending, return_exceptions=True)
+
+        # Both requests failed: raise the primary request error
+        return primary.result()
+
+    async def _fetch_pages(
+        self, host: str, path: str, query_params: dict
+    ) -> AsyncIterator[dict]:
+        """Fetch statements from `host`, following `more` links."""
+        while True:
+            response = await self._get_page(host, path, query_params)
+            statements_response = StatementResponse(**response.json())
+            statements = statements_response.statements
+            if isinstance(statements, dict):
+                statements = [statements]
+
+            for statement in statements:
+                yield statement
+
+            if not statements_response.more:
+                break
+
+            query_params.update(parse_qs(urlparse(statements_response.more).query))
+
+    async def _read_dicts(
+        self,
+        query: LRSStatementsQuery,
+        target: Optional[str],
+        chunk_size: int,
+        ignore_errors: bool,
+    ) -> AsyncIterator[dict]:
+        """Method called by `self.read` yielding dictionaries. See `self.read`."""
+        path: str = target or self.settings.STATEMENTS_ENDPOINT
+
+        if query.limit:
+            logger.warning(
+                "The limit query parameter value is overwritten by the chunk_size "
+                "parameter value."
+            )
+
+        query.limit = chunk_size
+        host = self.select_host()
+        logger.debug("Reading statements from %s", host)
+
+        statements = self._fetch_pages(
+            host=host,
+            path=path,
+            query_params=query.dict(exclude_none=True, exclude_unset=True),
+        )
+
+        try:
+            async for statement in statements:
+                yield statement
+        except HTTPError as error:
+            msg = "Failed to fetch statements: %s"
+            logger.error(msg, error)
+            raise BackendException(msg % (error,)) from error
+
+
+@lru_cache(maxsize=None)
+def get_lrs_client() -> AsyncLRSDataBackend:
+    """Get the LRS client, created on first use.
+
+    Reads are balanced across hosts if several `LRS_HOSTS` are configured.
+    """
+    lrs_hosts = (
+        settings.LRS_HOSTS
+        if isinstance(settings.LRS_HOSTS, list)
+        else [settings.LRS_HOSTS]
+    )
+    lrs_client_settings = LRSDataBackendSettings(
+        BASE_URL=lrs_hosts[0],
+        USERNAME=settings.LRS_AUTH_BASIC_USERNAME,
+        PASSWORD=settings.LRS_AUTH_BASIC_PASSWORD,
+        HEADERS=LRSHeaders(
+            X_EXPERIENCE_API_VERSION="1.0.3", CONTENT_TYPE="application/json"
+        ),
+    )
+    if len(lrs_hosts) > 1:
+        return LoadBalancedLRSDataBackend(
+            settings=lrs_client_settings,
+            hosts=lrs_hosts,
+            strategy=settings.LRS_LOAD_BALANCING_STRATEGY,
+            hedging=settings.LRS_HEDGED_REQUESTS,
+            hedging_percentile=settings.LRS_HEDGING_PERCENTILE,
+            hedging_min_samples=settings.LRS_HEDGING_MIN_SAMPLES,
+        )
+    return AsyncLRSDataBackend(settings=lrs_client_settings)
+
 
-lrs_client = AsyncLRSDataBackend(settings=lrs_client_settings)
+def __getattr__(name: str):
+    """Create the `lrs_client` module attribute on first access."""
+    if name == "lrs_client":
+        return get_lrs_client()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -5,23 +5,17 @@ import json
 import logging
 import sys
 from inspect import Parameter, Signature, signature
-from typing import Optional
+from typing import Literal, Optional, get_origin
 from uuid import UUID
 
 import click
-from alembic.util import CommandError
 from pydantic import BaseModel
 
 from warren import __version__ as warren_version
-from warren.xi.client import ExperienceIndex
-from warren.xi.enums import AggregationLevel
-from warren.xi.indexers.moodle.client import Moodle
-from warren.xi.indexers.moodle.etl import (
-    CourseContent,
-    Courses,
-)
 
-from . import migrations as alembic_migrations
+# Nota bene: commands dependencies (alembic, the experience index client and
+# indexers, hence httpx, pandas and ralph) are imported when commands are
+# invoked, to keep the CLI startup fast.
 
 if sys.version_info < (3, 10):
     from importlib_metadata import EntryPoint, EntryPoints, entry_points
@@ -46,6 +40,10 @@ def migration():
 @migration.command()
 def check():
     """Check database migration."""
+    from alembic.util import CommandError
+
+    from . import migrations as alembic_migrations
+
     try:
         alembic_migrations.check()
     except CommandError:
@@ -56,6 +54,8 @@ def check():
 @click.option("--verbose", "-v", is_flag=True, default=False)
 def current(verbose: bool):
     """Show current database migration."""
+    from . import migrations as alembic_migrations
+
     alembic_migrations.current(verbose)
 
 
@@ -63,6 +63,8 @@ def current(verbose: bool):
 @click.argument("revision", type=str)
 def downgrade(revision: str):
     """Downgrade database migration to a target revision."""
+    from . import migrations as alembic_migrations
+
     alembic_migrations.downgrade(revision)
 
 
@@ -70,6 +72,8 @@ def downgrade(revision: str):
 @click.option("--verbose", "-v", is_flag=True, default=False)
 def history(verbose: bool):
     """Show database migrations history."""
+    from . import migrations as alembic_migrations
+
     alembic_migrations.history(verbose)
 
 
@@ -77,6 +81,8 @@ def history(verbose: bool):
 @click.argument("revision", type=str, default="head")
 def upgrade(revision: str):
     """Upgrade database migration to a target revision."""
+    from . import migrations as alembic_migrations
+
     alembic_migrations.upgrade(revision)
 
 
@@ -153,7 +159,12 @@ def indicator_compute(ctx: click.Context, indicator: str, cache: bool):
             )
         )
 
-    if len(ctx.args) < len(indicator_signature.parameters):
+    required = [
+        parameter
+        for parameter in indicator_signature.parameters.values()
+        if parameter.default == Parameter.empty
+    ]
+    if len(ctx.args) < len(required):
         raise click.UsageError(
             (
                 f"Parameters are missing for the '{indicator}' indicator. "
@@ -180,7 +191,9 @@ def indicator_compute(ctx: click.Context, indicator: str, cache: bool):
             )
 
         # Cast value given parameter annotation
-        if issubclass(parameter.annotation, str):
+        if get_origin(parameter.annotation) is Literal:
+            value = value.strip('"')
+        elif issubclass(parameter.annotation, str):
             value = value.strip('"')
         elif issubclass(parameter.annotation, (dict, list)):
             value = json.loads(value)
@@ -213,6 +226,9 @@ def xi_list():
 @click.option("--xi-url", "-x", default="")
 def xi_list_courses(xi_url: str):
     """List indexed LMS courses."""
+    from warren.xi.client import ExperienceIndex
+    from warren.xi.enums import AggregationLevel
+
     xi = ExperienceIndex(url=xi_url)
     experiences = asyncio.run(
         xi.experience.read(aggregation_level=AggregationLevel.THREE)
@@ -229,6 +245,8 @@ async def _xi_list_course_content(course_id: UUID, xi_url: str):
     command using the asyncio.run method. Calling asyncio.run multiple times
     can close the execution loop unexpectedly.
     """
+    from warren.xi.client import ExperienceIndex
+
     xi = ExperienceIndex(url=xi_url)
     # Get the course given its experience UUID
     experience = await xi.experience.get(object_id=course_id)
@@ -274,6 +292,10 @@ def xi_index_courses(
     ignore_errors: bool,
 ):
     """Index LMS courses."""
+    from warren.xi.client import ExperienceIndex
+    from warren.xi.indexers.moodle.client import Moodle
+    from warren.xi.indexers.moodle.etl import Courses
+
     lms = Moodle(url=moodle_url, token=moodle_ws_token, timeout=timeout)
     xi = ExperienceIndex(url=xi_url)
     indexer = Courses(lms=lms, xi=xi, ignore_errors=ignore_errors)
@@ -295,6 +317,10 @@ async def _xi_index_course_content(  # noqa: PLR0913
     command using the asyncio.run method. Calling asyncio.run multiple times
     can close the execution loop unexpectedly.
     """
+    from warren.xi.client import ExperienceIndex
+    from warren.xi.indexers.moodle.client import Moodle
+    from warren.xi.indexers.moodle.etl import CourseContent
+
     lms = Moodle(url=moodle_url, token=moodle_ws_token, timeout=timeout)
     xi = ExperienceIndex(url=xi_url)
 
@@ -346,6 +372,11 @@ async def _xi_index_all(
     command using the asyncio.run method. Calling asyncio.run multiple times
     can close the execution loop unexpectedly.
     """
+    from warren.xi.client import ExperienceIndex
+    from warren.xi.enums import AggregationLevel
+    from warren.xi.indexers.moodle.client import Moodle
+    from warren.xi.indexers.moodle.etl import CourseContent, Courses
+
     lms = Moodle(url=moodle_url, token=moodle_ws_token, timeout=timeout)
     xi = ExperienceIndex(url=xi_url)
 
@@ -3,7 +3,7 @@
 import io
 from datetime import timedelta
 from pathlib import Path
-from typing import List, Optional, Union
+from typing import List, Literal, Optional, Union
 from urllib.parse import urljoin
 
 from pydantic import AnyHttpUrl, BaseModel, BaseSettings
@@ -25,6 +25,13 @@ class Settings(BaseSettings):
     LRS_HOSTS: Union[List[AnyHttpUrl], AnyHttpUrl]
     LRS_AUTH_BASIC_USERNAME: str
     LRS_AUTH_BASIC_PASSWORD: str
+    # Reads are balanced across LRS_HOSTS when several hosts are configured
+    LRS_LOAD_BALANCING_STRATEGY: Literal["round-robin", "least-outstanding"] = (
+        "round-robin"
+    )
+    LRS_HEDGED_REQUESTS: bool = False
+    LRS_HEDGING_PERCENTILE: float = 95.0
+    LRS_HEDGING_MIN_SAMPLES: int = 20
 
     # Warren server
     SERVER_PROTOCOL: str = "http"
@@ -34,7 +41,42 @@ class Settings(BaseSettings):
     # API configuration
     MAX_DATETIMERANGE_SPAN: timedelta = timedelta(days=365)  # 1 year shift from since
     DEFAULT_DATETIMERANGE_SPAN: timedelta = timedelta(days=7)  # 7 days shift from until
+    # Hourly indicators are computed from hourly frames (one LRS query per hour)
+    MAX_HOURLY_DATETIMERANGE_SPAN: timedelta = timedelta(days=7)
     DATE_FORMAT: str = "YYYY-MM-DD"
+    # Maximum number of indicators frames computed concurrently
+    INDICATORS_CONCURRENCY: int = 8
+    # Maximum number of objects requested to batch indicators endpoints
+    INDICATORS_BATCH_MAX_SIZE: int = 100
+    # HTTP Cache-Control max-age (in seconds) of indicators results whose
+    # date/time range is still open or closed. Use the "public" directive to
+    # let shared caches (e.g. a CDN) store results of authenticated requests.
+    INDICATORS_CACHE_CONTROL_DIRECTIVE: Literal["private", "public"] = "private"
+    INDICATORS_MAX_AGE: int = 60
+    INDICATORS_CLOSED_MAX_AGE: int = 86400
+    # Asynchronous indicators jobs: number of workers started by each API
+    # server process, database polling interval and maximum long-polling
+    # duration (in seconds)
+    JOBS_WORKERS: int = 2
+    JOBS_POLL_INTERVAL: float = 1.0
+    JOBS_MAX_WAIT: float = 30.0
+    # Running jobs heartbeat interval and lease duration (in seconds): jobs
+    # whose worker has not sent a heartbeat for the lease duration (e.g. a
+    # killed server process) are claimed again by other workers
+    JOBS_HEARTBEAT_INTERVAL: float = 30.0
+    JOBS_LEASE_DURATION: float = 300.0
+    # Admission control of indicators computations requested by API clients:
+    # maximum number of cold computations run (and queued) by each API server
+    # process, Retry-After delay (in seconds) when the server is over capacity
+    # and quota of frames computed per second for each LTI consumer site
+    ADMISSION_CONTROL: bool = True
+    ADMISSION_MAX_CONCURRENCY: int = 4
+    ADMISSION_MAX_QUEUE: int = 32
+    ADMISSION_RETRY_AFTER: int = 5
+    ADMISSION_TENANT_RATE: float = 100.0
+    ADMISSION_TENANT_BURST: float = 36500.0
+    # Add a Server-Timing header summarizing indicators computation phases
+    SERVER_TIMING: bool = True
     XAPI_ACTOR_IDENTIFIER_PATHS = {
         "actor.account.name",
         "actor.account.homePage",
@@ -42,6 +84,11 @@ class Settings(BaseSettings):
         "actor.mbox_sha1sum",
         "actor.openid",
     }
+    # Actor uid hashing algorithm: "blake2b" (64 bits) is faster than "sha256"
+    XAPI_ACTOR_UID_HASH: Literal["sha256", "blake2b"] = "sha256"
+    # Dataframe engine used to compute indicators from statements ("polars" and
+    # "pyarrow" engines require optional dependencies)
+    DATAFRAME_ENGINE: Literal["pandas", "polars", "pyarrow"] = "pandas"
 
     # API Core Root path
     # (used at least by everything that is alembic-configuration-related)
@@ -64,9 +111,16 @@ class Settings(BaseSettings):
     API_DB_PORT: int = 5432
     API_TEST_DB_NAME: str = "test-warren-api"
 
+    # Statements ingestion (disabled if credentials are not set)
+    INGESTION_AUTH_BASIC_USERNAME: Optional[str] = None
+    INGESTION_AUTH_BASIC_PASSWORD: Optional[str] = None
+
     # Token
     APP_SIGNING_ALGORITHM: str
     APP_SIGNING_KEY: str
+    # Maximum number of verified tokens cached by each server process (0
+    # disables the cache)
+    LTI_TOKEN_CACHE_SIZE: int = 1024
 
     # Sentry
     SENTRY_DSN: Optional[str] = None
@@ -79,6 +133,12 @@ class Settings(BaseSettings):
     XI_LMS_BASE_URL: str = "https://lms.example.com"
     XI_LMS_API_TOKEN: str = "yourLMSAPIToken"
     XI_LMS_REQUEST_TIMEOUT: float = 60.0
+    # Maximum number of items per page, service clients (administrators, e.g.
+    # indexers) may retrieve larger pages
+    XI_MAX_PAGE_SIZE: int = 100
+    XI_SERVICE_MAX_PAGE_SIZE: int = 1000
+    # Maximum number of items created or updated by a bulk request
+    XI_BULK_MAX_SIZE: int = 500
 
     @property
     def DATABASE_URL(self) -> str:
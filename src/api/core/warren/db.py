@@ -1,15 +1,18 @@
 """Warren persistence database connection."""
 
 import logging
+import time
 from typing import Optional
 
 from sqlalchemy import Engine as SAEngine
 from sqlalchemy import text
 from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import ConnectionPoolEntry, QueuePool
 from sqlmodel import Session as SMSession
 from sqlmodel import create_engine
 
 from .conf import settings
+from .metrics import DB_POOL_CHECKOUT_WAIT
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +29,18 @@ class Singleton(type):
         return cls._instances[cls]
 
 
+class InstrumentedQueuePool(QueuePool):
+    """Queue pool measuring the time spent waiting for a connection."""
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        """Get a connection from the pool (or a new one)."""
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
 class Engine(metaclass=Singleton):
     """Database engine singleton."""
 
@@ -35,7 +50,9 @@ class Engine(metaclass=Singleton):
         """Get created engine or create a new one."""
         if self._engine is None:
             logger.debug("Create a new engine")
-            self._engine = create_engine(url, echo=echo)
+            self._engine = create_engine(
+                url, echo=echo, poolclass=InstrumentedQueuePool
+            )
         logger.debug("Getting database engine %s", self._engine)
         return self._engine
 
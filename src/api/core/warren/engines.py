@@ -0,0 +1,439 @@
+"""Dataframe engines for the indicators statements pipeline."""
+
+import datetime
+import logging
+import operator
+from abc import ABC, abstractmethod
+from functools import lru_cache, reduce
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple, cast
+
+import numpy as np
+import pandas as pd
+
+from warren.conf import settings
+from warren.exceptions import DataFrameEngineException
+from warren.models import XAPI_STATEMENT
+from warren.predicates import And, Comparison, Not, Or, Predicate
+from warren.xapi import (
+    StatementsTransformer,
+    extract_columns,
+    get_actor_uids,
+    parse_timestamps,
+)
+
+logger = logging.getLogger(__name__)
+
+# Statements frame (a pandas DataFrame, a Polars DataFrame or a PyArrow Table)
+Frame = Any
+# Frame boolean mask (a pandas Series, a Polars Series or a PyArrow Array)
+Mask = Any
+
+NANOSECONDS_PER_DAY = 86_400 * 10**9
+
+
+def get_utc_offset(tzinfo: Optional[datetime.tzinfo]) -> datetime.timedelta:
+    """Get the fixed UTC offset of a timezone."""
+    if tzinfo is None:
+        return datetime.timedelta()
+    offset = tzinfo.utcoffset(None)
+    if offset is None:
+        raise DataFrameEngineException(
+            f"Only fixed UTC offsets are supported, got timezone {tzinfo}"
+        )
+    return offset
+
+
+def to_nullable(values: List[Any]) -> List[Any]:
+    """Replace missing values (`NaN`) by None."""
+    return [None if value is np.nan else value for value in values]
+
+
+class DataFrameEngine(ABC):
+    """Dataframe engine used to compute indicators from statements.
+
+    Engines implement each step of the daily event indicators pipeline:
+    statements are loaded to a frame, filtered and finally aggregated per day.
+
+    Days are bucketed using integer day indexes relative to the first day of the
+    indicator span range, computed from int64 nanoseconds local timestamps.
+    """
+
+    name: str
+
+    @abstractmethod
+    def load(self, statements: List[XAPI_STATEMENT], paths: Sequence[str]) -> Frame:
+        """Load statements `paths` values to a frame.
+
+        The frame has a UTC `timestamp` column, an `actor.uid` column and a
+        column per required path (see `StatementsTransformer.preprocess`).
+        """
+
+    @staticmethod
+    def extract(
+        statements: List[XAPI_STATEMENT], paths: Sequence[str]
+    ) -> Tuple[np.ndarray, List[str], Dict[str, List[Any]]]:
+        """Extract naive UTC timestamps, actors uids and `paths` values."""
+        columns = extract_columns(
+            statements, [*paths, *sorted(settings.XAPI_ACTOR_IDENTIFIER_PATHS)]
+        )
+        uids = get_actor_uids(columns)
+        timestamps = parse_timestamps(columns.pop("timestamp"))
+        return timestamps.tz_localize(None).to_numpy(), uids, columns
+
+    def filter(self, frame: Frame, *predicates: Predicate) -> Frame:
+        """Keep rows matching all `predicates`."""
+        if not predicates:
+            return frame
+        return self.apply_mask(
+            frame, self.mask(frame, reduce(operator.and_, predicates))
+        )
+
+    def mask(self, frame: Frame, predicate: Predicate) -> Mask:
+        """Compile a predicate to a boolean mask.
+
+        Missing values, and missing columns, never match comparisons.
+        """
+        if isinstance(predicate, Comparison):
+            if not self.has_column(frame, predicate.column):
+                return self.constant_mask(frame, False)
+            return self.compare(frame, predicate)
+        if isinstance(predicate, And):
+            return self.mask(frame, predicate.left) & self.mask(frame, predicate.right)
+        if isinstance(predicate, Or):
+            return self.mask(frame, predicate.left) | self.mask(frame, predicate.right)
+        if isinstance(predicate, Not):
+            return self.mask(frame, predicate.notnull) & ~self.mask(
+                frame, predicate.predicate
+            )
+        raise TypeError(f"Unsupported predicate: {predicate!r}")
+
+    @abstractmethod
+    def has_column(self, frame: Frame, column: str) -> bool:
+        """Check whether the frame has a `column`."""
+
+    @abstractmethod
+    def compare(self, frame: Frame, comparison: Comparison) -> Mask:
+        """Compile a comparison to a boolean mask without missing values."""
+
+    @abstractmethod
+    def constant_mask(self, frame: Frame, value: bool) -> Mask:
+        """Get a boolean mask with the same `value` for all rows."""
+
+    @abstractmethod
+    def apply_mask(self, frame: Frame, mask: Mask) -> Frame:
+        """Keep rows where the mask is true."""
+
+    @abstractmethod
+    def drop_duplicates(self, frame: Frame, column: str) -> Frame:
+        """Keep the first row for each `column` value."""
+
+    @abstractmethod
+    def local_timestamps(
+        self, frame: Frame, tzinfo: Optional[datetime.tzinfo]
+    ) -> np.ndarray:
+        """Get `tzinfo` local timestamps as int64 nanoseconds since the epoch."""
+
+    @abstractmethod
+    def values(self, frame: Frame, column: str) -> np.ndarray:
+        """Get `column` values as a numpy array."""
+
+    def day_index(self, frame: Frame, since: datetime.datetime) -> np.ndarray:
+        """Get the day index of each row, relative to the `since` local date."""
+        first_day = (since.date() - datetime.date(1970, 1, 1)).days
+        return (
+            self.local_timestamps(frame, since.tzinfo) // NANOSECONDS_PER_DAY
+            - first_day
+        )
+
+    def count_by_day(
+        self, frame: Frame, since: datetime.datetime
+    ) -> Tuple[int, np.ndarray]:
+        """Count rows per day.
+
+        Returns the index of the first counted day (relative to the `since`
+        local date, see `day_index`) and the number of rows for each day from
+        this first day.
+        """
+        days = self.day_index(frame, since)
+        if not len(days):
+            return 0, np.zeros(0, dtype=np.int64)
+        first = min(int(days.min()), 0)
+        return first, np.bincount(days - first)
+
+    def unique_by_day(
+        self, frame: Frame, column: str, since: datetime.datetime
+    ) -> Dict[int, Set]:
+        """Get distinct `column` values per day index (see `day_index`)."""
+        days = self.day_index(frame, since)
+        uniques = pd.Series(self.values(frame, column)).groupby(days).unique()
+        return {cast(int, day): set(values) for day, values in uniques.items()}
+
+
+class PandasEngine(DataFrameEngine):
+    """Pandas dataframe engine (default).
+
+    Like `StatementsTransformer` methods, steps only copy the dataframe
+    structure before replacing or adding a column.
+    """
+
+    name = "pandas"
+
+    def load(
+        self, statements: List[XAPI_STATEMENT], paths: Sequence[str]
+    ) -> Optional[pd.DataFrame]:
+        """Load statements `paths` values to a pandas DataFrame."""
+        return StatementsTransformer.preprocess(statements, paths=paths)
+
+    def has_column(self, frame: pd.DataFrame, column: str) -> bool:
+        """Check whether the frame has a `column`."""
+        return column in frame.columns
+
+    def compare(self, frame: pd.DataFrame, comparison: Comparison) -> pd.Series:
+        """Compile a comparison to a boolean mask without missing values."""
+        series = frame[comparison.column]
+        if comparison.op == "notnull":
+            return series.notna()
+        if comparison.op == "isin":
+            return series.isin(comparison.value)
+        return (
+            getattr(operator, comparison.op)(series, comparison.value) & series.notna()
+        )
+
+    def constant_mask(self, frame: pd.DataFrame, value: bool) -> pd.Series:
+        """Get a boolean mask with the same `value` for all rows."""
+        return pd.Series(value, index=frame.index, dtype=bool)
+
+    def apply_mask(self, frame: pd.DataFrame, mask: pd.Series) -> pd.DataFrame:
+        """Keep rows where the mask is true."""
+        return frame[mask]
+
+    def drop_duplicates(self, frame: pd.DataFrame, column: str) -> pd.DataFrame:
+        """Keep the first row for each `column` value."""
+        return frame.drop_duplicates(subset=column)
+
+    def local_timestamps(
+        self, frame: pd.DataFrame, tzinfo: Optional[datetime.tzinfo]
+    ) -> np.ndarray:
+        """Get `tzinfo` local timestamps as int64 nanoseconds since the epoch.
+
+        Fixed UTC offsets are added to UTC timestamps, other timezones (with
+        daylight saving time) are converted by pandas.
+        """
+        timestamps = frame["timestamp"].dt.as_unit("ns")
+        if tzinfo is None or tzinfo.utcoffset(None) is not None:
+            offset = get_utc_offset(tzinfo) // datetime.timedelta(microseconds=1)
+            return timestamps.to_numpy(dtype=np.int64) + offset * 1000
+        local = timestamps.dt.tz_convert(tzinfo).dt.tz_localize(None)
+        return local.to_numpy(dtype=np.int64)
+
+    def values(self, frame: pd.DataFrame, column: str) -> np.ndarray:
+        """Get `column` values as a numpy array."""
+        return frame[column].to_numpy()
+
+
+class PolarsEngine(DataFrameEngine):
+    """Polars dataframe engine.
+
+    Timestamps are naive datetimes: UTC once loaded, then local to the
+    requested timezone. Only fixed UTC offsets are supported.
+    """
+
+    name = "polars"
+
+    def __init__(self):
+        """Import Polars, which is an optional dependency."""
+        try:
+            import polars
+        except ImportError as error:
+            raise DataFrameEngineException(
+                "The polars engine requires the polars package "
+                "(pip install warren-api[polars])"
+            ) from error
+        self.pl = polars
+
+    def load(self, statements: List[XAPI_STATEMENT], paths: Sequence[str]) -> Frame:
+        """Load statements `paths` values to a Polars DataFrame."""
+        timestamps, uids, columns = self.extract(statements, paths)
+        return self.pl.DataFrame(
+            {
+                "timestamp": timestamps,
+                "actor.uid": uids,
+                **{path: to_nullable(values) for path, values in columns.items()},
+            },
+            strict=False,
+        )
+
+    def has_column(self, frame: Frame, column: str) -> bool:
+        """Check whether the frame has a `column`."""
+        return column in frame.columns
+
+    def compare(self, frame: Frame, comparison: Comparison) -> Mask:
+        """Compile a comparison to a boolean mask without missing values."""
+        series = frame[comparison.column]
+        if comparison.op == "notnull":
+            return series.is_not_null()
+        if comparison.op == "isin":
+            mask = series.is_in(list(comparison.value))
+        else:
+            mask = getattr(operator, comparison.op)(series, comparison.value)
+        return mask.fill_null(False)
+
+    def constant_mask(self, frame: Frame, value: bool) -> Mask:
+        """Get a boolean mask with the same `value` for all rows."""
+        return self.pl.repeat(value, frame.height, dtype=self.pl.Boolean, eager=True)
+
+    def apply_mask(self, frame: Frame, mask: Mask) -> Frame:
+        """Keep rows where the mask is true."""
+        return frame.filter(mask)
+
+    def drop_duplicates(self, frame: Frame, column: str) -> Frame:
+        """Keep the first row for each `column` value."""
+        return frame.unique(subset=column, keep="first", maintain_order=True)
+
+    def local_timestamps(
+        self, frame: Frame, tzinfo: Optional[datetime.tzinfo]
+    ) -> np.ndarray:
+        """Get `tzinfo` local timestamps as int64 nanoseconds since the epoch."""
+        offset = get_utc_offset(tzinfo) // datetime.timedelta(microseconds=1)
+        timestamps = frame["timestamp"].dt.cast_time_unit("ns").to_physical()
+        return timestamps.to_numpy() + offset * 1000
+
+    def values(self, frame: Frame, column: str) -> np.ndarray:
+        """Get `column` values as a numpy array."""
+        return frame[column].to_numpy()
+
+
+class PyArrowEngine(DataFrameEngine):
+    """PyArrow engine, using Arrow tables and compute functions.
+
+    Timestamps are naive datetimes: UTC once loaded, then local to the
+    requested timezone. Only fixed UTC offsets are supported.
+    """
+
+    name = "pyarrow"
+
+    COMPARISON_FUNCTIONS = {
+        "eq": "equal",
+        "ne": "not_equal",
+        "lt": "less",
+        "le": "less_equal",
+        "gt": "greater",
+        "ge": "greater_equal",
+    }
+
+    def __init__(self):
+        """Import PyArrow, which is an optional dependency."""
+        try:
+            import pyarrow
+            import pyarrow.compute
+        except ImportError as error:
+            raise DataFrameEngineException(
+                "The pyarrow engine requires the pyarrow package "
+                "(pip install warren-api[pyarrow])"
+            ) from error
+        self.pa = pyarrow
+        self.pc = pyarrow.compute
+
+    def load(self, statements: List[XAPI_STATEMENT], paths: Sequence[str]) -> Frame:
+        """Load statements `paths` values to a PyArrow Table."""
+        timestamps, uids, columns = self.extract(statements, paths)
+        return self.pa.table(
+            {
+                "timestamp": self.pa.array(timestamps),
+                "actor.uid": self.pa.array(uids),
+                **{
+                    path: self.pa.array(values, from_pandas=True)
+                    for path, values in columns.items()
+                },
+            }
+        )
+
+    def mask(self, frame: Frame, predicate: Predicate) -> Mask:
+        """Compile a predicate to a boolean mask.
+
+        Arrow arrays do not support Python logical operators: compute
+        functions are used instead.
+        """
+        if isinstance(predicate, And):
+            return self.pc.and_(
+                self.mask(frame, predicate.left), self.mask(frame, predicate.right)
+            )
+        if isinstance(predicate, Or):
+            return self.pc.or_(
+                self.mask(frame, predicate.left), self.mask(frame, predicate.right)
+            )
+        if isinstance(predicate, Not):
+            return self.pc.and_(
+                self.mask(frame, predicate.notnull),
+                self.pc.invert(self.mask(frame, predicate.predicate)),
+            )
+        return super().mask(frame, predicate)
+
+    def has_column(self, frame: Frame, column: str) -> bool:
+        """Check whether the frame has a `column`."""
+        return column in frame.column_names
+
+    def compare(self, frame: Frame, comparison: Comparison) -> Mask:
+        """Compile a comparison to a boolean mask without missing values."""
+        column = frame[comparison.column]
+        if comparison.op == "notnull":
+            return self.pc.is_valid(column)
+        if comparison.op == "isin":
+            mask = self.pc.is_in(
+                column,
+                value_set=self.pa.array(list(comparison.value), type=column.type),
+            )
+        else:
+            mask = self.pc.call_function(
+                self.COMPARISON_FUNCTIONS[comparison.op],
+                [column, self.pa.scalar(comparison.value)],
+            )
+        return self.pc.fill_null(mask, False)
+
+    def constant_mask(self, frame: Frame, value: bool) -> Mask:
+        """Get a boolean mask with the same `value` for all rows."""
+        return self.pa.array(np.full(frame.num_rows, value))
+
+    def apply_mask(self, frame: Frame, mask: Mask) -> Frame:
+        """Keep rows where the mask is true."""
+        return frame.filter(mask)
+
+    def drop_duplicates(self, frame: Frame, column: str) -> Frame:
+        """Keep the first row for each `column` value."""
+        indices = (
+            frame.select([column])
+            .append_column("index", self.pa.array(np.arange(frame.num_rows)))
+            .group_by(column, use_threads=False)
+            .aggregate([("index", "min")])
+        )
+        return frame.take(np.sort(indices["index_min"].to_numpy()))
+
+    def local_timestamps(
+        self, frame: Frame, tzinfo: Optional[datetime.tzinfo]
+    ) -> np.ndarray:
+        """Get `tzinfo` local timestamps as int64 nanoseconds since the epoch."""
+        offset = get_utc_offset(tzinfo) // datetime.timedelta(microseconds=1)
+        timestamps = self.pc.cast(
+            self.pc.cast(frame["timestamp"], self.pa.timestamp("ns")), self.pa.int64()
+        )
+        return timestamps.to_numpy() + offset * 1000
+
+    def values(self, frame: Frame, column: str) -> np.ndarray:
+        """Get `column` values as a numpy array."""
+        return frame[column].to_numpy()
+
+
+ENGINES: Dict[str, Callable[[], DataFrameEngine]] = {
+    engine.name: engine for engine in (PandasEngine, PolarsEngine, PyArrowEngine)
+}
+
+
+@lru_cache
+def _get_engine(name: str) -> DataFrameEngine:
+    logger.debug("Using the %s dataframe engine", name)
+    return ENGINES[name]()
+
+
+def get_engine(name: Optional[str] = None) -> DataFrameEngine:
+    """Get a dataframe engine instance, defaults to the configured engine."""
+    return _get_engine(name or settings.DATAFRAME_ENGINE)
@@ -3,3 +3,28 @@
 
 class LrsClientException(Exception):
     """Raised when the LRS client has a failure."""
+
+
+class DataFrameEngineException(Exception):
+    """Raised when the dataframe engine cannot be used."""
+
+
+class JobException(Exception):
+    """Raised when an indicator job cannot be run."""
+
+
+class AdmissionException(Exception):
+    """Raised when an indicator computation is not admitted."""
+
+    def __init__(self, message: str, retry_after: int) -> None:
+        """Store the delay (in seconds) before the request should be retried."""
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QuotaExceededException(AdmissionException):
+    """Raised when a tenant exceeded its indicators computation quota."""
+
+
+class OverCapacityException(AdmissionException):
+    """Raised when too many indicators are being computed."""
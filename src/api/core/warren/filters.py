@@ -6,6 +6,7 @@ from pydantic import BaseModel, ValidationError, root_validator
 
 from .conf import settings
 from .fields import Datetime
+from .models import Granularity
 
 
 class DatetimeRange(BaseModel):
@@ -100,3 +101,24 @@ class BaseQueryFilters(DatetimeRange):
                 detail="Date/time range is too greedy.",
             )
         return values
+
+
+class GranularityQueryFilters(BaseQueryFilters):
+    """Query filters of endpoints returning results in time buckets."""
+
+    granularity: Granularity = "day"
+
+    @root_validator
+    @classmethod
+    def check_hourly_datetime_range_span(cls, values):
+        """Check that the date/time range of hourly results is not too greedy."""
+        since, until = map(values.get, ["since", "until"])
+        if (
+            values.get("granularity") == "hour"
+            and since + settings.MAX_HOURLY_DATETIMERANGE_SPAN < until
+        ):
+            raise HTTPException(
+                status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Date/time range is too greedy for hourly results.",
+            )
+        return values
@@ -0,0 +1,63 @@
+"""Interned actors uids.
+
+Daily unique users of cached frames are stored as integer ids instead of
+64 characters actors uids: ids are dense and fit in int32 arrays (see
+`DailyUniqueCountsArray`). They are mapped to uids by the `actoruid` table.
+"""
+
+from typing import Dict, Iterable, Set
+
+from sqlalchemy import Integer, String, any_, literal
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+from sqlmodel import Session, select
+
+from .models import ActorUid
+
+
+def _get_ids(session: Session, uids: Set[str]) -> Dict[str, int]:
+    """Get the ids of interned actors uids.
+
+    Uids are sent as a single array parameter, whatever their number.
+    """
+    rows = session.execute(
+        select(ActorUid.uid, ActorUid.id).where(
+            ActorUid.uid == any_(literal(list(uids), ARRAY(String)))
+        )
+    )
+    return dict(rows.tuples().all())
+
+
+def intern_actor_uids(session: Session, uids: Iterable[str]) -> Dict[str, int]:
+    """Get the ids of actors uids, interning the ones that are not yet.
+
+    Interned uids are committed with the session transaction (_i.e._ with the
+    cached frames storing them).
+    """
+    uids = set(uids)
+    if not uids:
+        return {}
+    ids = _get_ids(session, uids)
+    missing = uids.difference(ids)
+    if missing:
+        # Uids may be interned concurrently: they are inserted in the same order
+        # by all transactions to prevent deadlocks
+        session.execute(
+            insert(ActorUid)
+            .values([{"uid": uid} for uid in sorted(missing)])
+            .on_conflict_do_nothing(index_elements=["uid"])
+        )
+        ids.update(_get_ids(session, missing))
+    return ids
+
+
+def get_interned_actor_uids(session: Session, ids: Iterable[int]) -> Dict[int, str]:
+    """Get the actors uids of interned ids."""
+    ids = list(ids)
+    if not ids:
+        return {}
+    rows = session.execute(
+        select(ActorUid.id, ActorUid.uid).where(
+            ActorUid.id == any_(literal(ids, ARRAY(Integer)))
+        )
+    )
+    return dict(rows.tuples().all())
@@ -0,0 +1,205 @@
+"""Admission control of indicators computations.
+
+Computing indicators that are not cached (cold computations) queries the LRS
+and processes statements with dataframes: a single expensive request may
+saturate the server and delay requests of other tenants. Cold computations
+requested by API clients are hence admitted:
+
+- each tenant (the LTI consumer site) is granted a quota of frames computed
+  per second: tenants exceeding their quota are asked to retry later (429),
+- each server process computes up to `ADMISSION_MAX_CONCURRENCY` requests at
+  a time, other requests are queued (and served fairly across tenants) up to
+  `ADMISSION_MAX_QUEUE` requests; the server is over capacity beyond (503).
+
+Cached results and jobs computed by workers are not subject to admission.
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Deque, Optional
+
+from fastapi import Depends
+from typing_extensions import Annotated  # python <3.9 compat
+
+from warren.conf import settings
+from warren.exceptions import OverCapacityException, QuotaExceededException
+from warren.models import LTIToken
+from warren.utils import get_lti_token
+
+logger = logging.getLogger(__name__)
+
+# Tenant of the current API request (if any)
+current_tenant: ContextVar[Optional[str]] = ContextVar("current_tenant", default=None)
+# Whether the current computation has already been admitted
+admitted: ContextVar[bool] = ContextVar("admitted", default=False)
+
+
+class TenantQuota:
+    """A tenant quota of computed frames (token bucket).
+
+    The bucket is refilled with `rate` frames per second up to `burst` frames.
+    Computations are charged once admitted, hence a tenant may spend more
+    frames than available: admission is then refused until the debt is paid
+    back.
+    """
+
+    def __init__(self, rate: float, burst: float) -> None:
+        """Instantiate a full bucket."""
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+
+    def refill(self):
+        """Refill the bucket given the time elapsed since the last update."""
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def charge(self, cost: int):
+        """Spend `cost` frames."""
+        self.refill()
+        self.tokens -= cost
+
+    @property
+    def full(self) -> bool:
+        """Whether the bucket has been refilled up to its burst size."""
+        self.refill()
+        return self.tokens >= self.burst
+
+    def retry_after(self) -> float:
+        """Delay (in seconds) before new computations are admitted."""
+        self.refill()
+        if self.tokens > 0:
+            return 0.0
+        # Wait for at least one available frame
+        return (1 - self.tokens) / self.rate
+
+
+class AdmissionController:
+    """Admit cold computations of each server process.
+
+    Concurrency slots are released to queued requests in a round-robin order
+    across tenants, hence a tenant with many queued requests does not delay
+    requests of other tenants.
+    """
+
+    def __init__(self) -> None:
+        """Instantiate the controller with no running computation."""
+        # Tenants quotas, least recently used first
+        self.quotas: OrderedDict[str, TenantQuota] = OrderedDict()
+        self.running = 0
+        self.waiters: OrderedDict[str, Deque[asyncio.Future]] = OrderedDict()
+
+    @property
+    def queued(self) -> int:
+        """Number of queued computations."""
+        return sum(len(waiters) for waiters in self.waiters.values())
+
+    def get_quota(self, tenant: str) -> TenantQuota:
+        """Get the tenant quota.
+
+        Quotas of idle tenants are evicted once refilled, as full buckets are
+        equivalent to new ones: only quotas of tenants active since the time
+        required to refill a bucket are kept.
+        """
+        while self.quotas and next(iter(self.quotas.values())).full:
+            self.quotas.popitem(last=False)
+        if tenant not in self.quotas:
+            self.quotas[tenant] = TenantQuota(
+                settings.ADMISSION_TENANT_RATE, settings.ADMISSION_TENANT_BURST
+            )
+        self.quotas.move_to_end(tenant)
+        return self.quotas[tenant]
+
+    async def acquire(self, tenant: str):
+        """Wait for a concurrency slot."""
+        if self.running < settings.ADMISSION_MAX_CONCURRENCY:
+            self.running += 1
+            return
+        if self.queued >= settings.ADMISSION_MAX_QUEUE:
+            raise OverCapacityException(
+                "Too many indicators are being computed",
+                retry_after=settings.ADMISSION_RETRY_AFTER,
+            )
+        waiter = asyncio.get_running_loop().create_future()
+        self.waiters.setdefault(tenant, deque()).append(waiter)
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over while being cancelled
+                self.release()
+            else:
+                self.waiters[tenant].remove(waiter)
+                if not self.waiters[tenant]:
+                    del self.waiters[tenant]
+            raise
+
+    def release(self):
+        """Hand over the concurrency slot to the next tenant (if any)."""
+        while self.waiters:
+            tenant, waiters = self.waiters.popitem(last=False)
+            waiter = waiters.popleft()
+            if waiters:
+                # Move the tenant to the end of the round
+                self.waiters[tenant] = waiters
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+
+    @asynccontextmanager
+    async def admit(self, cost: int) -> AsyncIterator[None]:
+        """Admit a cold computation of `cost` frames for the current tenant.
+
+        Nested computations (e.g. computations of course activities) are
+        charged to the tenant quota but run in the admitted computation slot.
+        """
+        tenant = current_tenant.get()
+        if tenant is None or not cost or not settings.ADMISSION_CONTROL:
+            yield
+            return
+
+        quota = self.get_quota(tenant)
+        if admitted.get():
+            quota.charge(cost)
+            yield
+            return
+
+        retry_after = quota.retry_after()
+        if retry_after:
+            logger.warning("Tenant %s exceeded its computation quota", tenant)
+            raise QuotaExceededException(
+                "Indicators computation quota exceeded",
+                retry_after=math.ceil(retry_after),
+            )
+        await self.acquire(tenant)
+        # The quota may have been evicted while waiting for a slot
+        self.get_quota(tenant).charge(cost)
+        token = admitted.set(True)
+        try:
+            yield
+        finally:
+            admitted.reset(token)
+            self.release()
+
+
+admission = AdmissionController()
+
+
+async def set_current_tenant(
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+) -> str:
+    """Admit indicators computations of the request for the token consumer site.
+
+    Nota bene: this is an asynchronous dependency so that the context variable
+    is set in the request handler context.
+    """
+    current_tenant.set(token.consumer_site)
+    return token.consumer_site
@@ -2,6 +2,7 @@
 
 import copy
 import inspect
+import time
 from abc import ABC, abstractmethod
 from functools import cached_property
 from typing import List, Optional
@@ -9,10 +10,12 @@ from typing import List, Optional
 from ralph.backends.lrs.base import LRSStatementsQuery
 from ralph.exceptions import BackendException
 
-from warren.backends import lrs_client as async_lrs_client
+from warren.backends import get_lrs_client
 from warren.exceptions import LrsClientException
 from warren.filters import Datetime, DatetimeRange
+from warren.metrics import LRS_REQUEST_DURATION, LRS_STATEMENTS_FETCHED
 from warren.models import XAPI_STATEMENT
+from warren.tracing import trace
 
 
 class BaseIndicator(ABC):
@@ -83,19 +86,22 @@ class BaseIndicator(ABC):
     @cached_property
     def lrs_client(self):
         """Get AsyncLRSHTTP instance."""
-        return async_lrs_client
+        return get_lrs_client()
 
     @abstractmethod
     def get_lrs_query(self) -> LRSStatementsQuery:  # type: ignore[valid-type]
         """Get the LRS query for fetching statements."""
 
+    @trace("lrs")
     async def fetch_statements(self) -> List[XAPI_STATEMENT]:
         """Execute the LRS query to obtain statements required for this indicator.
 
         If lrs_query is None, it defaults to self.get_lrs_query()
         """
+        indicator = type(self).__qualname__
+        start = time.perf_counter()
         try:
-            return [
+            statements = [
                 value
                 async for value in self.lrs_client.read(
                     target=self.lrs_client.settings.STATEMENTS_ENDPOINT,
@@ -104,6 +110,12 @@ class BaseIndicator(ABC):
             ]
         except BackendException as exception:
             raise LrsClientException("Failed to fetch statements") from exception
+        finally:
+            LRS_REQUEST_DURATION.labels(indicator=indicator).observe(
+                time.perf_counter() - start
+            )
+        LRS_STATEMENTS_FETCHED.labels(indicator=indicator).inc(len(statements))
+        return statements
 
     @abstractmethod
     async def compute(self):
@@ -0,0 +1,97 @@
+"""HTTP conditional caching of indicators results."""
+
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Dict, Optional, Sequence
+
+from fastapi import HTTPException, Request, Response, status
+
+from warren.conf import settings
+
+from .mixins import CacheMixin
+
+
+@dataclass(frozen=True)
+class CacheValidators:
+    """HTTP cache validators of indicators results."""
+
+    etag: str
+    last_modified: datetime
+    max_age: int
+
+    @property
+    def headers(self) -> Dict[str, str]:
+        """HTTP response headers describing cached results."""
+        return {
+            "ETag": f'"{self.etag}"',
+            "Last-Modified": format_datetime(
+                self.last_modified.astimezone(timezone.utc), usegmt=True
+            ),
+            "Cache-Control": (
+                f"{settings.INDICATORS_CACHE_CONTROL_DIRECTIVE}, "
+                f"max-age={self.max_age}"
+            ),
+            "Vary": "Authorization",
+        }
+
+    def match(self, if_none_match: str) -> bool:
+        """Check whether an If-None-Match header value matches the entity tag."""
+        tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        return "*" in tags or f'"{self.etag}"' in tags
+
+
+async def get_cache_validators(
+    indicators: Sequence[CacheMixin],
+) -> Optional[CacheValidators]:
+    """Get HTTP cache validators of indicators results.
+
+    Returns `None` if there are no indicators (_e.g._ an empty ranking) or if
+    the result of any of the indicators is not cached.
+    """
+    if not indicators:
+        return None
+
+    etags = []
+    last_modified = []
+    for indicator in indicators:
+        modified = await indicator.get_last_modified()
+        if modified is None:
+            return None
+        etags.append(indicator.get_etag(modified))
+        last_modified.append(modified)
+
+    return CacheValidators(
+        etag=(
+            etags[0]
+            if len(etags) == 1
+            else hashlib.sha256(":".join(etags).encode()).hexdigest()
+        ),
+        last_modified=max(last_modified),
+        max_age=min(indicator.get_max_age() for indicator in indicators),
+    )
+
+
+async def check_not_modified(request: Request, indicators: Sequence[CacheMixin]):
+    """Raise a "304 Not Modified" HTTP error if the client cached results are valid.
+
+    Indicators are neither computed nor serialized: only the cache entries
+    last modification date/time is queried when the request is conditional.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match is None:
+        return
+
+    validators = await get_cache_validators(indicators)
+    if validators is not None and validators.match(if_none_match):
+        raise HTTPException(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers=validators.headers
+        )
+
+
+async def set_cache_headers(response: Response, indicators: Sequence[CacheMixin]):
+    """Set HTTP caching headers of (computed) indicators results to the response."""
+    validators = await get_cache_validators(indicators)
+    if validators is not None:
+        response.headers.update(validators.headers)
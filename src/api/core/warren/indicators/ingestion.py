@@ -0,0 +1,115 @@
+"""Push-based xAPI statements ingestion for incremental indicators."""
+
+import logging
+import sys
+from datetime import timezone
+from typing import List, Optional, Set, Type
+
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from warren.filters import DatetimeRange
+from warren.models import XAPI_STATEMENT
+from warren.xapi import get_statement_timestamp
+
+from .mixins import BaseDailyEvent
+
+if sys.version_info < (3, 10):
+    from importlib_metadata import entry_points
+else:
+    from importlib.metadata import entry_points
+
+logger = logging.getLogger(__name__)
+
+
+def get_ingestible_indicators() -> List[Type[BaseDailyEvent]]:
+    """Get registered indicators whose cache can be updated from statements."""
+    indicators: List[Type[BaseDailyEvent]] = []
+    for entry_point in entry_points(group="warren.indicators"):
+        klass = entry_point.load()
+        if (
+            isinstance(klass, type)
+            and issubclass(klass, BaseDailyEvent)
+            and klass.verb_id is not None
+            and klass not in indicators
+        ):
+            indicators.append(klass)
+    return indicators
+
+
+async def ingest_statements(statements: List[XAPI_STATEMENT]) -> int:
+    """Update cached frames of registered daily event indicators.
+
+    For every registered daily event indicator, statements matching its verb
+    are grouped by activity and merged with the corresponding cached daily and
+    hourly frames. Updated frames are committed once all indicators have
+    ingested statements.
+
+    Statements without a valid timestamp are skipped.
+
+    Returns the number of updated cache entries.
+    """
+    timestamps = {
+        index: timestamp
+        for index, statement in enumerate(statements)
+        if (timestamp := get_statement_timestamp(statement)) is not None
+    }
+    if len(timestamps) < len(statements):
+        logger.warning(
+            "%d statements without a valid timestamp are skipped",
+            len(statements) - len(timestamps),
+        )
+    if not timestamps:
+        return 0
+    statements = [statements[index] for index in timestamps]
+    span_range = DatetimeRange(
+        since=min(timestamps.values()).astimezone(timezone.utc),
+        until=max(timestamps.values()).astimezone(timezone.utc),
+    )
+
+    session: Optional[Session] = None
+    updated = 0
+    # Indicators from different plugins may share the same cache
+    cache_keys: Set[str] = set()
+    for klass in get_ingestible_indicators():
+        object_ids: Set[str] = {
+            statement["object"]["id"]
+            for statement in statements
+            if statement.get("verb", {}).get("id") == klass.verb_id
+            and statement.get("object", {}).get("id") is not None
+        }
+        for object_id in sorted(object_ids):
+            try:
+                indicators = klass.get_ingestion_indicators(object_id, span_range)
+            except (TypeError, ValueError):
+                logger.exception(
+                    "Failed to instantiate indicator %s (%s)", klass.__name__, object_id
+                )
+                continue
+            for indicator in indicators:
+                if indicator.cache_key in cache_keys:
+                    continue
+                cache_keys.add(indicator.cache_key)
+                session = indicator.db_session
+                # A failed ingestion only rolls back (and releases) its own frames
+                try:
+                    with session.begin_nested():
+                        updated += len(await indicator.merge_statements(statements))
+                except (
+                    KeyError,
+                    AttributeError,
+                    TypeError,
+                    ValueError,
+                    SQLAlchemyError,
+                ):
+                    logger.exception(
+                        "Failed to ingest statements for indicator %s (%s)",
+                        klass.__name__,
+                        object_id,
+                    )
+    if session is not None:
+        session.commit()
+    logger.debug(
+        "%d cache entries updated from %d statements", updated, len(statements)
+    )
+    return updated
@@ -0,0 +1,273 @@
+"""Asynchronous indicators jobs.
+
+Computing an indicator on a large date/time range (or for a big course) may
+exceed HTTP timeouts. Indicators endpoints may instead submit a job: the
+indicator class and its arguments are stored in the database and a pool of
+workers computes pending jobs, storing their results.
+"""
+
+import asyncio
+import hashlib
+import importlib
+import inspect
+import json
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from pydantic.json import pydantic_encoder
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, and_, or_, select
+
+from warren.conf import settings
+from warren.db import get_engine
+from warren.exceptions import JobException
+from warren.filters import DatetimeRange
+from warren.models import DailyUniqueCounts, LTIToken
+
+from .mixins import CacheMixin, IncrementalCacheMixin
+from .models import Job, JobStatus
+
+logger = logging.getLogger(__name__)
+
+
+def get_worker_session() -> Session:
+    """Get a new database session for a worker.
+
+    Workers commit (and roll back) jobs in their own session, not in the
+    database session singleton used by API requests handlers.
+    """
+    return Session(get_engine())
+
+
+def dump_indicator(indicator: CacheMixin) -> Dict[str, Any]:
+    """Get the indicator instantiation arguments as a JSON document."""
+    parameters = inspect.signature(type(indicator).__init__).parameters
+    arguments = {
+        name: value for name, value in vars(indicator).items() if name in parameters
+    }
+    return json.loads(json.dumps(arguments, default=pydantic_encoder))
+
+
+def load_indicator(path: str, arguments: Dict[str, Any]) -> CacheMixin:
+    """Instantiate the indicator given its class path and arguments."""
+    module_name, _, name = path.partition(":")
+    klass = getattr(importlib.import_module(module_name), name, None)
+    if not (inspect.isclass(klass) and issubclass(klass, CacheMixin)):
+        raise JobException(f"{path} is not a cached indicator")
+    if "span_range" in arguments:
+        arguments = {
+            **arguments,
+            "span_range": DatetimeRange.parse_obj(arguments["span_range"]),
+        }
+    return klass(**arguments)
+
+
+def get_active_job(session: Session, key: str) -> Optional[Job]:
+    """Get the pending (or running) job with this key (if any)."""
+    return session.exec(
+        select(Job).where(
+            Job.key == key,
+            Job.status.in_([JobStatus.PENDING, JobStatus.RUNNING]),  # type: ignore[attr-defined]
+        )
+    ).first()
+
+
+async def submit_job(indicator: CacheMixin, token: LTIToken) -> Job:
+    """Submit a job computing the indicator on behalf of the token submitter.
+
+    If an identical job has already been submitted by the same LTI consumer
+    site and course and is pending (or running), it is returned instead of
+    creating a new one.
+    """
+    klass = type(indicator)
+    path = f"{klass.__module__}:{klass.__qualname__}"
+    arguments = dump_indicator(indicator)
+    submitter = [token.consumer_site, token.course_id]
+    digest = hashlib.sha256(
+        json.dumps([path, arguments, submitter], sort_keys=True).encode()
+    ).hexdigest()
+    key = f"job-{digest}"
+
+    session = indicator.db_session
+    job = get_active_job(session, key)
+    if job is not None:
+        logger.debug("Identical job %s is %s", job.id, job.status.value)
+        return job
+
+    job = Job(
+        key=key,
+        indicator=path,
+        arguments=arguments,
+        consumer_site=token.consumer_site,
+        course_id=token.course_id,
+    )
+    session.add(job)
+    try:
+        session.commit()
+    except IntegrityError:
+        # An identical job has just been submitted by another request
+        session.rollback()
+        job = get_active_job(session, key)
+        if job is None:
+            return await submit_job(indicator, token)
+        logger.debug("Identical job %s is %s", job.id, job.status.value)
+        return job
+    session.refresh(job)
+    logger.debug("Job %s submitted for %s", job.id, path)
+    workers.notify()
+    return job
+
+
+def claim_job(session: Session) -> Optional[Job]:
+    """Mark the oldest pending job as running and return it (if any).
+
+    Jobs are locked while being claimed, hence multiple workers (and server
+    processes) never run the same job. Running jobs whose lease has expired
+    (their worker has been killed or is stuck) are claimed again.
+    """
+    now = datetime.now(timezone.utc)
+    expired = now - timedelta(seconds=settings.JOBS_LEASE_DURATION)
+    job = session.exec(
+        select(Job)
+        .where(
+            or_(
+                Job.status == JobStatus.PENDING,
+                and_(
+                    Job.status == JobStatus.RUNNING,
+                    Job.heartbeat_at < expired,  # type: ignore[operator]
+                ),
+            )
+        )
+        .order_by(Job.created_at)  # type: ignore[arg-type]
+        .limit(1)
+        .with_for_update(skip_locked=True)
+    ).first()
+    if job is not None:
+        if job.status == JobStatus.RUNNING:
+            logger.warning("Job %s lease has expired, claiming it again", job.id)
+        job.status = JobStatus.RUNNING
+        job.heartbeat_at = now
+        session.add(job)
+    session.commit()
+    return job
+
+
+async def run_job(session: Session, job: Job):
+    """Compute the indicator of a claimed job and store its result.
+
+    The job progress is the percentage of available frames of incremental
+    indicators.
+    """
+
+    def on_progress(done: int, total: int):
+        job.progress = round(100 * done / total, 1) if total else 0.0
+        job.heartbeat_at = datetime.now(timezone.utc)
+        session.add(job)
+        session.commit()
+
+    async def heartbeat():
+        """Renew the job lease while it is running."""
+        while True:
+            await asyncio.sleep(settings.JOBS_HEARTBEAT_INTERVAL)
+            job.heartbeat_at = datetime.now(timezone.utc)
+            session.add(job)
+            session.commit()
+
+    logger.debug("Running job %s", job.id)
+    heartbeat_task = asyncio.create_task(heartbeat())
+    try:
+        indicator = load_indicator(job.indicator, job.arguments)
+        if isinstance(indicator, IncrementalCacheMixin):
+            (result,) = await IncrementalCacheMixin.get_or_compute_many(
+                [indicator], on_progress=on_progress
+            )
+        else:
+            result = await indicator.get_or_compute()
+        # Results are returned as indicators endpoints return them
+        if isinstance(result, DailyUniqueCounts):
+            result = result.to_daily_counts()
+        job.result = json.loads(json.dumps(result, default=pydantic_encoder))
+        job.status = JobStatus.DONE
+        job.progress = 100.0
+    except asyncio.CancelledError:
+        # The job will be run again by another worker
+        logger.warning("Job %s has been cancelled", job.id)
+        job.status = JobStatus.PENDING
+        job.heartbeat_at = None
+        session.add(job)
+        session.commit()
+        raise
+    except Exception as exception:
+        logger.exception("Job %s failed. Exception:", job.id)
+        job.status = JobStatus.FAILED
+        job.error = str(exception) or type(exception).__name__
+    finally:
+        heartbeat_task.cancel()
+
+    session.add(job)
+    session.commit()
+
+
+class JobWorkerPool:
+    """A pool of workers running pending jobs.
+
+    Workers poll the database every `JOBS_POLL_INTERVAL` seconds, or as soon as
+    a job is submitted by the current process.
+    """
+
+    def __init__(self) -> None:
+        """Instantiate the (stopped) pool."""
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def start(self, size: Optional[int] = None):
+        """Start `size` workers (defaults to `JOBS_WORKERS`)."""
+        size = settings.JOBS_WORKERS if size is None else size
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._work()) for _ in range(size)]
+        logger.info("%d job workers started", size)
+
+    async def stop(self):
+        """Stop workers: running jobs are cancelled and pending again."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._wakeup = None
+
+    def notify(self):
+        """Wake up idle workers."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _wait(self):
+        """Wait for a job to be submitted or for the polling interval."""
+        if self._wakeup is None:
+            return
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), settings.JOBS_POLL_INTERVAL)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _work(self):
+        """Run pending jobs forever."""
+        session = get_worker_session()
+        try:
+            while True:
+                try:
+                    job = claim_job(session)
+                except Exception:
+                    logger.exception("Cannot claim a pending job. Exception:")
+                    session.rollback()
+                    job = None
+                if job is None:
+                    await self._wait()
+                    continue
+                await run_job(session, job)
+        finally:
+            session.close()
+
+
+workers = JobWorkerPool()
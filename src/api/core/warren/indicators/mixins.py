@@ -1,26 +1,63 @@
 """Mixins for indicators."""
 
+import asyncio
+import datetime
 import hashlib
 import inspect
 import json
 import logging
+import math
+import time
 from abc import ABC, abstractmethod
 from functools import cached_property, reduce
-from typing import Any, List, Literal, Optional, Protocol, Sequence, Union
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
 
 import arrow
-import pandas as pd
+import numpy as np
+from dateutil.tz import tzoffset
+from pydantic.json import pydantic_encoder
 from pydantic.main import BaseModel
 from ralph.backends.data.async_lrs import LRSStatementsQuery
+from sqlalchemy import Text, cast, func
 from sqlmodel import Session, select
 
+from warren.conf import settings
 from warren.db import get_session as get_db_session
+from warren.engines import DataFrameEngine, Frame, get_engine
 from warren.filters import DatetimeRange
 from warren.indicators import BaseIndicator
-from warren.models import DailyCount, DailyCounts, DailyUniqueCount, DailyUniqueCounts
+from warren.metrics import INDICATOR_COMPUTE_DURATION, observe_cache_result
+from warren.models import (
+    XAPI_STATEMENT,
+    DailyCounts,
+    DailyCountsArray,
+    DailyUniqueCount,
+    DailyUniqueCounts,
+    DailyUniqueCountsArray,
+    Granularity,
+    HourlyCount,
+    HourlyCounts,
+    count_days,
+)
+from warren.predicates import Predicate
+from warren.tracing import span, trace
 from warren.utils import pipe
-from warren.xapi import StatementsTransformer
+from warren.xapi import get_statement_timestamp
 
+from .actors import get_interned_actor_uids, intern_actor_uids
+from .admission import admission
 from .models import CacheEntry, CacheEntryCreate
 
 # Inspired from Arrow's _T_FRAMES
@@ -59,6 +96,11 @@ class Cacheable(Protocol):
 class CacheMixin(Cacheable):
     """A cache mixin that handles indicator persistence."""
 
+    # HTTP Cache-Control max-age (in seconds) of the indicator results while
+    # results may still change or not (defaults to INDICATORS_*MAX_AGE settings)
+    max_age: Optional[int] = None
+    closed_max_age: Optional[int] = None
+
     @property
     def db_session(self) -> Session:
         """Get the database session singleton."""
@@ -82,21 +124,54 @@ class CacheMixin(Cacheable):
         attributes_hash = hashlib.sha256(attributes.encode()).hexdigest()
         return f"{self.__class__.__name__.lower()}-{attributes_hash}"
 
+    @trace("cache")
     async def get_cache(self) -> Union[CacheEntry, None]:
         """Get cached results matching the cache key from the database."""
         return self.db_session.exec(
             select(CacheEntry).where(CacheEntry.key == self.cache_key)
         ).one_or_none()
 
+    @trace("save")
     async def save(self, caches: Union[CacheEntry, List[CacheEntry]]):
         """Save cache instance(s) to the database."""
         if not isinstance(caches, list):
             caches = [caches]
         with self.db_session.begin_nested():
             for cache in caches:
+                # The saving date/time is the cache entry last modification
+                cache.updated_at = datetime.datetime.now(datetime.timezone.utc)
                 self.db_session.add(cache)
         self.db_session.commit()
 
+    @property
+    def is_closed(self) -> bool:
+        """Check whether the indicator date/time range (if any) is over."""
+        until = getattr(self, "until", None)
+        return until is not None and arrow.get(until) < arrow.utcnow()
+
+    def get_max_age(self) -> int:
+        """Get the HTTP Cache-Control max-age (in seconds) of the results."""
+        if self.is_closed:
+            if self.closed_max_age is None:
+                return settings.INDICATORS_CLOSED_MAX_AGE
+            return self.closed_max_age
+        if self.max_age is None:
+            return settings.INDICATORS_MAX_AGE
+        return self.max_age
+
+    async def get_last_modified(self) -> Optional[datetime.datetime]:
+        """Get the date/time the cached result has been saved (if any)."""
+        return self.db_session.exec(
+            select(func.max(CacheEntry.updated_at)).where(
+                CacheEntry.key == self.cache_key
+            )
+        ).one()
+
+    def get_etag(self, last_modified: datetime.datetime) -> str:
+        """Get the entity tag of the cached result saved at `last_modified`."""
+        version = f"{self.cache_key}:{last_modified.isoformat()}"
+        return hashlib.sha256(version.encode()).hexdigest()
+
     @cached_property
     def _compute_annotation(self):
         """Get the annotation type returned by the compute method.
@@ -111,6 +186,13 @@ class CacheMixin(Cacheable):
             )
         return annotation
 
+    @cached_property
+    def _is_pydantic_result(self) -> bool:
+        """Check whether the compute method returns a Pydantic model."""
+        return inspect.isclass(self._compute_annotation) and issubclass(
+            self._compute_annotation, BaseModel
+        )
+
     @staticmethod
     def _to_pydantic(model: BaseModel, value: Any):
         """Deserialize values to the given Pydantic model."""
@@ -122,25 +204,50 @@ class CacheMixin(Cacheable):
         """Return raw value or pydantic model instance."""
         return (
             self._to_pydantic(self._compute_annotation, value)
-            if issubclass(self._compute_annotation, BaseModel)
+            if self._is_pydantic_result
             else value
         )
 
+    def get_admission_cost(self) -> int:
+        """Estimate the cost of computing the indicator (in frames).
+
+        The cost is the number of days of the indicator date/time span range
+        (if any).
+        """
+        span_range = getattr(self, "span_range", None)
+        if span_range is None:
+            return 1
+        span = span_range.until - span_range.since
+        return max(1, math.ceil(span / datetime.timedelta(days=1)))
+
     async def get_or_compute(self, update: bool = False):
         """Get cached result (if any) or compute the result.
 
         Nota bene: if computed, the result is stored in the database.
 
         """
+        indicator = type(self).__qualname__
         cache = await self.get_cache()
 
         # Return cached value
         if cache is not None and not update:
+            observe_cache_result(indicator, computed=0, total=1)
             return self._raw_or_pydantic(cache.value)
 
-        value = await self.compute()
-        if issubclass(self._compute_annotation, BaseModel):
+        observe_cache_result(indicator, computed=1, total=1)
+        async with admission.admit(self.get_admission_cost()):
+            with span("compute", indicator):
+                start = time.perf_counter()
+                value = await self.compute()
+                INDICATOR_COMPUTE_DURATION.labels(indicator=indicator).observe(
+                    time.perf_counter() - start
+                )
+        if self._is_pydantic_result:
             value = value.json()
+        else:
+            # Results may contain models or dataclasses (e.g. lists of results):
+            # they are validated as a JSON document
+            value = json.dumps(value, default=pydantic_encoder)
 
         # Cache entry may have been created during a long compute time
         cache = await self.get_cache()
@@ -151,11 +258,38 @@ class CacheMixin(Cacheable):
             )
             await self.save(cache)
         elif update:
-            cache.value = value
+            # Store the document, not a JSON string
+            cache.value = json.loads(value)
             await self.save(cache)
 
         return self._raw_or_pydantic(cache.value)
 
+    async def get_cached_json(self) -> Optional[str]:
+        """Get the cached result as a JSON document, without deserializing it.
+
+        The JSON column is cast to text by the database, hence the stored
+        document is returned as is.
+        """
+        return self.db_session.exec(
+            select(cast(CacheEntry.value, Text)).where(CacheEntry.key == self.cache_key)
+        ).one_or_none()
+
+    async def get_or_compute_json(self, update: bool = False) -> str:
+        """Get cached result (if any) or compute the result, as a JSON document.
+
+        This is a fast path for endpoints returning the indicator result as is:
+        on cache hit, the stored document is neither parsed to the compute
+        return type nor serialized back to JSON.
+        """
+        if not update:
+            cached = await self.get_cached_json()
+            if cached is not None:
+                observe_cache_result(type(self).__qualname__, computed=0, total=1)
+                return cached
+        return json.dumps(
+            await self.get_or_compute(update=update), default=pydantic_encoder
+        )
+
 
 class CacheableIncrementally(Cacheable):
     """Protocol for cacheable object with incremental capabilities."""
@@ -185,6 +319,8 @@ class IncrementalCacheMixin(CacheMixin, CacheableIncrementally, ABC):
     """
 
     frame: Frames
+    # Instance attributes that do not change cached frames values
+    cache_key_excluded_attributes: Tuple[str, ...] = ("span_range",)
 
     @cached_property
     def cache_key(self) -> str:
@@ -196,16 +332,75 @@ class IncrementalCacheMixin(CacheMixin, CacheableIncrementally, ABC):
 
         """
         attr_copy = vars(self).copy()
-        attr_copy.pop("span_range", None)
+        for name in self.cache_key_excluded_attributes:
+            attr_copy.pop(name, None)
         attributes = json.dumps(attr_copy, sort_keys=True, default=str)
         attributes_hash = hashlib.sha256(attributes.encode()).hexdigest()
         return f"{self.__class__.__name__.lower()}-{attributes_hash}"
 
+    async def get_cached_json(self) -> Optional[str]:
+        """Incremental results are merged from cached frames: there is no fast path."""
+        return None
+
+    @property
+    def is_closed(self) -> bool:
+        """Check whether the last frame of the indicator span range is over."""
+        return arrow.get(self.until).ceil(self.frame) < arrow.utcnow()
+
+    async def get_last_modified(self) -> Optional[datetime.datetime]:
+        """Get the date/time cached frames have last been saved.
+
+        Returns `None` if a frame of the indicator span range is not cached yet.
+        """
+        since = arrow.get(self.since).floor(self.frame)
+        until = arrow.get(self.until).ceil(self.frame)
+        count, last_modified = self.db_session.exec(
+            select(func.count(), func.max(CacheEntry.updated_at)).where(
+                CacheEntry.key == self.cache_key,
+                CacheEntry.since >= since.datetime,  # type: ignore[operator]
+                CacheEntry.until <= until.datetime,  # type: ignore[operator]
+            )
+        ).one()
+        frames = len(
+            list(arrow.Arrow.span_range(self.frame, since.datetime, until.datetime))
+        )
+        return last_modified if count >= frames else None
+
+    def get_etag(self, last_modified: datetime.datetime) -> str:
+        """Get the entity tag of cached frames last saved at `last_modified`."""
+        since = arrow.get(self.since).floor(self.frame)
+        until = arrow.get(self.until).ceil(self.frame)
+        version = f"{self.cache_key}:{since}:{until}:{last_modified.isoformat()}"
+        return hashlib.sha256(version.encode()).hexdigest()
+
     @staticmethod
     @abstractmethod
     def merge(a: Any, b: Any) -> Any:
         """Merging function for computed results."""
 
+    def to_cached_value(self, result: Any) -> Any:
+        """Get the value of a frame computed result to be cached."""
+        return result.json() if isinstance(result, BaseModel) else result
+
+    def from_cached_value(self, value: Any) -> Any:
+        """Get a frame result to be merged from its cached value."""
+        return self._raw_or_pydantic(value)
+
+    def merge_all(self, values: List[Any]) -> Any:
+        """Merge computed results of all frames.
+
+        Results are merged pairwise using the `merge` function by default,
+        indicators may override this method to merge them all at once.
+        """
+        return reduce(self.merge, values)
+
+    def aggregate(self, values: List[Any]) -> Any:
+        """Get the indicator result from computed results of all frames.
+
+        Results of all frames are merged by default (see `merge_all`).
+        """
+        return self.merge_all(values)
+
     async def get_caches(self) -> Sequence[CacheEntry]:
         """Get cached results matching the cache key and the indicator span range."""
         return self.db_session.exec(
@@ -218,10 +413,14 @@ class IncrementalCacheMixin(CacheMixin, CacheableIncrementally, ABC):
             .order_by(CacheEntry.since)  # type: ignore[arg-type]
         ).all()
 
-    async def _get_continuous_caches_for_time_span(
-        self,
+    def _get_continuous_caches(
+        self, db_caches: Sequence[CacheEntry]
     ) -> List[Union[CacheEntry, CacheEntryCreate]]:
-        """Generates a list mixing dummy cache and real DB cache."""
+        """Generates a list mixing dummy cache and given DB cache entries.
+
+        DB cache entries that are not part of the indicator span range are
+        ignored.
+        """
         # Prepare dummy cache list
         caches = [
             CacheEntryCreate.construct(
@@ -236,47 +435,154 @@ class IncrementalCacheMixin(CacheMixin, CacheableIncrementally, ABC):
         ]
 
         # Mutate dummy cache entries with DB cached ones
-        sinces = [c.since for c in caches]
-        for db_cache in await self.get_caches():
-            caches[sinces.index(db_cache.since)] = db_cache
+        indexes = {c.since: index for index, c in enumerate(caches)}
+        for db_cache in db_caches:
+            if db_cache.since in indexes:
+                caches[indexes[db_cache.since]] = db_cache
 
         return caches
 
-    async def get_or_compute(self, update: bool = False):
-        """Get cached result (if any) or compute the result.
+    async def _get_continuous_caches_for_time_span(
+        self,
+    ) -> List[Union[CacheEntry, CacheEntryCreate]]:
+        """Generates a list mixing dummy cache and real DB cache."""
+        return self._get_continuous_caches(await self.get_caches())
 
-        Nota bene: if computed, the result is stored in the database.
+    async def _compute_cache(
+        self,
+        cache: Union[CacheEntry, CacheEntryCreate],
+        semaphore: asyncio.Semaphore,
+    ):
+        """Compute the result of a cache entry frame and set its value."""
+        # Get a new indicator instance for a reduced date/time span range
+        other = self._replace(
+            span_range=DatetimeRange(since=cache.since, until=cache.until)
+        )
+        async with semaphore:
+            start = time.perf_counter()
+            result = await other.compute()
+            INDICATOR_COMPUTE_DURATION.labels(
+                indicator=type(self).__qualname__
+            ).observe(time.perf_counter() - start)
+
+        cache.value = self.to_cached_value(result)
+
+    @staticmethod
+    async def get_or_compute_many(
+        indicators: Sequence["IncrementalCacheMixin"],
+        update: bool = False,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[Any]:
+        """Get cached results (if any) or compute the results of indicators.
+
+        Cache entries of all indicators are fetched using a single database
+        query. Missing (or updated) frames are computed concurrently, up to
+        `INDICATORS_CONCURRENCY` frames at a time. The computation cost is the
+        number of frames to compute, for all indicators.
+
+        The `on_progress` callback (if any) is called with the number of
+        available frames and the total number of frames before computing
+        missing frames, then each time a frame has been computed.
+
+        Nota bene: if computed, results are stored in the database.
 
         """
-        caches = await self._get_continuous_caches_for_time_span()
-        to_save = []
-        to_update = []
-        for cache in caches:
-            if isinstance(cache, CacheEntry) and not update:
-                logger.debug("Cache entry with ID %s wont be updated", str(cache.id))
-                continue
-            # Get a new indicator instance for a reduced date/time span range
-            other = self._replace(
-                span_range=DatetimeRange(since=cache.since, until=cache.until)
+        if not indicators:
+            return []
+        db_session = indicators[0].db_session
+        with span("cache", "get_or_compute_many"):
+            db_caches = db_session.exec(
+                select(CacheEntry)
+                .where(
+                    CacheEntry.key.in_(  # type: ignore[attr-defined]
+                        {indicator.cache_key for indicator in indicators}
+                    ),
+                    CacheEntry.since >= min(i.since for i in indicators),  # type: ignore[operator]
+                    CacheEntry.until  # type: ignore[operator]
+                    <= max(
+                        arrow.get(i.until).ceil(i.frame).datetime for i in indicators
+                    ),
+                )
+                .order_by(CacheEntry.since)  # type: ignore[arg-type]
+            ).all()
+
+        indicators_caches = [
+            indicator._get_continuous_caches(
+                [cache for cache in db_caches if cache.key == indicator.cache_key]
             )
-            result = await other.compute()
+            for indicator in indicators
+        ]
 
-            # Pydantic case
-            if isinstance(result, BaseModel):
-                result = result.json()
+        to_compute = []
+        for indicator, caches in zip(indicators, indicators_caches):
+            for cache in caches:
+                if isinstance(cache, CacheEntry) and not update:
+                    logger.debug(
+                        "Cache entry with ID %s wont be updated", str(cache.id)
+                    )
+                    continue
+                to_compute.append((indicator, cache))
+
+        computed: Dict[int, int] = {}
+        for indicator, _ in to_compute:
+            computed[id(indicator)] = computed.get(id(indicator), 0) + 1
+        for indicator, caches in zip(indicators, indicators_caches):
+            observe_cache_result(
+                type(indicator).__qualname__,
+                computed=computed.get(id(indicator), 0),
+                total=len(caches),
+            )
 
-            cache.value = result
-            if isinstance(cache, CacheEntry):
-                to_update.append(cache)
-            elif isinstance(cache, CacheEntryCreate):
-                to_save.append(CacheEntry.model_validate(cache))
+        total = sum(len(caches) for caches in indicators_caches)
+        done = total - len(to_compute)
+        semaphore = asyncio.Semaphore(settings.INDICATORS_CONCURRENCY)
+        if on_progress is not None:
+            on_progress(done, total)
+
+        async def compute_cache(indicator, cache):
+            nonlocal done
+            await indicator._compute_cache(cache, semaphore)
+            done += 1
+            if on_progress is not None:
+                on_progress(done, total)
+
+        if to_compute:
+            async with admission.admit(len(to_compute)):
+                with span("compute", "get_or_compute_many"):
+                    await asyncio.gather(
+                        *(
+                            compute_cache(indicator, cache)
+                            for indicator, cache in to_compute
+                        )
+                    )
+
+            to_save = []
+            to_update = []
+            for _, cache in to_compute:
+                if isinstance(cache, CacheEntry):
+                    to_update.append(cache)
+                elif isinstance(cache, CacheEntryCreate):
+                    to_save.append(CacheEntry.model_validate(cache))
+
+            await indicators[0].save(to_update)
+            await indicators[0].save(to_save)
+
+        with span("merge", "get_or_compute_many"):
+            return [
+                indicator.aggregate(
+                    [indicator.from_cached_value(cache.value) for cache in caches]
+                )
+                for indicator, caches in zip(indicators, indicators_caches)
+            ]
 
-        await self.save(to_update)
-        await self.save(to_save)
+    async def get_or_compute(self, update: bool = False):
+        """Get cached result (if any) or compute the result.
 
-        values = [self._raw_or_pydantic(cache.value) for cache in caches]
+        Nota bene: if computed, the result is stored in the database.
 
-        return reduce(self.merge, values)
+        """
+        (result,) = await self.get_or_compute_many([self], update=update)
+        return result
 
 
 class BaseDailyEvent(BaseIndicator, IncrementalCacheMixin):
@@ -286,6 +592,10 @@ class BaseDailyEvent(BaseIndicator, IncrementalCacheMixin):
     and a date range, it calculates the total number of events and the number
     of events per day.
 
+    Results may be bucketed per hour, week or month instead (`granularity`).
+    Weekly and monthly results are summed from the daily frames cached for
+    daily results, while hourly results are computed from hourly frames.
+
     Required: Indicators inheriting from this base class must declare a 'verb_id'
     class attribute with their xAPI verb ID.
     """
@@ -293,11 +603,17 @@ class BaseDailyEvent(BaseIndicator, IncrementalCacheMixin):
     frame: Frames = "day"
     verb_id: Optional[str] = None
     object_id: str
+    granularity: Granularity
+    # Statements fields (dotted paths) required to compute the indicator
+    statement_paths: Tuple[str, ...] = ("id", "timestamp", "verb.id", "object.id")
+    # Daily frames are shared by daily, weekly and monthly results
+    cache_key_excluded_attributes = ("span_range", "granularity")
 
     def __init__(
         self,
         object_id: str,
         span_range: DatetimeRange,
+        granularity: Granularity = "day",
     ):
         """Instantiate the Daily Event Indicator.
 
@@ -307,8 +623,22 @@ class BaseDailyEvent(BaseIndicator, IncrementalCacheMixin):
                 2 fields, `since` and `until` which are dates or timestamps that must be
                 in ISO format (YYYY-MM-DD, YYYY-MM-DDThh:mm:ss.sss±hh:mm or
                 YYYY-MM-DDThh:mm:ss.sssZ")
+            granularity: The time buckets of the indicator result (hour, day, week
+                or month)
         """
-        super().__init__(span_range=span_range, object_id=object_id)
+        # Hourly frames are cached with a distinct cache key
+        frame: Dict[str, Frames] = {"frame": "hour"} if granularity == "hour" else {}
+        super().__init__(
+            span_range=span_range,
+            object_id=object_id,
+            granularity=granularity,
+            **frame,
+        )
+
+    @property
+    def predicates(self) -> Tuple[Predicate, ...]:
+        """Predicates statements must match to be taken into account."""
+        return ()
 
     def get_lrs_query(
         self,
@@ -321,28 +651,171 @@ class BaseDailyEvent(BaseIndicator, IncrementalCacheMixin):
             until=self.until,
         )
 
-    def filter_statements(self, statements: pd.DataFrame) -> pd.DataFrame:
+    @property
+    def engine(self) -> DataFrameEngine:
+        """The dataframe engine used to compute the indicator."""
+        return get_engine()
+
+    @trace("preprocess")
+    def preprocess_statements(self, raw_statements: List[XAPI_STATEMENT]) -> Frame:
+        """Load statements fields required by this indicator to a frame."""
+        return self.engine.load(raw_statements, self.statement_paths)
+
+    def filter_statements(self, statements: Frame) -> Frame:
         """Filter statements required for this indicator.
 
-        This method may be overridden for indicator-specific filtering.
+        Statements are filtered using the indicator `predicates`. This method
+        may be overridden for indicator-specific filtering: to support all
+        dataframe engines, filters should rely on the engine methods.
         """
-        return statements
+        return self.engine.filter(statements, *self.predicates)
+
+    def get_day_date(self, day: int) -> datetime.date:
+        """Get the date of a day index, relative to the span range first day."""
+        return self.since.date() + datetime.timedelta(days=day)
 
-    def to_span_range_timezone(self, statements: pd.DataFrame) -> pd.DataFrame:
-        """Convert 'timestamps' column to the DatetimeRange's timezone."""
-        statements = statements.copy()
-        statements["timestamp"] = statements["timestamp"].dt.tz_convert(
-            self.span_range.tzinfo
+    @abstractmethod
+    def compute_from_statements(self, raw_statements: List[XAPI_STATEMENT]):
+        """Filter and aggregate statements to get the indicator value."""
+
+    @abstractmethod
+    def merge_hours(self, values: List[Any]) -> HourlyCounts:
+        """Get hourly counts from computed results of hourly frames."""
+
+    def get_hours(self) -> List[datetime.datetime]:
+        """Get the first date/time of hourly frames of the span range."""
+        return [
+            since.datetime
+            for since, _ in arrow.Arrow.span_range("hour", self.since, self.until)
+        ]
+
+    def aggregate(self, values: List[Any]) -> Any:
+        """Get the indicator result in time buckets of the requested granularity.
+
+        Unique counts are converted to counts to be summed per week or month.
+        """
+        if self.granularity == "hour":
+            return self.merge_hours(values)
+        result = self.merge_all(values)
+        if self.granularity == "day":
+            return result
+        if isinstance(result, DailyUniqueCounts):
+            result = result.to_daily_counts()
+        return result.resample(self.granularity)
+
+    def get_etag(self, last_modified: datetime.datetime) -> str:
+        """Get the entity tag of the results in the requested granularity."""
+        version = f"{super().get_etag(last_modified)}:{self.granularity}"
+        return hashlib.sha256(version.encode()).hexdigest()
+
+    def match(self, statement: XAPI_STATEMENT) -> bool:
+        """Check whether a statement is relevant for this indicator."""
+        return (
+            statement.get("verb", {}).get("id") == self.verb_id
+            and statement.get("object", {}).get("id") == self.object_id
         )
-        return statements
 
     @staticmethod
-    def extract_date_from_timestamp(statements: pd.DataFrame) -> pd.DataFrame:
-        """Convert the 'timestamp' column to a 'date' column with its date values."""
-        statements = statements.copy()
-        statements["date"] = statements["timestamp"].dt.date
-        statements.drop(["timestamp"], axis=1, inplace=True)
-        return statements
+    def _get_frame_span_range(cache: CacheEntry, date: datetime.date) -> DatetimeRange:
+        """Get the date/time span range of a cached frame in its original timezone.
+
+        The database does not store timezones, but we know that the cached frame
+        starts at midnight on `date` in the timezone it has been computed for.
+        Hourly frames are given the offset that makes them start at midnight too,
+        as only the date of their result matters.
+        """
+        local_since = datetime.datetime.combine(date, datetime.time())
+        since = cache.since.astimezone(datetime.timezone.utc).replace(tzinfo=None)  # type: ignore[union-attr]
+        tzinfo = tzoffset(None, (local_since - since).total_seconds())
+        return DatetimeRange(
+            since=cache.since.astimezone(tzinfo),  # type: ignore[union-attr]
+            until=cache.until.astimezone(tzinfo),  # type: ignore[union-attr]
+        )
+
+    @classmethod
+    def get_ingestion_indicators(
+        cls, object_id: str, span_range: DatetimeRange
+    ) -> List["BaseDailyEvent"]:
+        """Get the indicators whose cached frames ingest statements of an object.
+
+        Both daily frames (shared by daily, weekly and monthly results) and
+        hourly frames are updated. Indicators whose constructor requires other
+        arguments should override this method.
+        """
+        indicator = cls(object_id=object_id, span_range=span_range)  # type: ignore[abstract]
+        return [indicator, indicator._replace(granularity="hour")]
+
+    async def merge_statements(
+        self, statements: List[XAPI_STATEMENT]
+    ) -> List[CacheEntry]:
+        """Merge new statements with cached frames, without committing them.
+
+        Statements that match the indicator (verb and activity) are aggregated
+        per cached frame and merged with the frame cached value. Frames that
+        have not been cached yet are left untouched: they will be computed from
+        the LRS when requested.
+
+        Updated frames stay locked until the database transaction ends.
+
+        Returns the list of updated cache entries.
+        """
+        matching = [
+            (statement, timestamp)
+            for statement in statements
+            if self.match(statement)
+            and (timestamp := get_statement_timestamp(statement)) is not None
+        ]
+        if not matching:
+            return []
+
+        timestamps = [timestamp for _, timestamp in matching]
+        # Concurrent ingestions of the same frames merge their statements one
+        # after the other
+        caches = self.db_session.exec(
+            select(CacheEntry)
+            .where(
+                CacheEntry.key == self.cache_key,
+                CacheEntry.since <= max(timestamps),  # type: ignore[operator]
+                CacheEntry.until >= min(timestamps),  # type: ignore[operator]
+            )
+            .with_for_update()
+            .execution_options(populate_existing=True)
+        ).all()
+
+        updated = []
+        for cache in caches:
+            frame_statements = [
+                statement
+                for statement, timestamp in matching
+                if cache.since <= timestamp <= cache.until  # type: ignore[operator]
+            ]
+            if not frame_statements:
+                continue
+            cached = self.merge_all([self.from_cached_value(cache.value)])
+            other = self._replace(
+                span_range=self._get_frame_span_range(cache, cached.counts[0].date)
+            )
+            value = self.merge(cached, other.compute_from_statements(frame_statements))
+            cache.value = self.to_cached_value(value)
+            cache.updated_at = datetime.datetime.now(datetime.timezone.utc)
+            updated.append(cache)
+        self.db_session.flush()
+        return updated
+
+    async def ingest(self, statements: List[XAPI_STATEMENT]) -> List[CacheEntry]:
+        """Incrementally update cached frames with new statements.
+
+        Matching statements are merged with cached frames (see
+        `merge_statements`) which are then saved.
+
+        Nota bene: statements should be pushed once, when they are stored in
+        the LRS, otherwise they will be counted multiple times.
+
+        Returns the list of updated cache entries.
+        """
+        updated = await self.merge_statements(statements)
+        await self.save(updated)
+        return updated
 
 
 class DailyEvent(BaseDailyEvent):
@@ -364,29 +837,33 @@ class DailyEvent(BaseDailyEvent):
         Fetch the statements from the LRS, filter and aggregate them to return the
         number of activity events per day.
         """
+        return self.compute_from_statements(await self.fetch_statements())
+
+    def compute_from_statements(
+        self, raw_statements: List[XAPI_STATEMENT]
+    ) -> DailyCounts:
+        """Filter and aggregate statements to get the number of events per day."""
         # Initialize daily counts within the specified date range,
         # with counts equal to zero
-        daily_counts = DailyCounts.from_range(self.since, self.until)
+        daily_counts = DailyCountsArray.from_range(self.since, self.until)
 
-        raw_statements = await self.fetch_statements()
         if not raw_statements:
-            return daily_counts
+            return daily_counts.to_daily_counts()
         statements = pipe(
-            StatementsTransformer.preprocess,
+            self.preprocess_statements,
             self.filter_statements,
-            self.to_span_range_timezone,
-            self.extract_date_from_timestamp,
         )(raw_statements)
 
-        # Compute daily counts from 'statements' DataFrame
-        # and merge them into the 'daily_counts' object
-        daily_counts.merge_counts(
-            [
-                DailyCount(date=date, count=count)
-                for date, count in statements.groupby("date").size().items()
-            ]
-        )
-        return daily_counts
+        # Count statements per day index and merge them into the 'daily_counts'
+        # array, DailyCount objects are only built for the output
+        with span("groupby", type(self).__qualname__):
+            first, counts = self.engine.count_by_day(statements, self.since)
+            return DailyCountsArray.sum(
+                [
+                    daily_counts,
+                    DailyCountsArray(start=self.get_day_date(first), counts=counts),
+                ]
+            ).to_daily_counts()
 
     @staticmethod
     def merge(a: DailyCounts, b: DailyCounts) -> DailyCounts:
@@ -394,6 +871,20 @@ class DailyEvent(BaseDailyEvent):
         a.merge_counts(b.counts)
         return a
 
+    def merge_all(self, values: List[DailyCounts]) -> DailyCounts:
+        """Sum daily counts of all frames at once."""
+        return DailyCountsArray.sum(
+            DailyCountsArray.from_counts(value.counts) for value in values
+        ).to_daily_counts()
+
+    def merge_hours(self, values: List[DailyCounts]) -> HourlyCounts:
+        """Get the number of events per hour from hourly frames results."""
+        counts = [
+            HourlyCount(date=hour, count=value.total)
+            for hour, value in zip(self.get_hours(), values)
+        ]
+        return HourlyCounts(total=sum(c.count for c in counts), counts=counts)
+
 
 class DailyUniqueEvent(BaseDailyEvent):
     """Daily Unique Event indicator.
@@ -409,14 +900,15 @@ class DailyUniqueEvent(BaseDailyEvent):
         if cls.verb_id is None:
             raise TypeError("Indicators must declare a 'verb_id' class attribute")
 
-    def filter_statements(self, statements: pd.DataFrame) -> pd.DataFrame:
+    def filter_statements(self, statements: Frame) -> Frame:
         """Filter statements required for this indicator.
 
         If necessary, this method removes any duplicate actors from the statements.
         This filtering step is typically done to ensure that each actor's
         contributions are counted only once.
         """
-        return statements.drop_duplicates(subset="actor.uid")
+        statements = self.engine.drop_duplicates(statements, "actor.uid")
+        return super().filter_statements(statements)
 
     async def compute(self) -> DailyUniqueCounts:
         """Fetch statements and computes the current indicator.
@@ -424,32 +916,79 @@ class DailyUniqueEvent(BaseDailyEvent):
         Fetch the statements from the LRS, filter and aggregate them to return the
         number of unique activity events per day.
         """
-        # Initialize daily unique counts within the specified date range,
-        # with counts equal to zero
-        daily_unique_counts = DailyUniqueCounts.from_range(self.since, self.until)
-
-        raw_statements = await self.fetch_statements()
-        if not raw_statements:
-            return daily_unique_counts
-
-        statements = pipe(
-            StatementsTransformer.preprocess,
-            self.filter_statements,
-            self.to_span_range_timezone,
-            self.extract_date_from_timestamp,
-        )(raw_statements)
-
+        return self.compute_from_statements(await self.fetch_statements())
+
+    def compute_from_statements(
+        self, raw_statements: List[XAPI_STATEMENT]
+    ) -> DailyUniqueCounts:
+        """Filter and aggregate statements to get the number of unique events daily."""
+        uniques: Dict[int, Set[str]] = {}
+        if raw_statements:
+            statements = pipe(
+                self.preprocess_statements,
+                self.filter_statements,
+            )(raw_statements)
+            with span("groupby", type(self).__qualname__):
+                uniques = self.engine.unique_by_day(statements, "actor.uid", self.since)
+
+        # Count users on their first day, within the specified date range and
+        # days with users
+        seen: Set[str] = set()
         counts = []
-        for date, users in statements.groupby("date")["actor.uid"].unique().items():
+        days = count_days(self.since, self.until)
+        for day in range(min([0, *uniques]), max([days - 1, *uniques]) + 1):
+            users = uniques.get(day, set()) - seen
+            seen |= users
             counts.append(
-                DailyUniqueCount(date=date, count=len(users), users=set(users))
+                DailyUniqueCount.construct(
+                    date=self.get_day_date(day),  # type: ignore[arg-type]
+                    count=len(users),
+                    users=users,
+                )
             )
-        daily_unique_counts.merge_counts(counts)
-
-        return daily_unique_counts
+        return DailyUniqueCounts.construct(total=len(seen), counts=counts)
 
     @staticmethod
     def merge(a: DailyUniqueCounts, b: DailyUniqueCounts) -> DailyUniqueCounts:
         """Merging function for computed indicators."""
         a.merge_counts(b.counts)
         return a
+
+    def to_cached_value(self, result: DailyUniqueCounts) -> Dict[str, Any]:
+        """Cache the interned ids of daily users (see `DailyUniqueCountsArray`)."""
+        ids = intern_actor_uids(
+            self.db_session, (user for count in result.counts for user in count.users)
+        )
+        return DailyUniqueCountsArray.from_counts(result.counts, ids).to_cached_value()
+
+    def from_cached_value(self, value: Dict[str, Any]) -> DailyUniqueCountsArray:
+        """Get the interned ids of daily users from a cached frame."""
+        return DailyUniqueCountsArray.from_cached_value(value)
+
+    def merge_all(self, values: List[DailyUniqueCountsArray]) -> DailyUniqueCounts:
+        """Join daily users ids of all frames at once.
+
+        Users are only mapped to their uid in the merged result.
+        """
+        array = DailyUniqueCountsArray.sum(values)
+        return array.to_daily_unique_counts(
+            get_interned_actor_uids(self.db_session, array.users.tolist())
+        )
+
+    def merge_hours(self, values: List[DailyUniqueCountsArray]) -> HourlyCounts:
+        """Get the number of unique events per hour from hourly frames results.
+
+        As for daily counts, users are only counted on the first hour they
+        occur along the date/time range.
+        """
+        hours = DailyUniqueCountsArray.from_users(
+            None,
+            np.repeat(np.arange(len(values)), [value.total for value in values]),
+            np.concatenate([value.users for value in values]),
+            days=len(values),
+        )
+        counts = [
+            HourlyCount(date=hour, count=count)
+            for hour, count in zip(self.get_hours(), hours.counts.tolist())
+        ]
+        return HourlyCounts(total=hours.total, counts=counts)
@@ -1,11 +1,13 @@
 """Indicators SQL Models."""
 
 from datetime import datetime, timezone
+from enum import Enum
 from typing import Optional, Union
 from uuid import UUID, uuid4
 
 from pydantic import Json
-from sqlalchemy import Column
+from sqlalchemy import Column, Index, text
+from sqlalchemy import Enum as SAEnum
 from sqlalchemy.types import JSON as SAJson
 from sqlalchemy.types import DateTime
 from sqlmodel import Field, SQLModel
@@ -16,14 +18,87 @@ class CacheEntryCreate(SQLModel):  # type: ignore[misc]
 
     id: Optional[UUID] = Field(default_factory=lambda: uuid4().hex, primary_key=True)
     key: str = Field(max_length=100, index=True)
-    value: Union[dict, list, Json] = Field(sa_column=Column(SAJson))
+    value: Union[list, dict, Json] = Field(sa_column=Column(SAJson))
     since: Optional[datetime] = Field(sa_column=Column(DateTime(timezone=True)))
     until: Optional[datetime] = Field(sa_column=Column(DateTime(timezone=True)))
     created_at: datetime = Field(
         sa_column=Column(DateTime(timezone=True)),
         default_factory=lambda: datetime.now(timezone.utc),
     )
+    # Last time the cached value has been saved
+    updated_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), onupdate=lambda: datetime.now(timezone.utc)
+        ),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
 
 
 class CacheEntry(CacheEntryCreate, table=True):  # type: ignore[call-arg, misc]
     """Indicator generic persistence (table version)."""
+
+
+class ActorUid(SQLModel, table=True):  # type: ignore[call-arg, misc]
+    """Interned actor uid persistence (see `warren.indicators.actors`)."""
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    uid: str = Field(max_length=64, unique=True)
+
+
+class JobStatus(str, Enum):
+    """Indicator job statuses."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class JobRead(SQLModel):  # type: ignore[misc]
+    """Indicator job status."""
+
+    id: Optional[UUID] = Field(default_factory=uuid4, primary_key=True)
+    indicator: str = Field(max_length=255)
+    status: JobStatus = JobStatus.PENDING
+    progress: float = Field(default=0.0, description="Percentage of computed frames")
+    error: Optional[str] = None
+    created_at: datetime = Field(
+        sa_column=Column(DateTime(timezone=True)),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+    updated_at: datetime = Field(
+        sa_column=Column(
+            DateTime(timezone=True), onupdate=lambda: datetime.now(timezone.utc)
+        ),
+        default_factory=lambda: datetime.now(timezone.utc),
+    )
+
+
+class Job(JobRead, table=True):  # type: ignore[call-arg, misc]
+    """Indicator job persistence (table version)."""
+
+    __table_args__ = (
+        # Identical jobs cannot be pending (or running) twice, even when
+        # submitted concurrently
+        Index(
+            "ix_job_key_active",
+            "key",
+            unique=True,
+            postgresql_where=text("status IN ('PENDING', 'RUNNING')"),
+        ),
+    )
+    status: JobStatus = Field(
+        sa_column=Column(SAEnum(JobStatus), index=True),
+        default=JobStatus.PENDING,
+    )
+    # Identical jobs share the same key
+    key: str = Field(max_length=100, index=True)
+    # Jobs are only readable by their submitter (LTI consumer site and course)
+    consumer_site: str = Field(max_length=255)
+    course_id: str = Field(max_length=255)
+    arguments: dict = Field(sa_column=Column(SAJson))
+    result: Optional[Union[list, dict]] = Field(default=None, sa_column=Column(SAJson))
+    # Running jobs lease: renewed by the worker running the job
+    heartbeat_at: Optional[datetime] = Field(
+        default=None, sa_column=Column(DateTime(timezone=True))
+    )
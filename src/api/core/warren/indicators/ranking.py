@@ -0,0 +1,30 @@
+"""Ranking of objects by their number of events."""
+
+import heapq
+import logging
+from typing import List, Sequence
+
+from warren.models import ActivityCount
+
+from .mixins import BaseDailyEvent, IncrementalCacheMixin
+
+logger = logging.getLogger(__name__)
+
+
+async def get_top_counts(
+    indicators: Sequence[BaseDailyEvent], size: int
+) -> List[ActivityCount]:
+    """Get the `size` objects of daily event indicators with the most events.
+
+    Results of all indicators are computed from their cached frames at once
+    (see `IncrementalCacheMixin.get_or_compute_many`), then the top objects
+    are selected using a heap: objects are partially sorted in O(n log size).
+    Objects with the same number of events are ranked in the indicators order.
+    """
+    results = await IncrementalCacheMixin.get_or_compute_many(indicators)
+    logger.debug("Ranking %d objects", len(results))
+    top = heapq.nlargest(size, zip(indicators, results), key=lambda item: item[1].total)
+    return [
+        ActivityCount(iri=indicator.object_id, count=result.total)
+        for indicator, result in top
+    ]
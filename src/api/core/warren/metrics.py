@@ -0,0 +1,88 @@
+"""Warren Prometheus metrics.
+
+Metrics are exposed by the `/__metrics__` endpoint. When the API is served by
+multiple worker processes (_e.g._ `uvicorn --workers` or gunicorn), the
+`PROMETHEUS_MULTIPROC_DIR` environment variable must be set to an empty
+directory shared by workers (before they start) so that metrics of all
+workers are aggregated.
+"""
+
+import os
+from typing import Literal
+
+from prometheus_client import (
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    multiprocess,
+)
+from prometheus_client.registry import REGISTRY
+
+CacheResult = Literal["hit", "miss", "partial"]
+
+# Indicators
+INDICATOR_CACHE_REQUESTS = Counter(
+    "warren_indicator_cache_requests",
+    "Indicators results requests by cache result: results are either fully "
+    "cached (hit), not cached (miss) or partially cached (partial, for "
+    "incremental indicators).",
+    ["indicator", "result"],
+)
+INDICATOR_FRAMES_COMPUTED = Counter(
+    "warren_indicator_frames_computed",
+    "Indicators frames computed (results for non-incremental indicators).",
+    ["indicator"],
+)
+INDICATOR_COMPUTE_DURATION = Histogram(
+    "warren_indicator_compute_duration_seconds",
+    "Indicators frames (results for non-incremental indicators) compute duration.",
+    ["indicator"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+
+# LRS
+LRS_REQUEST_DURATION = Histogram(
+    "warren_lrs_request_duration_seconds",
+    "Duration of LRS queries fetching indicators statements (all pages).",
+    ["indicator"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+LRS_STATEMENTS_FETCHED = Counter(
+    "warren_lrs_statements_fetched",
+    "Statements fetched from the LRS to compute indicators.",
+    ["indicator"],
+)
+
+# Authentication
+LTI_TOKEN_CACHE_REQUESTS = Counter(
+    "warren_lti_token_cache_requests",
+    "LTI tokens verifications by cache result: verified payloads are either "
+    "cached (hit) or not (miss).",
+    ["result"],
+)
+
+# Database
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "warren_db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool.",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0),
+)
+
+
+def observe_cache_result(indicator: str, computed: int, total: int):
+    """Count an indicator results request given its computed and total frames."""
+    result: CacheResult = "hit"
+    if computed:
+        result = "miss" if computed == total else "partial"
+    INDICATOR_CACHE_REQUESTS.labels(indicator=indicator, result=result).inc()
+    if computed:
+        INDICATOR_FRAMES_COMPUTED.labels(indicator=indicator).inc(computed)
+
+
+def get_registry() -> CollectorRegistry:
+    """Get the registry collecting metrics of the current process (or all workers)."""
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+    return registry
@@ -0,0 +1,32 @@
+"""invalidate cached actor uids
+
+Revision ID: 1d7b3e5a9c2f
+Revises: 77a0f0fbb8ab
+Create Date: 2026-10-19 09:12:36.480127
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "1d7b3e5a9c2f"
+down_revision: Union[str, None] = "77a0f0fbb8ab"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Actor uids used to be computed from identifier columns in an arbitrary order:
+# cached daily unique users (and results embedding them) will be computed again
+DELETE_UNIQUE_USERS_CACHE_ENTRIES = (
+    "DELETE FROM cacheentry WHERE CAST(value AS TEXT) LIKE '%users%'"
+)
+
+
+def upgrade() -> None:
+    op.execute(DELETE_UNIQUE_USERS_CACHE_ENTRIES)
+
+
+def downgrade() -> None:
+    op.execute(DELETE_UNIQUE_USERS_CACHE_ENTRIES)
@@ -1,11 +1,11 @@
 """Warren's core models."""
 
-from datetime import datetime
-from functools import reduce
-from itertools import groupby
-from typing import Any, Dict, List, Optional, Set, Union
+import datetime
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Literal, Optional, Set, Tuple, Union
 
 import arrow
+import numpy as np
 from lti_toolbox.launch_params import LTIRole
 from pydantic.main import BaseModel
 
@@ -13,6 +13,9 @@ from warren.fields import Date
 
 XAPI_STATEMENT = Dict[str, Any]
 
+# Time buckets of event indicators results
+Granularity = Literal["hour", "day", "week", "month"]
+
 
 class DailyCount(BaseModel):
     """Base model to represent a count for a date."""
@@ -114,7 +117,7 @@ class DailyCounts(BaseModel):
     counts: List[DailyCount] = []
 
     @classmethod
-    def from_range(cls, since: datetime, until: datetime):
+    def from_range(cls, since: datetime.datetime, until: datetime.datetime):
         """Initialize DailyCounts from a date range.
 
         Examples:
@@ -151,16 +154,23 @@ class DailyCounts(BaseModel):
 
         Note:
             When merging `DailyCount` instances, the merged output will
-            be sorted by ascending date.
+            be sorted by ascending date. Counts are merged using their dense
+            representation (see `DailyCountsArray`): days missing between the
+            first and the last dates are added with a zero count.
 
         """
-        self.counts += counts
-        self.counts.sort(key=lambda x: x.date)
-        self.counts = [
-            reduce(lambda x, y: x + y, v)
-            for k, v in groupby(self.counts, lambda dc: dc.date)
-        ]
-        self.total = sum(dc.count for dc in self.counts)
+        merged = DailyCountsArray.sum(
+            [
+                DailyCountsArray.from_counts(self.counts),
+                DailyCountsArray.from_counts(counts),
+            ]
+        ).to_daily_counts()
+        self.counts = merged.counts
+        self.total = merged.total
+
+    def resample(self, granularity: Literal["day", "week", "month"]) -> "DailyCounts":
+        """Sum daily counts per week or month (see `DailyCountsArray.resample`)."""
+        return DailyCountsArray.from_counts(self.counts).resample(granularity)
 
 
 class DailyUniqueCounts(BaseModel):
@@ -170,7 +180,7 @@ class DailyUniqueCounts(BaseModel):
     counts: List[DailyUniqueCount] = []
 
     @classmethod
-    def from_range(cls, since: datetime, until: datetime):
+    def from_range(cls, since: datetime.datetime, until: datetime.datetime):
         """Initialize DailyUniqueCounts from a date range.
 
         Examples:
@@ -212,24 +222,24 @@ class DailyUniqueCounts(BaseModel):
 
         Note:
             When merging `DailyUniqueCount` instances, the merged output will
-            be sorted by ascending date.
+            be sorted by ascending date. Counts are merged using their sparse
+            representation (see `DailyUniqueCountsArray`), users being interned
+            for this merge only: days missing between the first and the last
+            dates are added with a zero count.
 
         """
-        self.counts += counts
-        self.counts.sort(key=lambda x: x.date)
-        self.counts = [
-            reduce(lambda x, y: x + y, v)
-            for k, v in groupby(self.counts, lambda dc: dc.date)
-        ]
-
-        # Only consider the first occurrence of a user along the date range
-        users: Set[str] = set()
-        self.total = 0
-        for count in self.counts:
-            count.users = count.users - users
-            count.count = len(count.users)
-            self.total += count.count
-            users |= count.users
+        uids = dict(
+            enumerate({user for count in self.counts + counts for user in count.users})
+        )
+        ids = {uid: user for user, uid in uids.items()}
+        merged = DailyUniqueCountsArray.sum(
+            [
+                DailyUniqueCountsArray.from_counts(self.counts, ids),
+                DailyUniqueCountsArray.from_counts(counts, ids),
+            ]
+        ).to_daily_unique_counts(uids)
+        self.counts = merged.counts
+        self.total = merged.total
 
     def to_daily_counts(self):
         """Convert DailyUniqueCounts to DailyCounts."""
@@ -238,6 +248,265 @@ class DailyUniqueCounts(BaseModel):
         return DailyCounts(total=total, counts=counts)
 
 
+class ActivityCount(BaseModel):
+    """Base model to represent the total count of an activity."""
+
+    iri: str
+    count: int = 0
+
+
+class HourlyCount(BaseModel):
+    """Base model to represent a count for an hour."""
+
+    date: datetime.datetime
+    count: int = 0
+
+
+class HourlyCounts(BaseModel):
+    """Base model to represent hourly counts summary."""
+
+    total: int = 0
+    counts: List[HourlyCount] = []
+
+
+def count_days(since: datetime.datetime, until: datetime.datetime) -> int:
+    """Count days of a date range, as listed by `DailyCounts.from_range`."""
+    return sum(1 for _ in arrow.Arrow.range("day", since, until))
+
+
+def get_dates_offsets(
+    dates: Iterable[datetime.date],
+) -> Tuple[Optional[datetime.date], np.ndarray]:
+    """Get the first of `dates` and the offset in days of each date from it."""
+    days = np.array(list(dates), dtype="datetime64[D]")
+    if not len(days):
+        return None, np.zeros(0, dtype=np.int64)
+    start = days.min()
+    return start.item(), (days - start).astype(np.int64)
+
+
+@dataclass
+class DailyCountsArray:
+    """Dense representation of daily counts used to merge them.
+
+    Counts are stored in an int64 array with a count per consecutive day from
+    the `start` date (`None` if there is no count). Days without count between
+    the first and the last dates are counted as zero. Pydantic models are only
+    built for serialization.
+    """
+
+    start: Optional[datetime.date] = None
+    counts: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int64))
+
+    @property
+    def total(self) -> int:
+        """Total count along the date range."""
+        return int(self.counts.sum())
+
+    @classmethod
+    def from_range(
+        cls, since: datetime.datetime, until: datetime.datetime
+    ) -> "DailyCountsArray":
+        """Initialize zero counts for a date range."""
+        return cls(
+            start=since.date(), counts=np.zeros(count_days(since, until), np.int64)
+        )
+
+    @classmethod
+    def from_counts(cls, counts: List[DailyCount]) -> "DailyCountsArray":
+        """Initialize from DailyCount objects, summing counts of the same date."""
+        start, offsets = get_dates_offsets(count.date for count in counts)
+        values = np.zeros(offsets.max() + 1 if len(offsets) else 0, dtype=np.int64)
+        np.add.at(values, offsets, [count.count for count in counts])
+        return cls(start=start, counts=values)
+
+    @classmethod
+    def sum(cls, arrays: Iterable["DailyCountsArray"]) -> "DailyCountsArray":
+        """Sum daily counts arrays, spanning all their date ranges."""
+        arrays = [array for array in arrays if array.start is not None]
+        if not arrays:
+            return cls()
+        start = min(array.start for array in arrays)  # type: ignore[type-var]
+        offsets = [(array.start - start).days for array in arrays]  # type: ignore[operator]
+        counts = np.zeros(
+            max(offset + len(array.counts) for offset, array in zip(offsets, arrays)),
+            dtype=np.int64,
+        )
+        for offset, array in zip(offsets, arrays):
+            counts[offset : offset + len(array.counts)] += array.counts
+        return cls(start=start, counts=counts)
+
+    def to_daily_counts(self) -> DailyCounts:
+        """Build the DailyCounts model."""
+        if self.start is None:
+            return DailyCounts()
+        return DailyCounts(
+            total=self.total,
+            counts=[
+                DailyCount(
+                    date=self.start + datetime.timedelta(days=offset), count=count
+                )
+                for offset, count in enumerate(self.counts.tolist())
+            ],
+        )
+
+    def resample(self, granularity: Literal["day", "week", "month"]) -> DailyCounts:
+        """Build the DailyCounts model, summing counts per `granularity` bucket.
+
+        Weekly (ISO weeks) and monthly buckets are dated with their first day:
+        buckets at both ends of the date range may only count some of their
+        days.
+        """
+        if granularity == "day" or not len(self.counts):
+            return self.to_daily_counts()
+        dates = np.datetime64(self.start, "D") + np.arange(len(self.counts))
+        if granularity == "week":
+            # The UNIX epoch (day zero) is a Thursday
+            buckets = dates - (dates.astype(np.int64) + 3) % 7
+        else:
+            buckets = dates.astype("datetime64[M]").astype("datetime64[D]")
+        dates, firsts = np.unique(buckets, return_index=True)
+        return DailyCounts(
+            total=self.total,
+            counts=[
+                DailyCount(date=date, count=count)
+                for date, count in zip(
+                    dates.tolist(), np.add.reduceat(self.counts, firsts).tolist()
+                )
+            ],
+        )
+
+
+@dataclass
+class DailyUniqueCountsArray:
+    """Sparse representation of daily unique counts used to merge them.
+
+    Users are interned actors ids (see `warren.indicators.actors`) stored in an
+    int32 array, sorted by the offset in days (from the `start` date, `None` if
+    there is no count) of the day they first occur along the date range. The
+    array spans `days` consecutive days: days without users are counted as zero.
+    """
+
+    start: Optional[datetime.date] = None
+    days: int = 0
+    offsets: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
+    users: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.int32))
+
+    @property
+    def total(self) -> int:
+        """Total count of users along the date range."""
+        return len(self.users)
+
+    @property
+    def counts(self) -> np.ndarray:
+        """Number of users counted on each day."""
+        return np.bincount(self.offsets, minlength=self.days)
+
+    @classmethod
+    def from_range(
+        cls, since: datetime.datetime, until: datetime.datetime
+    ) -> "DailyUniqueCountsArray":
+        """Initialize a date range without users."""
+        return cls(start=since.date(), days=count_days(since, until))
+
+    @classmethod
+    def from_users(
+        cls,
+        start: Optional[datetime.date],
+        offsets: np.ndarray,
+        users: np.ndarray,
+        days: int,
+    ) -> "DailyUniqueCountsArray":
+        """Initialize from the day offset of users, keeping their first day only."""
+        offsets = np.asarray(offsets, dtype=np.int32)
+        users = np.asarray(users, dtype=np.int32)
+        # Once sorted by user then by day, the first day of a user comes first
+        order = np.lexsort((offsets, users))
+        offsets, users = offsets[order], users[order]
+        first = np.ones(len(users), dtype=bool)
+        first[1:] = users[1:] != users[:-1]
+        offsets, users = offsets[first], users[first]
+        order = np.lexsort((users, offsets))
+        return cls(start=start, days=days, offsets=offsets[order], users=users[order])
+
+    @classmethod
+    def from_counts(
+        cls, counts: List[DailyUniqueCount], ids: Dict[str, int]
+    ) -> "DailyUniqueCountsArray":
+        """Initialize from DailyUniqueCount objects given interned users `ids`."""
+        start, offsets = get_dates_offsets(count.date for count in counts)
+        return cls.from_users(
+            start,
+            np.repeat(offsets, [len(count.users) for count in counts]),
+            np.fromiter(
+                (ids[user] for count in counts for user in count.users),
+                dtype=np.int32,
+            ),
+            days=int(offsets.max()) + 1 if len(offsets) else 0,
+        )
+
+    @classmethod
+    def sum(
+        cls, arrays: Iterable["DailyUniqueCountsArray"]
+    ) -> "DailyUniqueCountsArray":
+        """Join daily users of arrays, spanning all their date ranges."""
+        arrays = [array for array in arrays if array.start is not None]
+        if not arrays:
+            return cls()
+        start = min(array.start for array in arrays)  # type: ignore[type-var]
+        offsets = [(array.start - start).days for array in arrays]  # type: ignore[operator]
+        return cls.from_users(
+            start,
+            np.concatenate(
+                [array.offsets + offset for offset, array in zip(offsets, arrays)]
+            ),
+            np.concatenate([array.users for array in arrays]),
+            days=max(offset + array.days for offset, array in zip(offsets, arrays)),
+        )
+
+    @classmethod
+    def from_cached_value(cls, value: Dict[str, Any]) -> "DailyUniqueCountsArray":
+        """Initialize from a cached value (see `to_cached_value`)."""
+        if value["start"] is None:
+            return cls()
+        days = value["users"]
+        return cls.from_users(
+            datetime.date.fromisoformat(value["start"]),
+            np.repeat(np.arange(len(days)), [len(users) for users in days]),
+            np.fromiter((user for users in days for user in users), dtype=np.int32),
+            days=len(days),
+        )
+
+    def to_cached_value(self) -> Dict[str, Any]:
+        """Get the JSON document of the users ids of each day, to be cached."""
+        if self.start is None:
+            return {"start": None, "users": []}
+        bounds = np.searchsorted(self.offsets, np.arange(1, self.days))
+        return {
+            "start": self.start.isoformat(),
+            "users": [users.tolist() for users in np.split(self.users, bounds)],
+        }
+
+    def to_daily_unique_counts(self, uids: Dict[int, str]) -> DailyUniqueCounts:
+        """Build the DailyUniqueCounts model given interned users `uids`."""
+        if self.start is None:
+            return DailyUniqueCounts()
+        bounds = np.searchsorted(self.offsets, np.arange(1, self.days))
+        # Counts are built from valid users sets: skip their (costly)
+        # validation
+        return DailyUniqueCounts.construct(
+            total=self.total,
+            counts=[
+                DailyUniqueCount.construct(
+                    date=self.start + datetime.timedelta(days=offset),  # type: ignore[arg-type]
+                    count=len(users),
+                    users={uids[user] for user in users.tolist()},
+                )
+                for offset, users in enumerate(np.split(self.users, bounds))
+            ],
+        )
+
+
 class LTIUser(BaseModel):
     """Model to represent LTI user data."""
 
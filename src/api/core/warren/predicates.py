@@ -0,0 +1,145 @@
+"""Declarative statements predicates.
+
+Predicates describe statements filters independently of the dataframe engine
+used to compute indicators. Engines compile them to boolean masks.
+
+Example usage:
+
+    predicate = (Column("result.score.raw") >= 10) & ~Column("verb.id").isin(ids)
+
+Missing values (and missing columns) never match a comparison, nor its
+negation.
+"""
+
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import reduce
+from typing import Any, Literal, Tuple
+
+ComparisonOperator = Literal["eq", "ne", "lt", "le", "gt", "ge", "isin", "notnull"]
+
+
+class Predicate(ABC):
+    """Base statements predicate, that can be combined using `&`, `|` and `~`."""
+
+    def __and__(self, other: "Predicate") -> "Predicate":
+        """Both predicates must match."""
+        return And(self, other)
+
+    def __or__(self, other: "Predicate") -> "Predicate":
+        """Any of the predicates must match."""
+        return Or(self, other)
+
+    def __invert__(self) -> "Predicate":
+        """The predicate must not match."""
+        return Not(self)
+
+    @property
+    @abstractmethod
+    def columns(self) -> Tuple[str, ...]:
+        """Columns compared by the predicate."""
+
+
+@dataclass(frozen=True)
+class Comparison(Predicate):
+    """Compare a column values to a value."""
+
+    column: str
+    op: ComparisonOperator
+    value: Any
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Columns compared by the predicate."""
+        return (self.column,)
+
+
+@dataclass(frozen=True)
+class And(Predicate):
+    """Both predicates must match."""
+
+    left: Predicate
+    right: Predicate
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Columns compared by the predicate."""
+        return tuple(dict.fromkeys((*self.left.columns, *self.right.columns)))
+
+
+@dataclass(frozen=True)
+class Or(Predicate):
+    """Any of the predicates must match."""
+
+    left: Predicate
+    right: Predicate
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Columns compared by the predicate."""
+        return tuple(dict.fromkeys((*self.left.columns, *self.right.columns)))
+
+
+@dataclass(frozen=True)
+class Not(Predicate):
+    """The predicate must not match."""
+
+    predicate: Predicate
+
+    @property
+    def columns(self) -> Tuple[str, ...]:
+        """Columns compared by the predicate."""
+        return self.predicate.columns
+
+    @property
+    def notnull(self) -> Predicate:
+        """Compared columns must not have missing values.
+
+        Negated comparisons never match missing values either.
+        """
+        predicates: Tuple[Predicate, ...] = tuple(
+            Column(column).notnull() for column in self.columns
+        )
+        return reduce(And, predicates)
+
+
+class Column:
+    """A statements column (dotted path) to build comparison predicates."""
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __init__(self, name: str):
+        """Instantiate the column given its name (_e.g._ `verb.id`)."""
+        self.name = name
+
+    def __eq__(self, value: Any) -> Comparison:  # type: ignore[override]
+        """Values must be equal to `value`."""
+        return Comparison(self.name, "eq", value)
+
+    def __ne__(self, value: Any) -> Comparison:  # type: ignore[override]
+        """Values must be different from `value`."""
+        return Comparison(self.name, "ne", value)
+
+    def __lt__(self, value: Any) -> Comparison:
+        """Values must be lower than `value`."""
+        return Comparison(self.name, "lt", value)
+
+    def __le__(self, value: Any) -> Comparison:
+        """Values must be lower than or equal to `value`."""
+        return Comparison(self.name, "le", value)
+
+    def __gt__(self, value: Any) -> Comparison:
+        """Values must be greater than `value`."""
+        return Comparison(self.name, "gt", value)
+
+    def __ge__(self, value: Any) -> Comparison:
+        """Values must be greater than or equal to `value`."""
+        return Comparison(self.name, "ge", value)
+
+    def isin(self, values: Tuple[Any, ...]) -> Comparison:
+        """Values must be one of `values`."""
+        return Comparison(self.name, "isin", tuple(values))
+
+    def notnull(self) -> Comparison:
+        """Values must not be missing."""
+        return Comparison(self.name, "notnull", None)
@@ -0,0 +1,32 @@
+"""Tests for the API CORS configuration."""
+
+import pytest
+
+from warren.conf import settings
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("method", ["GET", "POST"])
+async def test_api_cors_preflight(http_client, method):
+    """Test browsers are allowed to send GET and POST requests."""
+    response = await http_client.options(
+        "/api/v1/video/views",
+        headers={
+            "Origin": settings.ALLOWED_HOSTS[0],
+            "Access-Control-Request-Method": method,
+            "Access-Control-Request-Headers": "authorization,content-type",
+        },
+    )
+    assert response.status_code == 200
+    assert method in response.headers["Access-Control-Allow-Methods"]
+
+
+@pytest.mark.anyio
+async def test_api_cors_expose_headers(http_client):
+    """Test browsers may read headers set by the API."""
+    response = await http_client.get(
+        "/__lbheartbeat__", headers={"Origin": settings.ALLOWED_HOSTS[0]}
+    )
+    assert response.headers["Access-Control-Allow-Origin"] == settings.ALLOWED_HOSTS[0]
+    exposed = response.headers["Access-Control-Expose-Headers"].split(", ")
+    assert {"ETag", "Retry-After", "Server-Timing", "X-Next-Cursor"} <= set(exposed)
@@ -62,3 +62,14 @@ async def test_api_health_heartbeat(db_session, http_client, monkeypatch):
         response = await http_client.get("/__heartbeat__")
         assert response.json() == {"data": "error", "lrs": "error"}
         assert response.status_code == 500
+
+
+@pytest.mark.anyio
+async def test_api_health_metrics(http_client):
+    """Test the Prometheus metrics endpoint."""
+    response = await http_client.get("/__metrics__")
+    assert response.status_code == 200
+    assert response.headers["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE warren_indicator_cache_requests_total counter" in response.text
+    assert "# TYPE warren_lrs_request_duration_seconds histogram" in response.text
+    assert "# TYPE warren_lti_token_cache_requests_total counter" in response.text
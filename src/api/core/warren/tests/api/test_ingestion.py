@@ -0,0 +1,93 @@
+"""Tests for the statements ingestion endpoint."""
+
+import pytest
+from arrow import Arrow
+from warren_video.indicators import DailyDownloads
+
+from warren.conf import settings
+from warren.factories.base import BaseXapiStatementFactory
+from warren.filters import DatetimeRange
+from warren.indicators.models import CacheEntry
+from warren.models import DailyCounts
+
+OBJECT_ID = "uuid://dd38149d-956a-483d-8975-c1506de1e1a9"
+
+
+@pytest.fixture
+def ingestion_credentials(monkeypatch):
+    """Enable the ingestion endpoint."""
+    monkeypatch.setattr(settings, "INGESTION_AUTH_BASIC_USERNAME", "lrs")
+    monkeypatch.setattr(settings, "INGESTION_AUTH_BASIC_PASSWORD", "secret")
+    return ("lrs", "secret")
+
+
+@pytest.mark.anyio
+async def test_api_ingestion_disabled(http_client):
+    """Test the ingestion endpoint is disabled by default."""
+    response = await http_client.post(
+        "/api/v1/ingestion/statements", json=[], auth=("lrs", "secret")
+    )
+    assert response.status_code == 403
+    assert response.json() == {"detail": "Statements ingestion is disabled"}
+
+
+@pytest.mark.anyio
+async def test_api_ingestion_authentication(http_client, ingestion_credentials):
+    """Test the ingestion endpoint requires valid credentials."""
+    response = await http_client.post("/api/v1/ingestion/statements", json=[])
+    assert response.status_code == 401
+
+    response = await http_client.post(
+        "/api/v1/ingestion/statements", json=[], auth=("lrs", "foo")
+    )
+    assert response.status_code == 401
+    assert response.headers["WWW-Authenticate"] == "Basic"
+
+
+@pytest.mark.anyio
+async def test_api_ingestion_statements(http_client, db_session, ingestion_credentials):
+    """Test statements ingestion updates cached indicators."""
+    indicator = DailyDownloads(
+        object_id=OBJECT_ID,
+        span_range=DatetimeRange(since="2023-01-01", until="2023-01-01"),
+    )
+    since, until = next(Arrow.span_range("day", Arrow(2023, 1, 1), Arrow(2023, 1, 1)))
+    db_session.add(
+        CacheEntry(
+            key=indicator.cache_key,
+            value=DailyCounts.from_range(since.datetime, until.datetime).json(),
+            since=since.datetime,
+            until=until.datetime,
+        )
+    )
+    db_session.commit()
+
+    statement = BaseXapiStatementFactory.build(
+        mutations=[
+            {
+                "timestamp": "2023-01-01T10:00:00+00:00",
+                "verb": {"id": DailyDownloads.verb_id},
+                "object": {"id": OBJECT_ID},
+            }
+        ]
+    )
+
+    # A list of statements
+    response = await http_client.post(
+        "/api/v1/ingestion/statements",
+        content=f"[{statement.json()}, {statement.json()}]",
+        auth=ingestion_credentials,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"statements": 2, "updated": 1}
+
+    # A single statement
+    response = await http_client.post(
+        "/api/v1/ingestion/statements",
+        content=statement.json(),
+        auth=ingestion_credentials,
+    )
+    assert response.status_code == 200
+    assert response.json() == {"statements": 1, "updated": 1}
+
+    assert (await indicator.get_or_compute()).total == 3
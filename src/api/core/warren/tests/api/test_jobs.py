@@ -0,0 +1,137 @@
+"""Tests for the indicators jobs endpoints."""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from warren.conf import settings
+from warren.indicators.models import Job, JobStatus
+from warren.utils import forge_lti_token, get_lti_token
+
+
+@pytest.fixture
+def job(db_session):
+    """Create a pending job submitted with the default LTI token."""
+    token = get_lti_token(forge_lti_token())
+    job = Job(
+        key="foo",
+        indicator="warren_video.indicators:DailyViews",
+        arguments={},
+        consumer_site=token.consumer_site,
+        course_id=token.course_id,
+    )
+    db_session.add(job)
+    db_session.commit()
+    return job
+
+
+@pytest.mark.anyio
+async def test_api_jobs_authentication(http_client, job):
+    """Test jobs endpoints require a valid LTI token."""
+    response = await http_client.get(f"/api/v1/jobs/{job.id}")
+    assert response.status_code == 401
+
+    response = await http_client.get(f"/api/v1/jobs/{job.id}/result")
+    assert response.status_code == 401
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "submitter",
+    [
+        {"consumer_site": "http://other-lms.com"},
+        {"course_id": "course-v1:openfun+physics101+session01"},
+    ],
+)
+async def test_api_jobs_other_submitter(http_client, job, submitter):
+    """Test jobs submitted by another LTI consumer site or course are not found."""
+    headers = {"Authorization": f"Bearer {forge_lti_token(**submitter)}"}
+
+    response = await http_client.get(f"/api/v1/jobs/{job.id}", headers=headers)
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Job not found"}
+
+    response = await http_client.get(f"/api/v1/jobs/{job.id}/result", headers=headers)
+    assert response.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_api_jobs_read_job(http_client, auth_headers, job):
+    """Test getting a job status."""
+    response = await http_client.get(f"/api/v1/jobs/{uuid4()}", headers=auth_headers)
+    assert response.status_code == 404
+    assert response.json() == {"detail": "Job not found"}
+
+    response = await http_client.get(f"/api/v1/jobs/{job.id}", headers=auth_headers)
+    assert response.status_code == 200
+    status = response.json()
+    assert status["id"] == str(job.id)
+    assert status["status"] == "pending"
+    assert status["progress"] == 0
+    assert "result" not in status
+    assert "arguments" not in status
+
+    response = await http_client.get(
+        f"/api/v1/jobs/{job.id}",
+        params={"wait": settings.JOBS_MAX_WAIT + 1},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_api_jobs_read_job_long_polling(
+    http_client, auth_headers, db_session, job, monkeypatch
+):
+    """Test waiting for a job to be done."""
+    monkeypatch.setattr(settings, "JOBS_POLL_INTERVAL", 0.01)
+
+    # The job is still pending after the waiting time
+    response = await http_client.get(
+        f"/api/v1/jobs/{job.id}", params={"wait": 0.05}, headers=auth_headers
+    )
+    assert response.json()["status"] == "pending"
+
+    async def finish():
+        await asyncio.sleep(0.05)
+        job.status = JobStatus.DONE
+        job.progress = 100.0
+        db_session.commit()
+
+    task = asyncio.create_task(finish())
+    response = await http_client.get(
+        f"/api/v1/jobs/{job.id}", params={"wait": 5}, headers=auth_headers
+    )
+    await task
+    assert response.json()["status"] == "done"
+    assert response.json()["progress"] == 100.0
+
+
+@pytest.mark.anyio
+async def test_api_jobs_read_job_result(http_client, auth_headers, db_session, job):
+    """Test getting the result of a job."""
+    url = f"/api/v1/jobs/{job.id}/result"
+
+    response = await http_client.get(url, headers=auth_headers)
+    assert response.status_code == 409
+    assert response.json() == {"detail": "Job is pending"}
+
+    job.status = JobStatus.FAILED
+    job.error = "'timestamp'"
+    db_session.commit()
+    response = await http_client.get(url, headers=auth_headers)
+    assert response.status_code == 409
+    assert response.json() == {"detail": "Job has failed: 'timestamp'"}
+
+    job.status = JobStatus.DONE
+    job.result = {"total": 0, "counts": []}
+    db_session.commit()
+    response = await http_client.get(url, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json() == {"total": 0, "counts": []}
+
+    response = await http_client.get(
+        f"/api/v1/jobs/{uuid4()}/result", headers=auth_headers
+    )
+    assert response.status_code == 404
@@ -6,6 +6,7 @@ from .fixtures.app import http_auth_client, http_client
 from .fixtures.asynchronous import anyio_backend
 from .fixtures.auth import auth_headers
 from .fixtures.db import (
+    cache_frames,
     db_engine,
     db_session,
     force_db_test_session,
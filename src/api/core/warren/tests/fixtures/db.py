@@ -3,12 +3,15 @@
 import pytest
 from alembic import command
 from alembic.config import Config
+from arrow import Arrow
 from sqlmodel import Session, SQLModel, create_engine
 
 from warren.api.v1 import app as v1
 from warren.conf import settings
 from warren.db import get_session
 from warren.indicators.mixins import CacheMixin
+from warren.indicators.models import CacheEntry
+from warren.models import DailyCounts
 
 
 @pytest.fixture(scope="session")
@@ -67,3 +70,27 @@ def override_db_test_session(db_session):
     v1.dependency_overrides[get_session] = get_session_override
 
     yield
+
+
+@pytest.fixture
+def cache_frames(db_session):
+    """Factory storing empty cached frames (daily or hourly) of an indicator."""
+
+    def _cache_frames(
+        indicator, since: Arrow, until: Arrow, klass=DailyCounts, **kwargs
+    ):
+        for frame_since, frame_until in Arrow.span_range(indicator.frame, since, until):
+            db_session.add(
+                CacheEntry(
+                    key=indicator.cache_key,
+                    value=indicator.to_cached_value(
+                        klass.from_range(frame_since.datetime, frame_until.datetime)
+                    ),
+                    since=frame_since.datetime,
+                    until=frame_until.datetime,
+                    **kwargs,
+                )
+            )
+        db_session.commit()
+
+    return _cache_frames
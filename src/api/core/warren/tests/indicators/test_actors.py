@@ -0,0 +1,27 @@
+"""Test interned actors uids."""
+
+from sqlmodel import select
+
+from warren.indicators.actors import get_interned_actor_uids, intern_actor_uids
+from warren.indicators.models import ActorUid
+
+
+def test_intern_actor_uids(db_session):
+    """Test actors uids are interned once."""
+    assert intern_actor_uids(db_session, []) == {}
+
+    ids = intern_actor_uids(db_session, ["luke", "han", "luke"])
+    assert set(ids) == {"luke", "han"}
+    assert len(set(ids.values())) == 2
+
+    # Known uids keep their id
+    others = intern_actor_uids(db_session, ["leia", "han"])
+    assert others["han"] == ids["han"]
+    assert others["leia"] not in ids.values()
+    assert len(db_session.exec(select(ActorUid)).all()) == 3
+
+    assert get_interned_actor_uids(db_session, []) == {}
+    assert get_interned_actor_uids(db_session, [ids["luke"], others["leia"], 0]) == {
+        ids["luke"]: "luke",
+        others["leia"]: "leia",
+    }
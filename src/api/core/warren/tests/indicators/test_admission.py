@@ -0,0 +1,227 @@
+"""Test admission control of indicators computations."""
+
+import asyncio
+
+import pytest
+from warren_video.indicators import DailyViews
+
+from warren.conf import settings
+from warren.exceptions import OverCapacityException, QuotaExceededException
+from warren.filters import DatetimeRange
+from warren.indicators import admission as admission_module
+from warren.indicators.admission import (
+    AdmissionController,
+    TenantQuota,
+    admitted,
+    current_tenant,
+)
+from warren.models import DailyCounts
+
+
+@pytest.fixture
+def tenant():
+    """Set the current tenant."""
+    token = current_tenant.set("foo.edu")
+    yield "foo.edu"
+    current_tenant.reset(token)
+
+
+def test_tenant_quota(monkeypatch):
+    """Test tenant quotas are refilled up to their burst size."""
+    now = 100.0
+    monkeypatch.setattr(admission_module.time, "monotonic", lambda: now)
+    quota = TenantQuota(rate=10.0, burst=100.0)
+    assert quota.retry_after() == 0.0
+
+    # Tenants may spend more frames than available
+    quota.charge(150)
+    assert quota.tokens == -50.0
+    assert quota.retry_after() == pytest.approx(5.1)
+
+    now += 2.0
+    assert quota.retry_after() == pytest.approx(3.1)
+    now += 100.0
+    assert quota.retry_after() == 0.0
+    assert quota.tokens == 100.0
+
+
+def test_admission_controller_quotas_eviction(monkeypatch):
+    """Test quotas of idle tenants are evicted once refilled."""
+    now = 100.0
+    monkeypatch.setattr(admission_module.time, "monotonic", lambda: now)
+    monkeypatch.setattr(settings, "ADMISSION_TENANT_RATE", 10.0)
+    monkeypatch.setattr(settings, "ADMISSION_TENANT_BURST", 100.0)
+    controller = AdmissionController()
+
+    controller.get_quota("foo.edu")
+    # Full quotas are evicted
+    controller.get_quota("bar.edu").charge(100)
+    assert list(controller.quotas) == ["bar.edu"]
+    controller.get_quota("foo.edu").charge(50)
+    controller.get_quota("baz.edu")
+    assert list(controller.quotas) == ["bar.edu", "foo.edu", "baz.edu"]
+
+    # Refilled quotas are evicted, least recently used first
+    now += 5.0
+    controller.get_quota("foo.edu")
+    assert list(controller.quotas) == ["bar.edu", "baz.edu", "foo.edu"]
+    assert controller.quotas["bar.edu"].tokens == 50.0
+    now += 5.0
+    controller.get_quota("qux.edu")
+    assert list(controller.quotas) == ["qux.edu"]
+
+
+@pytest.mark.anyio
+async def test_admission_controller_admit(tenant):
+    """Test computations are charged to the tenant quota."""
+    controller = AdmissionController()
+    async with controller.admit(10):
+        assert admitted.get()
+        assert controller.running == 1
+        # Nested computations are charged without waiting for a slot
+        async with controller.admit(5):
+            assert controller.running == 1
+    assert not admitted.get()
+    assert controller.running == 0
+    assert controller.quotas[tenant].tokens == pytest.approx(
+        settings.ADMISSION_TENANT_BURST - 15, abs=1
+    )
+
+
+@pytest.mark.anyio
+async def test_admission_controller_skipped(monkeypatch):
+    """Test computations without tenant, cost or admission control are admitted."""
+    controller = AdmissionController()
+    async with controller.admit(10):
+        assert not admitted.get()
+
+    token = current_tenant.set("foo.edu")
+    async with controller.admit(0):
+        assert not admitted.get()
+    monkeypatch.setattr(settings, "ADMISSION_CONTROL", False)
+    async with controller.admit(10):
+        assert not admitted.get()
+    current_tenant.reset(token)
+    assert controller.quotas == {}
+
+
+@pytest.mark.anyio
+async def test_admission_controller_quota_exceeded(tenant, monkeypatch):
+    """Test tenants exceeding their quota are asked to retry later."""
+    monkeypatch.setattr(settings, "ADMISSION_TENANT_RATE", 1.0)
+    monkeypatch.setattr(settings, "ADMISSION_TENANT_BURST", 10.0)
+    controller = AdmissionController()
+    async with controller.admit(20):
+        pass
+
+    with pytest.raises(QuotaExceededException) as exception:
+        async with controller.admit(1):
+            pass
+    assert exception.value.retry_after == 11
+    assert controller.running == 0
+
+    # Other tenants are not affected
+    current_tenant.set("bar.edu")
+    async with controller.admit(1):
+        pass
+
+
+@pytest.mark.anyio
+async def test_admission_controller_over_capacity(tenant, monkeypatch):
+    """Test computations are queued up to the queue size."""
+    monkeypatch.setattr(settings, "ADMISSION_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(settings, "ADMISSION_MAX_QUEUE", 1)
+    controller = AdmissionController()
+    release = asyncio.Event()
+
+    async def compute():
+        async with controller.admit(1):
+            await release.wait()
+
+    running = asyncio.create_task(compute())
+    queued = asyncio.create_task(compute())
+    await asyncio.sleep(0)
+    assert controller.running == 1
+    assert controller.queued == 1
+
+    with pytest.raises(OverCapacityException) as exception:
+        await compute()
+    assert exception.value.retry_after == settings.ADMISSION_RETRY_AFTER
+
+    release.set()
+    await asyncio.gather(running, queued)
+    assert controller.running == 0
+    assert controller.queued == 0
+
+
+@pytest.mark.anyio
+async def test_admission_controller_fair_share(monkeypatch):
+    """Test queued computations are admitted in a round-robin order of tenants."""
+    monkeypatch.setattr(settings, "ADMISSION_MAX_CONCURRENCY", 1)
+    controller = AdmissionController()
+    release = asyncio.Event()
+    admitted_tenants = []
+
+    async def compute(tenant):
+        current_tenant.set(tenant)
+        async with controller.admit(1):
+            admitted_tenants.append(tenant)
+            await release.wait()
+
+    tasks = []
+    for tenant in ("foo", "foo", "foo", "bar"):
+        tasks.append(asyncio.create_task(compute(tenant)))
+        await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*tasks)
+    assert admitted_tenants == ["foo", "foo", "bar", "foo"]
+
+
+@pytest.mark.anyio
+async def test_admission_controller_cancelled(tenant, monkeypatch):
+    """Test cancelled queued computations leave the queue."""
+    monkeypatch.setattr(settings, "ADMISSION_MAX_CONCURRENCY", 1)
+    controller = AdmissionController()
+    release = asyncio.Event()
+
+    async def compute():
+        async with controller.admit(1):
+            await release.wait()
+
+    running = asyncio.create_task(compute())
+    queued = asyncio.create_task(compute())
+    await asyncio.sleep(0)
+    queued.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await queued
+    assert controller.queued == 0
+
+    release.set()
+    await running
+    assert controller.running == 0
+
+
+@pytest.mark.anyio
+async def test_get_or_compute_admission_cost(tenant, monkeypatch, db_session):
+    """Test the cost of incremental indicators is the number of missing frames."""
+    controller = AdmissionController()
+    monkeypatch.setattr(admission_module, "admission", controller)
+    monkeypatch.setattr("warren.indicators.mixins.admission", controller)
+
+    async def compute(self) -> DailyCounts:
+        return DailyCounts.from_range(self.since, self.until)
+
+    monkeypatch.setattr(DailyViews, "compute", compute)
+    indicator = DailyViews(
+        object_id="uuid://foo",
+        span_range=DatetimeRange(since="2023-01-01", until="2023-01-10"),
+    )
+    assert indicator.get_admission_cost() == 9
+
+    await indicator.get_or_compute()
+    spent = settings.ADMISSION_TENANT_BURST - controller.quotas[tenant].tokens
+    assert spent == pytest.approx(10, abs=1)
+
+    # Cached results are free
+    controller.quotas[tenant].tokens = 0.0
+    await indicator.get_or_compute()
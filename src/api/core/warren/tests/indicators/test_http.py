@@ -0,0 +1,152 @@
+"""Test HTTP conditional caching of indicators results."""
+
+from datetime import datetime, timezone
+
+import pytest
+from arrow import Arrow
+from fastapi import HTTPException, Response
+from freezegun import freeze_time
+from starlette.requests import Request
+from warren_video.indicators import DailyDownloads, DailyViews
+
+from warren.conf import settings
+from warren.filters import DatetimeRange
+from warren.indicators.http import (
+    CacheValidators,
+    check_not_modified,
+    get_cache_validators,
+    set_cache_headers,
+)
+
+OBJECT_ID = "uuid://dd38149d-956a-483d-8975-c1506de1e1a9"
+UPDATED_AT = datetime(2023, 2, 1, tzinfo=timezone.utc)
+
+
+def get_request(headers: dict) -> Request:
+    """Get a request with given headers."""
+    return Request(
+        {
+            "type": "http",
+            "headers": [
+                (name.lower().encode(), value.encode())
+                for name, value in headers.items()
+            ],
+        }
+    )
+
+
+def test_cache_validators():
+    """Test cache validators headers and entity tag matching."""
+    validators = CacheValidators(
+        etag="foo",
+        last_modified=datetime(2023, 1, 1, 10, tzinfo=timezone.utc),
+        max_age=60,
+    )
+    assert validators.headers == {
+        "ETag": '"foo"',
+        "Last-Modified": "Sun, 01 Jan 2023 10:00:00 GMT",
+        "Cache-Control": "private, max-age=60",
+        "Vary": "Authorization",
+    }
+
+    assert validators.match('"foo"')
+    assert validators.match('W/"foo"')
+    assert validators.match('"bar", "foo"')
+    assert validators.match("*")
+    assert not validators.match('"bar"')
+    assert not validators.match("foo")
+
+
+@pytest.mark.anyio
+@freeze_time("2023-03-01")
+async def test_get_cache_validators(cache_frames, monkeypatch):
+    """Test cache validators require all indicators frames to be cached."""
+    span_range = DatetimeRange(since="2023-01-01", until="2023-01-03")
+    views = DailyViews(object_id=OBJECT_ID, span_range=span_range)
+    downloads = DailyDownloads(object_id=OBJECT_ID, span_range=span_range)
+
+    # Empty results (e.g. rankings) have no validators
+    assert await get_cache_validators([]) is None
+    assert await get_cache_validators([views]) is None
+
+    # A frame is missing
+    cache_frames(views, Arrow(2023, 1, 1), Arrow(2023, 1, 2), updated_at=UPDATED_AT)
+    assert await get_cache_validators([views]) is None
+
+    cache_frames(views, Arrow(2023, 1, 3), Arrow(2023, 1, 3), updated_at=UPDATED_AT)
+    validators = await get_cache_validators([views])
+    assert validators.last_modified == datetime(2023, 2, 1, tzinfo=timezone.utc)
+    assert validators.max_age == settings.INDICATORS_CLOSED_MAX_AGE
+    assert validators == await get_cache_validators([views])
+    assert validators.etag != views.get_etag(datetime(2023, 2, 2, tzinfo=timezone.utc))
+
+    # Entity tags depend on the requested span range
+    other = DailyViews(
+        object_id=OBJECT_ID,
+        span_range=DatetimeRange(since="2023-01-01", until="2023-01-02"),
+    )
+    assert (await get_cache_validators([other])).etag != validators.etag
+
+    # All indicators must be cached
+    assert await get_cache_validators([views, downloads]) is None
+    cache_frames(downloads, Arrow(2023, 1, 1), Arrow(2023, 1, 3), updated_at=UPDATED_AT)
+    both = await get_cache_validators([views, downloads])
+    assert both.etag != validators.etag
+
+    # Indicators may override the Cache-Control max-age
+    monkeypatch.setattr(DailyViews, "closed_max_age", 3600)
+    assert (await get_cache_validators([views])).max_age == 3600
+    assert (await get_cache_validators([views, downloads])).max_age == 3600
+
+
+@pytest.mark.anyio
+async def test_get_cache_validators_open_frame(cache_frames, monkeypatch):
+    """Test a short max-age is used when the last frame is not over yet."""
+    today = Arrow.utcnow().floor("day")
+    indicator = DailyViews(
+        object_id=OBJECT_ID,
+        span_range=DatetimeRange(since=today.shift(days=-1), until=today),
+    )
+    cache_frames(indicator, today.shift(days=-1), today, updated_at=UPDATED_AT)
+
+    validators = await get_cache_validators([indicator])
+    assert validators.max_age == settings.INDICATORS_MAX_AGE
+
+    monkeypatch.setattr(DailyViews, "max_age", 10)
+    assert (await get_cache_validators([indicator])).max_age == 10
+
+
+@pytest.mark.anyio
+@freeze_time("2023-03-01")
+async def test_check_not_modified(cache_frames):
+    """Test a 304 error is raised when the client entity tag matches."""
+    indicator = DailyViews(
+        object_id=OBJECT_ID,
+        span_range=DatetimeRange(since="2023-01-01", until="2023-01-01"),
+    )
+
+    # Not cached yet
+    await check_not_modified(get_request({}), [indicator])
+    request = get_request({"If-None-Match": '"foo"'})
+    await check_not_modified(request, [indicator])
+
+    cache_frames(indicator, Arrow(2023, 1, 1), Arrow(2023, 1, 1), updated_at=UPDATED_AT)
+    validators = await get_cache_validators([indicator])
+    await check_not_modified(request, [indicator])
+
+    request = get_request({"If-None-Match": f'"{validators.etag}"'})
+    with pytest.raises(HTTPException) as exception:
+        await check_not_modified(request, [indicator])
+    assert exception.value.status_code == 304
+    assert exception.value.headers["ETag"] == f'"{validators.etag}"'
+    assert exception.value.headers["Cache-Control"] == "private, max-age=86400"
+
+    # Updating cache entries changes the entity tag
+    (cache,) = await indicator.get_caches()
+    await indicator.save(cache)
+    await check_not_modified(request, [indicator])
+
+    response = Response()
+    await set_cache_headers(response, [indicator])
+    assert response.headers["ETag"] != f'"{validators.etag}"'
+    assert response.headers["Last-Modified"] == "Wed, 01 Mar 2023 00:00:00 GMT"
@@ -0,0 +1,265 @@
+"""Test indicators statements ingestion."""
+
+import pytest
+from arrow import Arrow
+from sqlmodel import select, update
+from warren_video.indicators import DailyDownloads, DailyUniqueDownloads, DailyViews
+
+from warren.factories.base import BaseXapiStatementFactory
+from warren.filters import DatetimeRange
+from warren.indicators.ingestion import get_ingestible_indicators, ingest_statements
+from warren.indicators.mixins import BaseDailyEvent
+from warren.indicators.models import CacheEntry
+from warren.models import DailyCount, DailyCounts, DailyUniqueCount, DailyUniqueCounts
+
+OBJECT_ID = "uuid://dd38149d-956a-483d-8975-c1506de1e1a9"
+DOWNLOADED = "http://id.tincanapi.com/verb/downloaded"
+
+
+def build_statement(timestamp, verb_id=DOWNLOADED, object_id=OBJECT_ID, name="john"):
+    """Build a raw xAPI statement."""
+    return BaseXapiStatementFactory.build(
+        mutations=[
+            {
+                "timestamp": timestamp,
+                "verb": {"id": verb_id},
+                "object": {"id": object_id},
+                "actor": {
+                    "objectType": "Agent",
+                    "account": {"name": name, "homePage": "http://fun-mooc.fr"},
+                },
+            }
+        ]
+    ).dict()
+
+
+def test_get_ingestible_indicators():
+    """Test registered daily event indicators are ingestible."""
+    indicators = get_ingestible_indicators()
+
+    assert DailyViews in indicators
+    assert DailyDownloads in indicators
+    assert len(indicators) == len(set(indicators))
+    assert all(issubclass(klass, BaseDailyEvent) for klass in indicators)
+
+
+@pytest.mark.anyio
+async def test_daily_event_ingest(cache_frames):
+    """Test cached frames update from pushed statements for a daily event."""
+    span_range = DatetimeRange(since="2023-01-01", until="2023-01-03")
+    indicator = DailyDownloads(object_id=OBJECT_ID, span_range=span_range)
+    cache_frames(indicator, Arrow(2023, 1, 1), Arrow(2023, 1, 3))
+
+    updated = await indicator.ingest(
+        [
+            build_statement("2023-01-01T10:00:00+00:00"),
+            build_statement("2023-01-01T12:00:00+00:00"),
+            build_statement("2023-01-02T12:00:00+00:00"),
+            # Not cached yet
+            build_statement("2023-01-04T12:00:00+00:00"),
+            # Other verb
+            build_statement("2023-01-01T12:00:00+00:00", verb_id="http://foo.com"),
+            # Other activity
+            build_statement("2023-01-01T12:00:00+00:00", object_id="uuid://foo"),
+        ]
+    )
+    assert len(updated) == 2
+
+    assert await indicator.get_or_compute() == DailyCounts(
+        total=3,
+        counts=[
+            DailyCount(date="2023-01-01", count=2),
+            DailyCount(date="2023-01-02", count=1),
+            DailyCount(date="2023-01-03", count=0),
+        ],
+    )
+
+    # Incremental updates
+    await indicator.ingest([build_statement("2023-01-02T14:00:00+00:00")])
+    assert (await indicator.get_or_compute()).total == 4
+
+    # Nothing to ingest
+    assert await indicator.ingest([]) == []
+
+
+@pytest.mark.anyio
+async def test_daily_event_ingest_stale_frames(db_session, cache_frames):
+    """Test cached frames are read again before being merged with statements."""
+    span_range = DatetimeRange(since="2023-01-01", until="2023-01-01")
+    indicator = DailyDownloads(object_id=OBJECT_ID, span_range=span_range)
+    cache_frames(indicator, Arrow(2023, 1, 1), Arrow(2023, 1, 1))
+    (cache,) = await indicator.get_caches()
+
+    # The frame is updated by another process
+    value = DailyCounts(total=1, counts=[DailyCount(date="2023-01-01", count=1)])
+    db_session.connection().execute(
+        update(CacheEntry).where(CacheEntry.id == cache.id).values(value=value.json())
+    )
+
+    await indicator.ingest([build_statement("2023-01-01T10:00:00+00:00")])
+    assert (await indicator.get_or_compute()).total == 2
+
+
+@pytest.mark.anyio
+async def test_daily_event_ingest_timezone(cache_frames):
+    """Test cached frames timezone is preserved when ingesting statements."""
+    span_range = DatetimeRange(
+        since="2023-01-01T00:00:00+02:00", until="2023-01-01T12:00:00+02:00"
+    )
+    indicator = DailyDownloads(object_id=OBJECT_ID, span_range=span_range)
+    day = Arrow(2023, 1, 1, tzinfo="+02:00")
+    cache_frames(indicator, day, day)
+
+    # 2023-01-01T01:30:00+02:00
+    await indicator.ingest([build_statement("2022-12-31T23:30:00+00:00")])
+
+    assert await indicator.get_or_compute() == DailyCounts(
+        total=1, counts=[DailyCount(date="2023-01-01", count=1)]
+    )
+
+
+@pytest.mark.anyio
+async def test_daily_unique_event_ingest(cache_frames):
+    """Test cached frames update from pushed statements for a daily unique event."""
+    span_range = DatetimeRange(since="2023-01-01", until="2023-01-02")
+    indicator = DailyUniqueDownloads(object_id=OBJECT_ID, span_range=span_range)
+    cache_frames(indicator, Arrow(2023, 1, 1), Arrow(2023, 1, 2), DailyUniqueCounts)
+
+    await indicator.ingest(
+        [
+            build_statement("2023-01-01T10:00:00+00:00", name="john"),
+            build_statement("2023-01-01T12:00:00+00:00", name="john"),
+            build_statement("2023-01-02T12:00:00+00:00", name="jane"),
+        ]
+    )
+    await indicator.ingest(
+        [
+            build_statement("2023-01-01T14:00:00+00:00", name="jane"),
+            build_statement("2023-01-02T14:00:00+00:00", name="john"),
+        ]
+    )
+
+    results = await indicator.get_or_compute()
+    assert results.total == 2
+    assert [count.count for count in results.counts] == [2, 0]
+    assert isinstance(results.counts[0], DailyUniqueCount)
+
+    # Cached frames store interned users ids
+    users = [cache.value["users"] for cache in await indicator.get_caches()]
+    assert [[len(day) for day in frame] for frame in users] == [[2], [2]]
+    assert all(isinstance(user, int) for frame in users for user in frame[0])
+
+
+@pytest.mark.anyio
+async def test_ingest_statements(db_session, cache_frames, monkeypatch):
+    """Test statements ingestion for all registered indicators."""
+    span_range = DatetimeRange(since="2023-01-01", until="2023-01-01")
+    downloads = DailyDownloads(object_id=OBJECT_ID, span_range=span_range)
+    unique_downloads = DailyUniqueDownloads(object_id=OBJECT_ID, span_range=span_range)
+    cache_frames(downloads, Arrow(2023, 1, 1), Arrow(2023, 1, 1))
+    cache_frames(
+        unique_downloads, Arrow(2023, 1, 1), Arrow(2023, 1, 1), DailyUniqueCounts
+    )
+
+    assert await ingest_statements([]) == 0
+    assert (
+        await ingest_statements(
+            [
+                build_statement("2023-01-01T10:00:00+00:00"),
+                build_statement("2023-01-01T12:00:00+02:00"),
+            ]
+        )
+        == 2
+    )
+    assert (await downloads.get_or_compute()).total == 2
+    assert (await unique_downloads.get_or_compute()).total == 1
+
+    # Failing indicators do not prevent others from being updated, and only
+    # their own frames are rolled back
+    merge_statements = DailyUniqueDownloads.merge_statements
+
+    async def failing_merge_statements(self, statements):
+        await merge_statements(self, statements)
+        raise KeyError("foo")
+
+    monkeypatch.setattr(
+        DailyUniqueDownloads, "merge_statements", failing_merge_statements
+    )
+    statement = build_statement("2023-01-01T13:00:00+00:00", name="jane")
+    assert await ingest_statements([statement]) == 1
+    assert (await downloads.get_or_compute()).total == 3
+    assert (await unique_downloads.get_or_compute()).total == 1
+
+    caches = db_session.exec(select(CacheEntry)).all()
+    assert len(caches) == 2
+
+
+@pytest.mark.anyio
+async def test_ingest_statements_invalid_timestamps(cache_frames):
+    """Test statements without a valid timestamp are skipped."""
+    span_range = DatetimeRange(since="2023-01-01", until="2023-01-01")
+    downloads = DailyDownloads(object_id=OBJECT_ID, span_range=span_range)
+    cache_frames(downloads, Arrow(2023, 1, 1), Arrow(2023, 1, 1))
+
+    invalid = [build_statement("2023-01-01T10:00:00+00:00") for _ in range(3)]
+    invalid[0]["timestamp"] = "foo"
+    invalid[1]["timestamp"] = 1672567200
+    del invalid[2]["timestamp"]
+    assert await ingest_statements(invalid) == 0
+
+    statements = [*invalid, build_statement("2023-01-01T10:00:00+00:00")]
+    assert await ingest_statements(statements) == 1
+    assert (await downloads.get_or_compute()).total == 1
+
+
+@pytest.mark.anyio
+async def test_ingest_statements_hourly_frames(cache_frames):
+    """Test statements ingestion updates both daily and hourly frames."""
+    daily = DailyDownloads(
+        object_id=OBJECT_ID,
+        span_range=DatetimeRange(since="2023-01-01", until="2023-01-01"),
+    )
+    hourly = DailyDownloads(
+        object_id=OBJECT_ID,
+        span_range=DatetimeRange(
+            since="2023-01-01T10:00:00+00:00", until="2023-01-01T11:59:59+00:00"
+        ),
+        granularity="hour",
+    )
+    cache_frames(daily, Arrow(2023, 1, 1), Arrow(2023, 1, 1))
+    cache_frames(hourly, Arrow(2023, 1, 1, 10), Arrow(2023, 1, 1, 11))
+
+    statements = [
+        build_statement("2023-01-01T10:30:00+00:00"),
+        build_statement("2023-01-01T11:30:00+00:00"),
+        build_statement("2023-01-01T11:45:00+00:00"),
+    ]
+    assert await ingest_statements(statements) == 3
+
+    assert (await daily.get_or_compute()).total == 3
+    assert [count.count for count in (await hourly.get_or_compute()).counts] == [
+        1,
+        2,
+    ]
+
+
+@pytest.mark.anyio
+async def test_ingest_statements_constructor_error(cache_frames, monkeypatch):
+    """Test indicators that cannot be instantiated do not abort ingestion."""
+
+    class DailyFooDownloads(DailyDownloads):
+        """Indicator requiring another constructor argument."""
+
+        def __init__(self, object_id, span_range, foo):
+            super().__init__(object_id=object_id, span_range=span_range)
+
+    monkeypatch.setattr(
+        "warren.indicators.ingestion.get_ingestible_indicators",
+        lambda: [DailyFooDownloads, DailyDownloads],
+    )
+    span_range = DatetimeRange(since="2023-01-01", until="2023-01-01")
+    downloads = DailyDownloads(object_id=OBJECT_ID, span_range=span_range)
+    cache_frames(downloads, Arrow(2023, 1, 1), Arrow(2023, 1, 1))
+
+    assert await ingest_statements([build_statement("2023-01-01T10:00:00+00:00")]) == 1
+    assert (await downloads.get_or_compute()).total == 1
@@ -0,0 +1,320 @@
+"""Test asynchronous indicators jobs."""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+from sqlmodel import Session, delete, select
+from warren_video.indicators import DailyUniqueViews, DailyViews
+
+from warren.conf import settings
+from warren.db import get_session
+from warren.exceptions import JobException
+from warren.filters import DatetimeRange
+from warren.indicators import jobs
+from warren.indicators.jobs import (
+    JobWorkerPool,
+    claim_job,
+    dump_indicator,
+    get_worker_session,
+    load_indicator,
+    run_job,
+    submit_job,
+)
+from warren.indicators.mixins import CacheMixin
+from warren.indicators.models import Job, JobStatus
+from warren.models import DailyCounts, DailyUniqueCounts
+from warren.utils import forge_lti_token, get_lti_token
+
+OBJECT_ID = "uuid://dd38149d-956a-483d-8975-c1506de1e1a9"
+TOKEN = get_lti_token(forge_lti_token())
+
+
+def worker_session(db_session):
+    """Get a worker session bound to the test transaction."""
+    return Session(bind=db_session.connection())
+
+
+def get_indicator(klass=DailyViews, until="2023-01-03"):
+    """Get an indicator computed over a few days."""
+    return klass(
+        object_id=OBJECT_ID,
+        span_range=DatetimeRange(since="2023-01-01", until=until),
+    )
+
+
+def test_dump_and_load_indicator():
+    """Test indicators are rebuilt from their class path and arguments."""
+    indicator = get_indicator()
+    arguments = dump_indicator(indicator)
+    assert arguments == {
+        "object_id": OBJECT_ID,
+        "span_range": {
+            "since": "2023-01-01T00:00:00+00:00",
+            "until": "2023-01-03T00:00:00+00:00",
+        },
+        "granularity": "day",
+    }
+
+    other = load_indicator("warren_video.indicators:DailyViews", arguments)
+    assert isinstance(other, DailyViews)
+    assert other.cache_key == indicator.cache_key
+    assert other.span_range == indicator.span_range
+
+    with pytest.raises(JobException, match="is not a cached indicator"):
+        load_indicator("warren.filters:DatetimeRange", arguments)
+    with pytest.raises(JobException, match="is not a cached indicator"):
+        load_indicator("warren_video.indicators:Foo", arguments)
+
+
+@pytest.mark.anyio
+async def test_submit_job(db_session):
+    """Test identical pending jobs are deduplicated."""
+    job = await submit_job(get_indicator(), TOKEN)
+    assert job.status == JobStatus.PENDING
+    assert job.indicator == "warren_video.indicators:DailyViews"
+    assert job.progress == 0
+    assert job.consumer_site == TOKEN.consumer_site
+    assert job.course_id == TOKEN.course_id
+
+    assert (await submit_job(get_indicator(), TOKEN)).id == job.id
+    assert (await submit_job(get_indicator(DailyUniqueViews), TOKEN)).id != job.id
+    assert (await submit_job(get_indicator(until="2023-01-04"), TOKEN)).id != job.id
+
+    # Jobs are not shared between LTI consumer sites or courses
+    other = get_lti_token(forge_lti_token(consumer_site="http://other-lms.com"))
+    assert (await submit_job(get_indicator(), other)).id != job.id
+    other = get_lti_token(forge_lti_token(course_id="course-v1:foo+bar+baz"))
+    assert (await submit_job(get_indicator(), other)).id != job.id
+
+    # Running jobs are deduplicated as well
+    assert claim_job(db_session).id == job.id
+    assert (await submit_job(get_indicator(), TOKEN)).id == job.id
+
+    # Once done, a new job is submitted
+    job.status = JobStatus.DONE
+    db_session.commit()
+    assert (await submit_job(get_indicator(), TOKEN)).id != job.id
+
+
+@pytest.mark.anyio
+async def test_submit_job_concurrently(db_engine, monkeypatch):
+    """Test identical jobs submitted concurrently are deduplicated."""
+    # Use a session committing to the database as the unique index violation
+    # rolls back the whole test transaction otherwise
+    session = Session(db_engine)
+    monkeypatch.setattr(CacheMixin, "db_session", session)
+    try:
+        job = await submit_job(get_indicator(), TOKEN)
+
+        # The identical job is submitted right after this one has been looked up
+        lookups = []
+        get_active_job = jobs.get_active_job
+
+        def get_active_job_late(*args):
+            lookups.append(args)
+            return None if len(lookups) == 1 else get_active_job(*args)
+
+        monkeypatch.setattr(jobs, "get_active_job", get_active_job_late)
+        assert (await submit_job(get_indicator(), TOKEN)).id == job.id
+        assert len(lookups) == 2
+        assert len(session.exec(select(Job)).all()) == 1
+    finally:
+        session.rollback()
+        session.exec(delete(Job))
+        session.commit()
+        session.close()
+
+
+@pytest.mark.anyio
+async def test_claim_job(db_session):
+    """Test pending jobs are claimed in submission order."""
+    assert claim_job(db_session) is None
+
+    first = await submit_job(get_indicator(), TOKEN)
+    second = await submit_job(get_indicator(DailyUniqueViews), TOKEN)
+
+    assert claim_job(db_session).id == first.id
+    assert first.status == JobStatus.RUNNING
+    assert claim_job(db_session).id == second.id
+    assert claim_job(db_session) is None
+
+
+@pytest.mark.anyio
+async def test_claim_job_expired_lease(db_session, monkeypatch):
+    """Test running jobs whose lease has expired are claimed again."""
+    monkeypatch.setattr(settings, "JOBS_LEASE_DURATION", 60)
+    job = await submit_job(get_indicator(), TOKEN)
+    assert claim_job(db_session).id == job.id
+    assert job.heartbeat_at is not None
+
+    # The lease is still valid
+    job.heartbeat_at = datetime.now(timezone.utc) - timedelta(seconds=30)
+    db_session.commit()
+    assert claim_job(db_session) is None
+
+    # The worker running the job has been killed
+    expired = datetime.now(timezone.utc) - timedelta(seconds=90)
+    job.heartbeat_at = expired
+    db_session.commit()
+    assert claim_job(db_session).id == job.id
+    assert job.status == JobStatus.RUNNING
+    assert job.heartbeat_at > expired
+    assert claim_job(db_session) is None
+
+
+@pytest.mark.anyio
+async def test_run_job_heartbeat(db_session, monkeypatch):
+    """Test the lease of running jobs is renewed."""
+    monkeypatch.setattr(settings, "JOBS_HEARTBEAT_INTERVAL", 0.01)
+    heartbeats = set()
+
+    async def compute(self) -> DailyCounts:
+        for _ in range(5):
+            heartbeats.add(job.heartbeat_at)
+            await asyncio.sleep(0.02)
+        return DailyCounts(total=0, counts=[])
+
+    monkeypatch.setattr(DailyViews, "compute", compute)
+    job = await submit_job(get_indicator(until="2023-01-01"), TOKEN)
+    await run_job(db_session, claim_job(db_session))
+
+    assert job.status == JobStatus.DONE
+    assert len(heartbeats) > 1
+
+
+@pytest.mark.anyio
+async def test_run_job(db_session, monkeypatch):
+    """Test running a job stores its result and reports its progress."""
+    progress = []
+
+    async def compute(self) -> DailyCounts:
+        progress.append(job.progress)
+        return DailyCounts.from_range(self.since, self.until)
+
+    monkeypatch.setattr(DailyViews, "compute", compute)
+    job = await submit_job(get_indicator(), TOKEN)
+    await run_job(db_session, claim_job(db_session))
+
+    db_session.refresh(job)
+    assert job.status == JobStatus.DONE
+    assert job.progress == 100.0
+    assert job.error is None
+    assert job.result == {
+        "total": 0,
+        "counts": [
+            {"date": "2023-01-01", "count": 0},
+            {"date": "2023-01-02", "count": 0},
+            {"date": "2023-01-03", "count": 0},
+        ],
+    }
+    assert progress == [0.0, 33.3, 66.7]
+
+    # Computed frames are cached: the progress of a new job reflects it
+    job = await submit_job(get_indicator(until="2023-01-06"), TOKEN)
+    await run_job(db_session, claim_job(db_session))
+    assert progress[3:] == [50.0, 66.7, 83.3]
+
+
+@pytest.mark.anyio
+async def test_run_job_unique_results(db_session, monkeypatch):
+    """Test daily unique counts are stored as daily counts."""
+
+    async def compute(self) -> DailyUniqueCounts:
+        return DailyUniqueCounts.from_range(self.since, self.until)
+
+    monkeypatch.setattr(DailyUniqueViews, "compute", compute)
+    job = await submit_job(get_indicator(DailyUniqueViews, until="2023-01-01"), TOKEN)
+    await run_job(db_session, claim_job(db_session))
+
+    assert job.status == JobStatus.DONE
+    assert job.result == {
+        "total": 0,
+        "counts": [{"date": "2023-01-01", "count": 0}],
+    }
+
+
+@pytest.mark.anyio
+async def test_run_job_failure(db_session, monkeypatch):
+    """Test failing jobs are marked as failed."""
+    monkeypatch.setattr(
+        DailyViews, "compute", AsyncMock(side_effect=KeyError("timestamp"))
+    )
+    job = await submit_job(get_indicator(), TOKEN)
+    await run_job(db_session, claim_job(db_session))
+
+    assert job.status == JobStatus.FAILED
+    assert job.error == "'timestamp'"
+    assert job.result is None
+
+    job = Job(
+        key="foo",
+        indicator="warren_video.indicators:Foo",
+        arguments={},
+        consumer_site=TOKEN.consumer_site,
+        course_id=TOKEN.course_id,
+    )
+    await run_job(db_session, job)
+    assert job.status == JobStatus.FAILED
+    assert job.error == "warren_video.indicators:Foo is not a cached indicator"
+
+
+def test_get_worker_session():
+    """Test workers do not share the database session singleton."""
+    session = get_worker_session()
+    assert session is not get_session()
+    assert session is not get_worker_session()
+
+
+@pytest.mark.anyio
+async def test_job_worker_pool(db_session, monkeypatch):
+    """Test the worker pool runs submitted jobs."""
+    monkeypatch.setattr(jobs, "get_worker_session", lambda: worker_session(db_session))
+    monkeypatch.setattr(settings, "JOBS_POLL_INTERVAL", 0.01)
+
+    async def compute(self) -> DailyCounts:
+        return DailyCounts(total=0, counts=[])
+
+    monkeypatch.setattr(DailyViews, "compute", compute)
+    pool = JobWorkerPool()
+    monkeypatch.setattr(jobs, "workers", pool)
+
+    # Stopped pools are not notified
+    pool.notify()
+    pool.start(size=2)
+    job = await submit_job(get_indicator(until="2023-01-01"), TOKEN)
+    for _ in range(100):
+        db_session.refresh(job)
+        if job.status == JobStatus.DONE:
+            break
+        await asyncio.sleep(0.01)
+    await pool.stop()
+
+    assert job.status == JobStatus.DONE
+    assert job.result == {"total": 0, "counts": []}
+
+
+@pytest.mark.anyio
+async def test_job_worker_pool_stop(db_session, monkeypatch):
+    """Test jobs cancelled when stopping the pool are pending again."""
+    monkeypatch.setattr(jobs, "get_worker_session", lambda: worker_session(db_session))
+    started = asyncio.Event()
+
+    async def compute(self) -> DailyCounts:
+        started.set()
+        await asyncio.sleep(60)
+
+    monkeypatch.setattr(DailyViews, "compute", compute)
+    pool = JobWorkerPool()
+    monkeypatch.setattr(jobs, "workers", pool)
+
+    pool.start(size=1)
+    job = await submit_job(get_indicator(until="2023-01-01"), TOKEN)
+    await asyncio.wait_for(started.wait(), 1)
+    db_session.refresh(job)
+    assert job.status == JobStatus.RUNNING
+    await pool.stop()
+
+    db_session.refresh(job)
+    assert job.status == JobStatus.PENDING
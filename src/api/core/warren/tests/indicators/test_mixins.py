@@ -1,30 +1,40 @@
 """Test indicators mixins."""
 
 import hashlib
+import json
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from functools import cached_property
 from itertools import chain
-from typing import Union
+from typing import List, Union
 from unittest.mock import AsyncMock
 
-import pandas as pd
 import pytest
 from arrow import Arrow
-from dateutil.tz import tzoffset
 from freezegun import freeze_time
 from pydantic import BaseModel
 from ralph.backends.lrs.base import LRSStatementsQuery
 from sqlalchemy import func
 from sqlalchemy.exc import MultipleResultsFound
 from sqlmodel import select
-from warren_video.indicators import BaseDailyEvent, DailyEvent
+from warren_video.indicators import (
+    DailyEvent,
+    DailyUniqueViews,
+    DailyViews,
+)
 
-from warren.factories.base import BaseXapiStatementFactory
 from warren.filters import DatetimeRange
 from warren.indicators.base import BaseIndicator
 from warren.indicators.mixins import CacheMixin, IncrementalCacheMixin
 from warren.indicators.models import CacheEntry
-from warren.xapi import StatementsTransformer
+from warren.models import (
+    DailyCount,
+    DailyCounts,
+    DailyUniqueCount,
+    DailyUniqueCounts,
+    HourlyCount,
+    HourlyCounts,
+)
 
 
 def test_cache_key_calculation():
@@ -101,6 +111,41 @@ async def test_save_with_single_cache_instance(db_session):
     assert saved.since is None
     assert saved.until is None
     assert saved.created_at == datetime(2023, 10, 14, tzinfo=timezone.utc)
+    assert saved.updated_at == datetime(2023, 10, 14, tzinfo=timezone.utc)
+
+
+@pytest.mark.anyio
+async def test_save_updated_cache_instance(db_session):
+    """Test saving updated cached results keeps their creation date/time."""
+
+    class MyIndicator(BaseIndicator, CacheMixin):
+        """Dummy indicator."""
+
+        def get_lrs_query(self) -> LRSStatementsQuery:
+            pass
+
+        async def fetch_statements(self):
+            pass
+
+        async def compute(self):
+            pass
+
+    indicator = MyIndicator()
+    with freeze_time("2023-10-14"):
+        cache = CacheEntry(key=indicator.cache_key, value={"lol": [1, 2, 3]})
+        await indicator.save(cache)
+
+    cache.value = {"lol": [1, 2, 3, 4]}
+    with freeze_time("2023-10-15"):
+        await indicator.save(cache)
+
+    saved = db_session.exec(
+        select(CacheEntry).where(CacheEntry.key == indicator.cache_key)
+    ).one()
+    assert saved.value == {"lol": [1, 2, 3, 4]}
+    assert saved.created_at == datetime(2023, 10, 14, tzinfo=timezone.utc)
+    assert saved.updated_at == datetime(2023, 10, 15, tzinfo=timezone.utc)
+    assert await indicator.get_last_modified() == saved.updated_at
 
 
 @pytest.mark.anyio
@@ -479,6 +524,54 @@ async def test_get_or_compute_for_complex_models(db_session):
     )
 
 
+@pytest.mark.anyio
+async def test_get_or_compute_json(db_session):
+    """Test getting cached results as JSON documents without deserializing them."""
+
+    @dataclass
+    class Views:
+        iri: str
+        counts: DailyCounts
+
+    class MyIndicator(BaseIndicator, CacheMixin):
+        """Dummy indicator."""
+
+        def get_lrs_query(self) -> LRSStatementsQuery:
+            pass
+
+        async def fetch_statements(self):
+            pass
+
+        compute = AsyncMock(
+            return_value=[Views(iri="uuid://foo", counts=DailyCounts(total=1))]
+        )
+
+        @cached_property
+        def _compute_annotation(self):
+            return List[Views]
+
+    indicator = MyIndicator()
+    assert await indicator.get_cached_json() is None
+
+    # Results are computed and cached on cache miss
+    expected = [{"iri": "uuid://foo", "counts": {"total": 1, "counts": []}}]
+    assert json.loads(await indicator.get_or_compute_json()) == expected
+    indicator.compute.assert_called_once()
+    assert json.loads(await indicator.get_cached_json()) == expected
+
+    # The cached document is returned as is on cache hit
+    cache = await indicator.get_cache()
+    cache.value = [{"raw": True}]
+    await indicator.save(cache)
+    assert await indicator.get_or_compute_json() == '[{"raw": true}]'
+    indicator.compute.assert_called_once()
+    assert await indicator.get_or_compute() == [{"raw": True}]
+
+    # Force the update
+    assert json.loads(await indicator.get_or_compute_json(update=True)) == expected
+    assert indicator.compute.call_count == 2
+
+
 @pytest.mark.anyio
 async def test_incremental_get_cache(db_session):
     """Test getting cache(s) for the incremental mixin."""
@@ -1041,6 +1134,88 @@ async def test_incremental_get_or_compute(db_session):
     assert len(caches) == 31
 
 
+@pytest.mark.anyio
+async def test_incremental_get_or_compute_many(db_session):
+    """Test get or compute results of multiple incremental indicators at once."""
+
+    class MyDailyIndicator(BaseIndicator, IncrementalCacheMixin):
+        """Dummy indicator."""
+
+        frame = "day"
+
+        def __init__(self, name: str, span_range: DatetimeRange):
+            super().__init__(name=name, span_range=span_range)
+
+        def get_lrs_query(self) -> LRSStatementsQuery:
+            return LRSStatementsQuery(since=self.since, until=self.until)
+
+        async def fetch_statements(self):
+            pass
+
+        async def compute(self) -> dict:
+            computed.append((self.name, self.since.day))
+            return {"name": self.name, "day": self.since.day}
+
+        @staticmethod
+        def merge(a: Union[dict, list], b: dict) -> list:
+            if isinstance(a, dict):
+                a = [a]
+            return a + [b]
+
+    computed = []
+    foo, bar = (
+        MyDailyIndicator(
+            name=name,
+            span_range=DatetimeRange(since=datetime(2023, 1, 1), until=until),
+        )
+        for name, until in (
+            ("foo", datetime(2023, 1, 3)),
+            ("bar", datetime(2023, 1, 2)),
+        )
+    )
+    assert await IncrementalCacheMixin.get_or_compute_many([]) == []
+
+    # Cache the first frame of the foo indicator
+    since, until = next(Arrow.span_range("day", Arrow(2023, 1, 1), Arrow(2023, 1, 1)))
+    db_session.add(
+        CacheEntry(
+            key=foo.cache_key,
+            value={"name": "cached", "day": 1},
+            since=since.datetime,
+            until=until.datetime,
+        )
+    )
+    db_session.commit()
+
+    foo_results, bar_results = await IncrementalCacheMixin.get_or_compute_many(
+        [foo, bar]
+    )
+
+    assert foo_results == [
+        {"name": "cached", "day": 1},
+        {"name": "foo", "day": 2},
+        {"name": "foo", "day": 3},
+    ]
+    assert bar_results == [{"name": "bar", "day": 1}, {"name": "bar", "day": 2}]
+    assert sorted(computed) == [("bar", 1), ("bar", 2), ("foo", 2), ("foo", 3)]
+    assert (
+        db_session.exec(
+            select(func.count()).where(
+                CacheEntry.key.in_([foo.cache_key, bar.cache_key])
+            )
+        ).one()
+        == 5
+    )
+
+    # Cached results are not computed again
+    computed.clear()
+    assert await IncrementalCacheMixin.get_or_compute_many([bar, foo]) == [
+        bar_results,
+        foo_results,
+    ]
+    assert computed == []
+
+
 @pytest.mark.anyio
 async def test_incremental_get_or_compute_update(db_session):
     """Test incremental cache update."""
@@ -1226,77 +1401,139 @@ def test_base_daily_event_subclass_verb_id():
     assert str(exception.value) == "Indicators must declare a 'verb_id' class attribute"
 
 
-def test_base_daily_event_span_range_timezone():
-    """Test 'to_span_range_timezone' for the BaseDailyEvent class."""
-    # Create source statements
-    raw_statements = [
-        BaseXapiStatementFactory.build(
-            mutations=[{"timestamp": "2023-01-01T00:10:00.000000+00:00"}]
-        ).dict(),
-        BaseXapiStatementFactory.build(
-            mutations=[{"timestamp": "2023-01-03T00:10:00.000000+00:00"}]
-        ).dict(),
-    ]
-    source_statements = StatementsTransformer.preprocess(raw_statements)
+def test_base_daily_event_granularity():
+    """Test daily event indicators granularity cache keys and entity tags."""
+    span_range = DatetimeRange(since="2023-01-01", until="2023-01-31")
 
-    class MyIndicator(BaseDailyEvent):
-        def merge(self):
-            pass
+    def get_indicator(granularity):
+        return DailyViews(
+            object_id="Test", span_range=span_range, granularity=granularity
+        )
 
-        def compute(self):
-            pass
+    daily = DailyViews(object_id="Test", span_range=span_range)
+    assert daily.granularity == "day"
+    assert daily.frame == "day"
+
+    # Weekly and monthly results share daily frames
+    for granularity in ("day", "week", "month"):
+        assert get_indicator(granularity).cache_key == daily.cache_key
+        assert get_indicator(granularity).frame == "day"
+
+    hourly = get_indicator("hour")
+    assert hourly.frame == "hour"
+    assert hourly.cache_key != daily.cache_key
+    other = hourly._replace(span_range=DatetimeRange(since="2023-01-01 10:00"))
+    assert other.frame == "hour"
+    assert other.cache_key == hourly.cache_key
+
+    # Entity tags depend on the granularity
+    last_modified = datetime(2023, 2, 1, tzinfo=timezone.utc)
+    etags = {
+        get_indicator(granularity).get_etag(last_modified)
+        for granularity in ("hour", "day", "week", "month")
+    }
+    assert len(etags) == 4
 
-    # Create an indicator with a DateTimeRange in UTC
-    indicator_utc = MyIndicator(
-        span_range=DatetimeRange(since="2023-01-01", until="2023-01-03"),
-        object_id="Test",
+
+@pytest.mark.anyio
+async def test_daily_event_granularity(db_session, monkeypatch):
+    """Test daily event indicators results in time buckets."""
+
+    async def compute(self) -> DailyCounts:
+        # A single event per hour
+        hours = int((self.until - self.since).total_seconds() // 3600) + 1
+        return DailyCounts(
+            total=hours,
+            counts=[DailyCount(date=self.since.date(), count=hours)],
+        )
+
+    monkeypatch.setattr(DailyViews, "compute", compute)
+
+    def get_indicator(granularity, **span_range):
+        return DailyViews(
+            object_id="Test",
+            span_range=DatetimeRange(**span_range),
+            granularity=granularity,
+        )
+
+    weekly = get_indicator("week", since="2023-01-01", until="2023-01-09")
+    assert await weekly.get_or_compute() == DailyCounts(
+        total=216,
+        counts=[
+            DailyCount(date="2022-12-26", count=24),
+            DailyCount(date="2023-01-02", count=168),
+            DailyCount(date="2023-01-09", count=24),
+        ],
     )
-    # Convert statements' timestamp
-    statements = indicator_utc.to_span_range_timezone(source_statements)
-
-    expected_statements = pd.to_datetime(
-        pd.Series(
-            [
-                "2023-01-01T00:10:00+00:00",
-                "2023-01-03T00:10:00+00:00",
-            ],
-            name="timestamp",
+    # Daily frames have been cached
+    assert (
+        len(
+            await get_indicator(
+                "day", since="2023-01-01", until="2023-01-09"
+            ).get_caches()
         )
+        == 9
     )
 
-    # Statements' timestamp should be in UTC.
-    assert statements["timestamp"].equals(expected_statements)
-
-    # Create an indicator with a DateTimeRange in UTC+02:00
-    indicator_with_timezone = MyIndicator(
-        span_range=DatetimeRange(
-            since="2023-01-01T00:00:00+02:00", until="2023-01-03T00:00:00+02:00"
-        ),
-        object_id="Test",
+    monthly = get_indicator("month", since="2023-01-31", until="2023-02-01")
+    assert await monthly.get_or_compute() == DailyCounts(
+        total=48,
+        counts=[
+            DailyCount(date="2023-01-01", count=24),
+            DailyCount(date="2023-02-01", count=24),
+        ],
     )
-    # Convert statements' timestamp
-    statements = indicator_with_timezone.to_span_range_timezone(source_statements)
 
-    # Statements' timestamp should be in UTC+02:00
-    assert statements["timestamp"].equals(
-        expected_statements.dt.tz_convert(tzoffset(None, 7200))
+    hourly = get_indicator(
+        "hour", since="2023-01-01T10:00:00", until="2023-01-01T12:30:00"
     )
+    assert await hourly.get_or_compute() == HourlyCounts(
+        total=3,
+        counts=[
+            HourlyCount(date="2023-01-01T10:00:00+00:00", count=1),
+            HourlyCount(date="2023-01-01T11:00:00+00:00", count=1),
+            HourlyCount(date="2023-01-01T12:00:00+00:00", count=1),
+        ],
+    )
+    assert len(await hourly.get_caches()) == 3
 
 
-def test_base_daily_event_add_date_column():
-    """Test 'add_date_column' for the BaseDailyEvent class."""
-    raw_statements = [
-        BaseXapiStatementFactory.build(
-            mutations=[{"timestamp": "2023-01-01T00:10:00.000000+00:00"}]
-        ).dict(),
-        BaseXapiStatementFactory.build(
-            mutations=[{"timestamp": "2023-01-03T00:10:00.000000+00:00"}]
-        ).dict(),
+def test_daily_unique_event_merge_hours(db_session):
+    """Test users are counted on the first hour they occur."""
+    indicator = DailyUniqueViews(
+        object_id="Test",
+        span_range=DatetimeRange(
+            since="2023-01-01T10:00:00", until="2023-01-01T12:00:00"
+        ),
+        granularity="hour",
+    )
+    # Cached values of hourly frames
+    values = [
+        indicator.from_cached_value(
+            indicator.to_cached_value(
+                DailyUniqueCounts(
+                    total=len(users),
+                    counts=[
+                        DailyUniqueCount(
+                            date="2023-01-01", count=len(users), users=users
+                        )
+                    ],
+                )
+            )
+        )
+        for users in ({"foo", "bar"}, {"bar"}, {"bar", "baz"})
     ]
-    source_statements = StatementsTransformer.preprocess(raw_statements)
-    statements = BaseDailyEvent.extract_date_from_timestamp(source_statements)
+    assert indicator.aggregate(values) == HourlyCounts(
+        total=3,
+        counts=[
+            HourlyCount(date="2023-01-01T10:00:00+00:00", count=2),
+            HourlyCount(date="2023-01-01T11:00:00+00:00", count=0),
+            HourlyCount(date="2023-01-01T12:00:00+00:00", count=1),
+        ],
+    )
 
-    assert statements["date"].equals(
-        pd.to_datetime(pd.Series(["2023-01-01", "2023-01-03"], name="date")).dt.date
+    # Unique counts are summed per week or month
+    weekly = indicator._replace(granularity="week")
+    assert weekly.aggregate(values) == DailyCounts(
+        total=3, counts=[DailyCount(date="2022-12-26", count=3)]
     )
-    assert "timestamp" not in statements.columns
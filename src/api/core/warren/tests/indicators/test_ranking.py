@@ -0,0 +1,82 @@
+"""Test ranking of objects by their number of events."""
+
+import pytest
+from warren_video.indicators import DailyUniqueViews, DailyViews
+
+from warren.filters import DatetimeRange
+from warren.indicators.ranking import get_top_counts
+from warren.models import ActivityCount, DailyCount, DailyCounts, DailyUniqueCounts
+
+VIEWS = {
+    "uuid://video-1": 3,
+    "uuid://video-2": 10,
+    "uuid://video-3": 0,
+    "uuid://video-4": 10,
+    "uuid://video-5": 7,
+}
+
+
+def get_indicators(klass=DailyViews):
+    """Get views indicators of all videos."""
+    span_range = DatetimeRange(since="2023-01-01", until="2023-01-02")
+    return [klass(object_id=iri, span_range=span_range) for iri in VIEWS]
+
+
+@pytest.mark.anyio
+async def test_get_top_counts(db_session, monkeypatch):
+    """Test the objects with the most events are ranked first."""
+
+    async def compute(self) -> DailyCounts:
+        views = VIEWS[self.object_id]
+        return DailyCounts(
+            total=views, counts=[DailyCount(date=self.since.date(), count=views)]
+        )
+
+    monkeypatch.setattr(DailyViews, "compute", compute)
+
+    # Objects with the same number of events are ranked in the indicators order
+    assert await get_top_counts(get_indicators(), 3) == [
+        ActivityCount(iri="uuid://video-2", count=20),
+        ActivityCount(iri="uuid://video-4", count=20),
+        ActivityCount(iri="uuid://video-5", count=14),
+    ]
+    assert await get_top_counts(get_indicators(), 1) == [
+        ActivityCount(iri="uuid://video-2", count=20),
+    ]
+
+    top = await get_top_counts(get_indicators(), 10)
+    assert [activity.iri for activity in top] == [
+        "uuid://video-2",
+        "uuid://video-4",
+        "uuid://video-5",
+        "uuid://video-1",
+        "uuid://video-3",
+    ]
+    assert await get_top_counts([], 10) == []
+
+
+@pytest.mark.anyio
+async def test_get_top_counts_unique(db_session, monkeypatch):
+    """Test objects are ranked by their number of unique users."""
+
+    async def compute(self) -> DailyUniqueCounts:
+        return DailyUniqueCounts.parse_obj(
+            {
+                "total": VIEWS[self.object_id],
+                "counts": [
+                    {
+                        "date": self.since.date(),
+                        "count": VIEWS[self.object_id],
+                        "users": {f"user-{i}" for i in range(VIEWS[self.object_id])},
+                    }
+                ],
+            }
+        )
+
+    monkeypatch.setattr(DailyUniqueViews, "compute", compute)
+
+    # Users are counted once over the date range
+    assert await get_top_counts(get_indicators(DailyUniqueViews), 2) == [
+        ActivityCount(iri="uuid://video-2", count=10),
+        ActivityCount(iri="uuid://video-4", count=10),
+    ]
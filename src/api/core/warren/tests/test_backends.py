@@ -0,0 +1,183 @@
+"""Tests for Warren backends."""
+
+import asyncio
+import re
+
+import httpx
+import pytest
+from pytest_httpx import HTTPXMock
+from ralph.backends.data.lrs import LRSDataBackendSettings
+from ralph.backends.lrs.base import LRSStatementsQuery
+from ralph.exceptions import BackendException
+
+from warren.backends import LoadBalancedLRSDataBackend
+
+HOSTS = ["http://lrs-1.example.com", "http://lrs-2.example.com"]
+VERB_ID = "https://w3id.org/xapi/video/verbs/played"
+
+
+def get_backend(**kwargs) -> LoadBalancedLRSDataBackend:
+    """Instantiate a load balanced backend for the test hosts."""
+    return LoadBalancedLRSDataBackend(
+        settings=LRSDataBackendSettings(BASE_URL=HOSTS[0]),
+        hosts=HOSTS,
+        **kwargs,
+    )
+
+
+async def read(backend: LoadBalancedLRSDataBackend) -> list:
+    """Read all statements from the backend."""
+    return [
+        statement
+        async for statement in backend.read(
+            target=backend.settings.STATEMENTS_ENDPOINT,
+            query=LRSStatementsQuery(verb=VERB_ID),
+        )
+    ]
+
+
+def test_backends_load_balanced_select_host_round_robin():
+    """Test the round-robin host selection strategy."""
+    backend = get_backend()
+
+    assert [backend.select_host() for _ in range(4)] == HOSTS * 2
+    assert backend.select_host(exclude=HOSTS[0]) == HOSTS[1]
+    assert backend.select_host(exclude=HOSTS[1]) == HOSTS[0]
+
+
+def test_backends_load_balanced_select_host_least_outstanding():
+    """Test the least-outstanding-requests host selection strategy."""
+    backend = get_backend(strategy="least-outstanding")
+
+    # Ties are broken in a round-robin fashion
+    assert [backend.select_host() for _ in range(2)] == HOSTS
+
+    backend.outstanding[HOSTS[0]] = 3
+    backend.outstanding[HOSTS[1]] = 1
+    assert [backend.select_host() for _ in range(2)] == [HOSTS[1]] * 2
+    # Excluded host is never selected
+    assert backend.select_host(exclude=HOSTS[1]) == HOSTS[0]
+
+
+def test_backends_load_balanced_hedging_delay():
+    """Test the hedging delay estimation."""
+    backend = get_backend(hedging=True, hedging_percentile=90, hedging_min_samples=3)
+
+    # Not enough samples
+    backend.latencies.extend([0.1, 0.2])
+    assert backend.hedging_delay is None
+
+    backend.latencies.extend([x / 10 for x in range(3, 11)])
+    assert backend.hedging_delay == 0.9
+
+    # Hedging disabled
+    assert get_backend(hedging=False, hedging_min_samples=0).hedging_delay is None
+
+    # No other host to hedge to
+    single = LoadBalancedLRSDataBackend(
+        settings=LRSDataBackendSettings(BASE_URL=HOSTS[0]),
+        hedging=True,
+        hedging_min_samples=0,
+    )
+    single.latencies.append(0.1)
+    assert single.hosts == [HOSTS[0]]
+    assert single.hedging_delay is None
+
+
+@pytest.mark.anyio
+async def test_backends_load_balanced_read(httpx_mock: HTTPXMock):
+    """Test that reads are balanced across hosts and pages stick to their host."""
+    for host in HOSTS:
+        httpx_mock.add_response(
+            url=re.compile(rf"^{host}/xAPI/statements\?.*page=2.*$"),
+            method="GET",
+            json={"statements": [{"id": f"{host}-2"}]},
+        )
+        httpx_mock.add_response(
+            url=re.compile(rf"^{host}/xAPI/statements\?verb=[^&]+&limit=500$"),
+            method="GET",
+            json={"statements": [{"id": f"{host}-1"}], "more": "/xAPI?page=2"},
+        )
+
+    backend = get_backend()
+    assert await read(backend) == [{"id": f"{HOSTS[0]}-1"}, {"id": f"{HOSTS[0]}-2"}]
+    assert await read(backend) == [{"id": f"{HOSTS[1]}-1"}, {"id": f"{HOSTS[1]}-2"}]
+    assert backend.outstanding == {host: 0 for host in HOSTS}
+    assert len(backend.latencies) == 4
+
+
+@pytest.mark.anyio
+async def test_backends_load_balanced_read_failure(httpx_mock: HTTPXMock):
+    """Test that a failing host raises a backend exception."""
+    httpx_mock.add_response(url=re.compile(rf"^{HOSTS[0]}/.*$"), status_code=500)
+
+    with pytest.raises(BackendException, match="Failed to fetch statements"):
+        await read(get_backend())
+
+
+@pytest.mark.anyio
+async def test_backends_load_balanced_hedged_read(monkeypatch):
+    """Test that a slow page request is hedged to another host."""
+    backend = get_backend(hedging=True, hedging_min_samples=1)
+    backend.latencies.append(0.01)
+    requested = []
+
+    async def get(host, path, query_params):
+        requested.append(host)
+        if host == HOSTS[0]:
+            await asyncio.sleep(10)
+        return httpx.Response(200, json={"statements": [{"id": host}]})
+
+    monkeypatch.setattr(backend, "_get", get)
+
+    assert await read(backend) == [{"id": HOSTS[1]}]
+    assert requested == HOSTS
+
+
+@pytest.mark.anyio
+async def test_backends_load_balanced_hedged_read_cancelled(monkeypatch):
+    """Test that the cancelled request of a hedged read is released and timed."""
+    backend = get_backend(hedging=True, hedging_min_samples=1)
+    backend.latencies.append(0.01)
+
+    async def get(url, params):
+        if url.startswith(HOSTS[0]):
+            await asyncio.sleep(10)
+        return httpx.Response(
+            200,
+            json={"statements": [{"id": url}]},
+            request=httpx.Request("GET", url),
+        )
+
+    monkeypatch.setattr(backend.client, "get", get)
+
+    assert len(await read(backend)) == 1
+    assert backend.outstanding == {host: 0 for host in HOSTS}
+    # Both the winning and the cancelled requests latencies are recorded
+    assert len(backend.latencies) == 3
+    assert max(backend.latencies) < 10
+
+
+@pytest.mark.anyio
+async def test_backends_load_balanced_hedged_read_failure(monkeypatch):
+    """Test that a hedged request error falls back to the slow request."""
+    backend = get_backend(hedging=True, hedging_min_samples=1)
+    backend.latencies.append(0.01)
+
+    async def get(host, path, query_params):
+        if host == HOSTS[0]:
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json={"statements": [{"id": host}]})
+        raise httpx.ConnectError("Connection refused")
+
+    monkeypatch.setattr(backend, "_get", get)
+    assert await read(backend) == [{"id": HOSTS[0]}]
+
+    async def failing_get(host, path, query_params):
+        await asyncio.sleep(0.05 if host == HOSTS[1] else 0.1)
+        raise httpx.ConnectError(host)
+
+    monkeypatch.setattr(backend, "_get", failing_get)
+    # Both requests failed: the primary request error is raised
+    with pytest.raises(BackendException, match=HOSTS[0]):
+        await read(backend)
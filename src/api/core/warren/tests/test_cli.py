@@ -1,6 +1,8 @@
 """Test Warren commands functions."""
 
 # ruff: noqa: S106
+import subprocess
+import sys
 from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
@@ -24,6 +26,19 @@ from warren.xi.models import ExperienceRead, ExperienceReadSnapshot
 from warren.xi.schema import Experience
 
 
+def test_cli_lazy_imports():
+    """Test heavy dependencies are not imported when loading the CLI."""
+    heavy = ("alembic", "httpx", "pandas", "ralph", "warren.backends", "warren.xi")
+    script = (
+        "import sys, warren.cli; "
+        f"print(' '.join(m for m in sys.modules if m.startswith({heavy!r})))"
+    )
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, "-c", script], capture_output=True, check=True, text=True
+    )
+    assert output.stdout.strip() == ""
+
+
 def test_migration_check_command(monkeypatch):
     """Test warren check command."""
     monkeypatch.setattr(alembic_command, "check", MagicMock())
@@ -154,6 +169,8 @@ def test_indicator_inspect_command(monkeypatch):
         "object_id\tPOSITIONAL_OR_KEYWORD\tdefault='no'\t<class 'str'>\n"
         "span_range\tPOSITIONAL_OR_KEYWORD\tdefault='no'\t"
         "<class 'warren.filters.DatetimeRange'>\n"
+        "granularity\tPOSITIONAL_OR_KEYWORD\tdefault='day'\t"
+        "typing.Literal['hour', 'day', 'week', 'month']\n"
     ) == result.output
 
     # Test parameter default value
@@ -1,9 +1,12 @@
 """Tests for Warren db module."""
 
+from prometheus_client.registry import REGISTRY
+from sqlalchemy import create_engine, text
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.orm import Session as SASession
 
-from warren.db import Session, is_alive
+from warren.conf import settings
+from warren.db import InstrumentedQueuePool, Session, is_alive
 
 
 def test_db_is_alive(db_session, monkeypatch):
@@ -16,3 +19,14 @@ def test_db_is_alive(db_session, monkeypatch):
 
     monkeypatch.setattr(SASession, "execute", raise_operational_error)
     assert is_alive() is False
+
+
+def test_db_instrumented_queue_pool():
+    """Test the time spent waiting for a pool connection is observed."""
+    metric = "warren_db_pool_checkout_wait_seconds_count"
+    engine = create_engine(settings.TEST_DATABASE_URL, poolclass=InstrumentedQueuePool)
+    before = REGISTRY.get_sample_value(metric)
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    engine.dispose()
+    assert REGISTRY.get_sample_value(metric) == before + 1
@@ -0,0 +1,213 @@
+"""Test dataframe engines."""
+
+import sys
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pytest
+from dateutil.tz import tzoffset
+from warren_video.indicators import DailyUniqueViews, DailyViews
+
+from warren.conf import settings
+from warren.engines import PolarsEngine, PyArrowEngine, get_engine, get_utc_offset
+from warren.exceptions import DataFrameEngineException
+from warren.factories.base import BaseXapiStatementFactory
+from warren.filters import DatetimeRange
+from warren.predicates import Column, Predicate
+
+EXTENSION_TIME = "https://w3id.org/xapi/video/extensions/time"
+UTC = timezone.utc
+
+
+@pytest.fixture(params=["pandas", "polars", "pyarrow"])
+def engine(request, monkeypatch):
+    """Configure the dataframe engine, skipping engines that are not installed."""
+    if request.param != "pandas":
+        pytest.importorskip(request.param)
+    monkeypatch.setattr(settings, "DATAFRAME_ENGINE", request.param)
+    return get_engine()
+
+
+def build_statements():
+    """Build raw statements for three actors."""
+    return [
+        BaseXapiStatementFactory.build(
+            mutations=[
+                {
+                    "actor": {
+                        "objectType": "Agent",
+                        "account": {"name": name, "homePage": "http://fun-mooc.fr"},
+                    },
+                    "timestamp": timestamp,
+                    "result": {"extensions": {EXTENSION_TIME: time}},
+                }
+            ]
+        ).dict()
+        for name, timestamp, time in (
+            ("john", "2023-01-01T10:00:00+00:00", 10.0),
+            ("jane", "2023-01-01T23:30:00+00:00", 45.0),
+            ("john", "2023-01-02T10:00:00+02:00", 20.0),
+            ("bob", "2023-01-02T22:30:00+00:00", 5.0),
+        )
+    ]
+
+
+def test_engines_get_engine(monkeypatch):
+    """Test the configured engine is used by default."""
+    assert get_engine().name == "pandas"
+    assert get_engine() is get_engine("pandas")
+
+    monkeypatch.setattr(settings, "DATAFRAME_ENGINE", "polars")
+    monkeypatch.setitem(sys.modules, "polars", None)
+    with pytest.raises(DataFrameEngineException, match="requires the polars package"):
+        PolarsEngine()
+
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    with pytest.raises(DataFrameEngineException, match="requires the pyarrow package"):
+        PyArrowEngine()
+
+
+def test_engines_get_utc_offset():
+    """Test the fixed UTC offset of a timezone."""
+    assert get_utc_offset(None).total_seconds() == 0
+    assert get_utc_offset(tzoffset(None, 7200)).total_seconds() == 7200
+
+
+def count_by_date(engine, frame, since):
+    """Count frame rows per date using the engine day buckets."""
+    first, counts = engine.count_by_day(frame, since)
+    return {
+        since.date() + timedelta(days=first + index): count
+        for index, count in enumerate(counts.tolist())
+        if count
+    }
+
+
+def test_engines_pipeline(engine):
+    """Test the statements pipeline steps with all engines."""
+    frame = engine.load(
+        build_statements(), ["timestamp", f"result.extensions.{EXTENSION_TIME}"]
+    )
+    utc = datetime(2023, 1, 1, tzinfo=tzoffset(None, 0))
+    local = datetime(2023, 1, 1, tzinfo=tzoffset(None, 7200))
+
+    assert count_by_date(engine, frame, utc) == {
+        date(2023, 1, 1): 2,
+        date(2023, 1, 2): 2,
+    }
+    assert count_by_date(engine, frame, local) == {
+        date(2023, 1, 1): 1,
+        date(2023, 1, 2): 2,
+        date(2023, 1, 3): 1,
+    }
+
+    filtered = engine.filter(frame, Column(f"result.extensions.{EXTENSION_TIME}") <= 20)
+    assert count_by_date(engine, filtered, local) == {
+        date(2023, 1, 1): 1,
+        date(2023, 1, 2): 1,
+        date(2023, 1, 3): 1,
+    }
+
+    uniques = engine.unique_by_day(frame, "actor.uid", utc)
+    assert {day: len(users) for day, users in uniques.items()} == {0: 2, 1: 2}
+
+    first = engine.drop_duplicates(frame, "actor.uid")
+    assert count_by_date(engine, first, utc) == {
+        date(2023, 1, 1): 2,
+        date(2023, 1, 2): 1,
+    }
+    # Only the first statement of each actor is kept
+    bob = engine.filter(first, Column(f"result.extensions.{EXTENSION_TIME}") < 10)
+    assert count_by_date(engine, bob, utc) == {date(2023, 1, 2): 1}
+
+
+def test_engines_count_by_day(engine):
+    """Test rows are bucketed by day index relative to the first day."""
+    frame = engine.load(build_statements(), ["timestamp"])
+
+    first, counts = engine.count_by_day(frame, datetime(2023, 1, 2, tzinfo=UTC))
+    assert first == -1
+    assert counts.tolist() == [2, 2]
+
+    first, counts = engine.count_by_day(frame, datetime(2022, 12, 30, tzinfo=UTC))
+    assert first == 0
+    assert counts.tolist() == [0, 0, 2, 2]
+
+    empty = engine.filter(frame, Column("actor.uid").isin([]))
+    first, counts = engine.count_by_day(empty, datetime(2023, 1, 1, tzinfo=UTC))
+    assert first == 0
+    assert counts.tolist() == []
+    assert engine.unique_by_day(empty, "actor.uid", datetime(2023, 1, 1)) == {}
+
+
+def test_engines_filter(engine):
+    """Test predicates are compiled to boolean masks with all engines."""
+    statements = build_statements()
+    statements[1]["result"] = {}
+    frame = engine.load(
+        statements, ["timestamp", f"result.extensions.{EXTENSION_TIME}"]
+    )
+    time = Column(f"result.extensions.{EXTENSION_TIME}")
+    uid = Column("actor.uid")
+    since = datetime(2023, 1, 1, tzinfo=UTC)
+
+    def count(*predicates):
+        return int(
+            engine.count_by_day(engine.filter(frame, *predicates), since)[1].sum()
+        )
+
+    assert count() == 4
+    assert count(time > 5) == 2
+    assert count(time >= 5, time < 20) == 2
+    assert count((time == 5) | (time == 20)) == 2
+    # Negated comparisons do not match missing values either
+    assert count(~(time == 5)) == 2
+    assert count(~((time == 5) | uid.isin([]))) == 2
+    assert count(time != 5) == 2
+    assert count(time.isin([5, 10])) == 2
+    assert count(time.notnull()) == 3
+    assert count(uid.isin([])) == 0
+    assert count(~uid.isin([])) == 4
+    # Missing columns never match comparisons
+    assert count(Column("result.score.raw") > 0) == 0
+    assert count(~(Column("result.score.raw") > 0)) == 0
+
+
+def test_engines_predicates_columns():
+    """Test predicates columns, which concrete predicates must define."""
+    time = Column(f"result.extensions.{EXTENSION_TIME}")
+    uid = Column("actor.uid")
+
+    assert ((time > 5) & ~(uid.isin([]) | (time < 20))).columns == (
+        f"result.extensions.{EXTENSION_TIME}",
+        "actor.uid",
+    )
+    with pytest.raises(TypeError):
+        Predicate()  # type: ignore[abstract]
+
+
+def test_engines_indicators(engine, monkeypatch):
+    """Test all engines compute the same indicators as the pandas engine."""
+    span_range = DatetimeRange(
+        since="2023-01-01T00:00:00+02:00", until="2023-01-03T00:00:00+02:00"
+    )
+    statements = build_statements()
+
+    for klass, total in ((DailyViews, 3), (DailyUniqueViews, 2)):
+        indicator = klass(object_id="uuid://foo", span_range=span_range)
+        monkeypatch.setattr(settings, "DATAFRAME_ENGINE", engine.name)
+        result = indicator.compute_from_statements(statements)
+        monkeypatch.setattr(settings, "DATAFRAME_ENGINE", "pandas")
+        assert result == indicator.compute_from_statements(statements)
+        assert result.total == total
+
+
+def test_engines_pandas_timezone_name():
+    """Test the pandas engine supports timezones without a fixed UTC offset."""
+    engine = get_engine("pandas")
+    frame = engine.load(build_statements(), ["timestamp"])
+    first, counts = engine.count_by_day(
+        frame, datetime(2023, 1, 1, tzinfo=ZoneInfo("Asia/Tokyo"))
+    )
+    assert first == 0
+    assert counts.tolist() == [1, 2, 1]
@@ -10,7 +10,7 @@ from freezegun import freeze_time
 from pydantic import ValidationError
 
 from warren.conf import settings
-from warren.filters import BaseQueryFilters, DatetimeRange
+from warren.filters import BaseQueryFilters, DatetimeRange, GranularityQueryFilters
 
 
 def test_datetime_range_model():
@@ -123,3 +123,27 @@ def test_base_query_filters_model():
     filters = BaseQueryFilters(since=since, until=until)
     with pytest.raises(HTTPException, match="422"):
         BaseQueryFilters(since=since, until=until.shift(days=1))
+
+
+def test_granularity_query_filters_model():
+    """Test the GranularityQueryFilters model."""
+    filters = GranularityQueryFilters(since="2023-01-11", until="2023-02-11")
+    assert filters.granularity == "day"
+
+    filters = GranularityQueryFilters(
+        since="2023-01-01", until="2023-12-31", granularity="month"
+    )
+    assert filters.granularity == "month"
+
+    with pytest.raises(ValidationError):
+        GranularityQueryFilters(granularity="year")
+
+    # Check Date/time range max span of hourly results
+    since = arrow.utcnow()
+    until = since + settings.MAX_HOURLY_DATETIMERANGE_SPAN
+    GranularityQueryFilters(since=since, until=until, granularity="hour")
+    GranularityQueryFilters(since=since, until=until.shift(days=1), granularity="day")
+    with pytest.raises(HTTPException, match="422"):
+        GranularityQueryFilters(
+            since=since, until=until.shift(days=1), granularity="hour"
+        )
@@ -0,0 +1,96 @@
+"""Test Warren Prometheus metrics."""
+
+import pytest
+from prometheus_client import CollectorRegistry
+from prometheus_client.registry import REGISTRY
+from warren_video.indicators import DailyViews
+
+from warren.filters import DatetimeRange
+from warren.metrics import get_registry, observe_cache_result
+from warren.models import DailyCounts
+
+
+def get_cache_requests(indicator: str, result: str) -> float:
+    """Get the number of cache requests of an indicator."""
+    return (
+        REGISTRY.get_sample_value(
+            "warren_indicator_cache_requests_total",
+            {"indicator": indicator, "result": result},
+        )
+        or 0.0
+    )
+
+
+def get_frames_computed(indicator: str) -> float:
+    """Get the number of frames computed for an indicator."""
+    return (
+        REGISTRY.get_sample_value(
+            "warren_indicator_frames_computed_total", {"indicator": indicator}
+        )
+        or 0.0
+    )
+
+
+def test_observe_cache_result():
+    """Test cache requests are counted by result."""
+    observe_cache_result("Foo", computed=0, total=3)
+    observe_cache_result("Foo", computed=1, total=3)
+    observe_cache_result("Foo", computed=3, total=3)
+    observe_cache_result("Foo", computed=1, total=1)
+
+    assert get_cache_requests("Foo", "hit") == 1
+    assert get_cache_requests("Foo", "partial") == 1
+    assert get_cache_requests("Foo", "miss") == 2
+    assert get_frames_computed("Foo") == 5
+
+
+@pytest.mark.anyio
+async def test_incremental_indicators_metrics(db_session, monkeypatch):
+    """Test incremental indicators cache results and computed frames are counted."""
+
+    async def compute(self) -> DailyCounts:
+        return DailyCounts.from_range(self.since, self.until)
+
+    monkeypatch.setattr(DailyViews, "compute", compute)
+    before = {
+        result: get_cache_requests("DailyViews", result)
+        for result in ("hit", "miss", "partial")
+    }
+    frames = get_frames_computed("DailyViews")
+    compute_count = (
+        REGISTRY.get_sample_value(
+            "warren_indicator_compute_duration_seconds_count",
+            {"indicator": "DailyViews"},
+        )
+        or 0.0
+    )
+
+    for until in ("2023-01-02", "2023-01-02", "2023-01-04"):
+        await DailyViews(
+            object_id="uuid://foo",
+            span_range=DatetimeRange(since="2023-01-01", until=until),
+        ).get_or_compute()
+
+    assert {
+        result: get_cache_requests("DailyViews", result) - count
+        for result, count in before.items()
+    } == {"hit": 1, "miss": 1, "partial": 1}
+    assert get_frames_computed("DailyViews") - frames == 4
+    assert (
+        REGISTRY.get_sample_value(
+            "warren_indicator_compute_duration_seconds_count",
+            {"indicator": "DailyViews"},
+        )
+        - compute_count
+        == 4
+    )
+
+
+def test_get_registry(monkeypatch, tmp_path):
+    """Test metrics of all workers are collected in multi-process mode."""
+    assert get_registry() is REGISTRY
+
+    monkeypatch.setenv("PROMETHEUS_MULTIPROC_DIR", str(tmp_path))
+    registry = get_registry()
+    assert isinstance(registry, CollectorRegistry)
+    assert registry is not REGISTRY
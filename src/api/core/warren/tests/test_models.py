@@ -1,12 +1,21 @@
 """Tests for the core models."""
 
 import datetime
+import json
 from random import randint
 
+import numpy as np
 import pytest
 
 from warren.filters import DatetimeRange
-from warren.models import DailyCount, DailyCounts, DailyUniqueCount, DailyUniqueCounts
+from warren.models import (
+    DailyCount,
+    DailyCounts,
+    DailyCountsArray,
+    DailyUniqueCount,
+    DailyUniqueCounts,
+    DailyUniqueCountsArray,
+)
 
 
 def test_daily_count_add():
@@ -241,3 +250,179 @@ def test_daily_unique_counts_to_daily_count():
             DailyCount(date="2023-01-03", count=4),
         ],
     )
+
+
+def test_daily_counts_array():
+    """Test the DailyCountsArray dense representation."""
+    date_range = DatetimeRange.parse_obj({"since": "2023-01-01", "until": "2023-01-03"})
+    empty = DailyCountsArray.from_range(date_range.since, date_range.until)
+    assert empty.start == datetime.date(2023, 1, 1)
+    assert empty.counts.tolist() == [0, 0, 0]
+    assert empty.to_daily_counts() == DailyCounts.from_range(
+        date_range.since, date_range.until
+    )
+
+    array = DailyCountsArray.from_counts(
+        [
+            DailyCount(date="2023-01-04", count=2),
+            DailyCount(date="2023-01-02", count=1),
+            DailyCount(date="2023-01-04", count=3),
+        ]
+    )
+    assert array.start == datetime.date(2023, 1, 2)
+    assert array.counts.tolist() == [1, 0, 5]
+
+    merged = DailyCountsArray.sum([array, DailyCountsArray(), empty])
+    assert merged.start == datetime.date(2023, 1, 1)
+    assert merged.counts.tolist() == [0, 1, 0, 5]
+    assert merged.to_daily_counts() == DailyCounts(
+        total=6,
+        counts=[
+            DailyCount(date="2023-01-01", count=0),
+            DailyCount(date="2023-01-02", count=1),
+            DailyCount(date="2023-01-03", count=0),
+            DailyCount(date="2023-01-04", count=5),
+        ],
+    )
+
+    assert DailyCountsArray.sum([]).to_daily_counts() == DailyCounts()
+    assert DailyCountsArray.from_counts([]).start is None
+
+
+def test_daily_counts_resample():
+    """Test summing daily counts per week or month."""
+    array = DailyCountsArray(
+        start=datetime.date(2023, 1, 30), counts=np.arange(1, 10, dtype=np.int64)
+    )
+    daily = array.to_daily_counts()
+    assert array.resample("day") == daily
+    assert daily.resample("day") == daily
+
+    # 2023-01-30 is a Monday
+    assert array.resample("week") == DailyCounts(
+        total=45,
+        counts=[
+            DailyCount(date="2023-01-30", count=28),
+            DailyCount(date="2023-02-06", count=17),
+        ],
+    )
+    assert daily.resample("week") == array.resample("week")
+
+    assert array.resample("month") == DailyCounts(
+        total=45,
+        counts=[
+            DailyCount(date="2023-01-01", count=3),
+            DailyCount(date="2023-02-01", count=42),
+        ],
+    )
+    assert daily.resample("month") == array.resample("month")
+
+    assert DailyCountsArray().resample("week") == DailyCounts()
+    assert DailyCounts().resample("month") == DailyCounts()
+
+
+def test_daily_unique_counts_array():
+    """Test the DailyUniqueCountsArray sparse representation."""
+    uids = {1: "luke", 2: "han", 3: "leia", 4: "yoda"}
+    ids = {uid: user for user, uid in uids.items()}
+    array = DailyUniqueCountsArray.from_counts(
+        [
+            DailyUniqueCount(date="2023-01-03", count=2, users={"luke", "han"}),
+            DailyUniqueCount(date="2023-01-01", count=1, users={"luke"}),
+            DailyUniqueCount(date="2023-01-03", count=1, users={"leia"}),
+        ],
+        ids,
+    )
+    assert array.start == datetime.date(2023, 1, 1)
+    assert array.days == 3
+    # Users are only kept on their first day, sorted by day
+    assert array.offsets.tolist() == [0, 2, 2]
+    assert array.users.tolist() == [1, 2, 3]
+    assert array.users.dtype == np.int32
+    assert array.counts.tolist() == [1, 0, 2]
+
+    other = DailyUniqueCountsArray.from_counts(
+        [
+            DailyUniqueCount(date="2022-12-31", users={"han"}),
+            DailyUniqueCount(date="2023-01-01", users={"yoda"}),
+        ],
+        ids,
+    )
+    merged = DailyUniqueCountsArray.sum([array, other, DailyUniqueCountsArray()])
+    assert merged.start == datetime.date(2022, 12, 31)
+
+    # Users are only counted on their first day
+    assert merged.to_daily_unique_counts(uids) == DailyUniqueCounts(
+        total=4,
+        counts=[
+            DailyUniqueCount(date="2022-12-31", count=1, users={"han"}),
+            DailyUniqueCount(date="2023-01-01", count=2, users={"luke", "yoda"}),
+            DailyUniqueCount(date="2023-01-02", count=0, users=set()),
+            DailyUniqueCount(date="2023-01-03", count=1, users={"leia"}),
+        ],
+    )
+    assert DailyUniqueCountsArray.sum([]).to_daily_unique_counts({}) == (
+        DailyUniqueCounts()
+    )
+    assert DailyUniqueCountsArray.from_range(
+        datetime.datetime(2023, 1, 1), datetime.datetime(2023, 1, 2)
+    ).to_daily_unique_counts({}) == DailyUniqueCounts(
+        counts=[
+            DailyUniqueCount(date="2023-01-01"),
+            DailyUniqueCount(date="2023-01-02"),
+        ]
+    )
+
+
+def test_daily_unique_counts_array_cached_value():
+    """Test DailyUniqueCountsArray cached values store users ids per day."""
+    array = DailyUniqueCountsArray.from_users(
+        datetime.date(2023, 1, 1), np.array([2, 0, 2, 0]), np.array([3, 1, 1, 2]), 4
+    )
+    value = array.to_cached_value()
+    assert value == {"start": "2023-01-01", "users": [[1, 2], [], [3], []]}
+    assert json.loads(json.dumps(value)) == value
+
+    cached = DailyUniqueCountsArray.from_cached_value(value)
+    assert cached.start == array.start
+    assert cached.days == 4
+    assert cached.offsets.tolist() == array.offsets.tolist()
+    assert cached.users.tolist() == array.users.tolist()
+
+    empty = DailyUniqueCountsArray()
+    assert empty.to_cached_value() == {"start": None, "users": []}
+    assert DailyUniqueCountsArray.from_cached_value(empty.to_cached_value()).total == 0
+
+
+def test_daily_unique_counts_array_sum_matches_sets():
+    """Test joining sparse daily users gives the same counts as joining sets."""
+    rng = np.random.default_rng(42)
+    start = datetime.date(2023, 1, 1)
+    frames = [
+        DailyUniqueCount(
+            date=start + datetime.timedelta(days=int(day)),
+            users={f"user-{user}" for user in rng.integers(0, 50, size=10)},
+        )
+        for day in rng.integers(0, 20, size=40)
+    ]
+
+    uids = dict(enumerate(f"user-{user}" for user in range(50)))
+    ids = {uid: user for user, uid in uids.items()}
+    merged = DailyUniqueCountsArray.sum(
+        DailyUniqueCountsArray.from_counts([count], ids) for count in frames
+    ).to_daily_unique_counts(uids)
+
+    # Join users sets
+    daily_users: dict = {}
+    for count in frames:
+        daily_users.setdefault(count.date, set()).update(count.users)
+    seen: set = set()
+    expected = {}
+    for date in sorted(daily_users):
+        expected[date] = daily_users[date] - seen
+        seen |= daily_users[date]
+
+    assert merged.total == len(seen)
+    assert {count.date: count.users for count in merged.counts if count.users} == {
+        date: users for date, users in expected.items() if users
+    }
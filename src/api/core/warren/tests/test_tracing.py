@@ -0,0 +1,108 @@
+"""Test tracing of indicators computation phases."""
+
+import re
+
+import pytest
+from pytest_httpx import HTTPXMock
+
+from warren.backends import lrs_client
+from warren.conf import settings
+from warren.tracing import get_server_timing, phases_timings, span, trace
+
+
+@pytest.fixture
+def non_mocked_hosts() -> list:
+    """pytest-httpx: let requests to warren pass untouched."""
+    return ["localhost"]
+
+
+def test_span():
+    """Test phases durations are summed in the current request timings."""
+    # No request is being traced
+    with span("foo"):
+        pass
+
+    timings = {}
+    token = phases_timings.set(timings)
+    with span("foo"):
+        pass
+    with pytest.raises(ValueError), span("foo"):
+        raise ValueError()
+    with span("bar", "description"):
+        pass
+    phases_timings.reset(token)
+
+    assert list(timings) == ["foo", "bar"]
+    assert all(duration > 0 for duration in timings.values())
+
+
+@pytest.mark.anyio
+async def test_trace():
+    """Test functions and coroutine functions calls are traced."""
+
+    @trace("foo")
+    def foo(value):
+        """Foo."""
+        return value
+
+    @trace("bar")
+    async def bar(value):
+        """Bar."""
+        return value
+
+    timings = {}
+    token = phases_timings.set(timings)
+    assert foo(1) == 1
+    assert await bar(2) == 2
+    phases_timings.reset(token)
+
+    assert list(timings) == ["foo", "bar"]
+    assert foo.__doc__ == "Foo."
+    assert bar.__doc__ == "Bar."
+
+
+def test_get_server_timing():
+    """Test phases durations are formatted in milliseconds."""
+    assert get_server_timing({}) == ""
+    assert (
+        get_server_timing({"cache": 0.0012, "lrs": 0.25})
+        == "cache;dur=1.2, lrs;dur=250.0"
+    )
+
+
+@pytest.mark.anyio
+async def test_server_timing_middleware(
+    http_client, auth_headers, httpx_mock: HTTPXMock, db_session, monkeypatch
+):
+    """Test indicators responses have a Server-Timing header."""
+    lrs_client.base_url = "http://fake-lrs.com"
+    httpx_mock.add_response(
+        url=re.compile(r"^http://fake-lrs\.com/xAPI/statements\?.*$"),
+        method="GET",
+        json={"statements": []},
+        status_code=200,
+    )
+    url = "/api/v1/video/uuid://fake-uuid/views"
+    params = {"since": "2023-01-01", "until": "2023-01-01"}
+
+    response = await http_client.get(url, params=params, headers=auth_headers)
+    assert response.status_code == 200
+    phases = [
+        metric.split(";")[0] for metric in response.headers["Server-Timing"].split(", ")
+    ]
+    assert phases == ["cache", "lrs", "compute", "save", "merge", "total"]
+
+    # Cached results
+    response = await http_client.get(url, params=params, headers=auth_headers)
+    assert re.fullmatch(
+        r"cache;dur=[\d.]+, merge;dur=[\d.]+, total;dur=[\d.]+",
+        response.headers["Server-Timing"],
+    )
+
+    # Requests without traced phases
+    response = await http_client.get("/__lbheartbeat__")
+    assert "Server-Timing" not in response.headers
+
+    monkeypatch.setattr(settings, "SERVER_TIMING", False)
+    response = await http_client.get(url, params=params, headers=auth_headers)
+    assert "Server-Timing" not in response.headers
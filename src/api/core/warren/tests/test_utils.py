@@ -10,10 +10,12 @@ from fastapi import HTTPException
 from freezegun import freeze_time
 from jose import jwt
 from lti_toolbox.launch_params import LTIRole
+from prometheus_client.registry import REGISTRY
 
 from warren.models import LTIToken, LTIUser
 from warren.utils import (
     JOHN_DOE_USER,
+    LTITokenCache,
     forge_lti_token,
     get_lti_course_id,
     get_lti_roles,
@@ -403,3 +405,103 @@ def test_forge_lti_token(monkeypatch):
         resource_link_id="foo",
         resource_link_description="this is me",
     )
+
+
+def get_payload(exp: int) -> LTIToken:
+    """Get a LTI token payload expiring at `exp`."""
+    return LTIToken(
+        token_type="lti_access",  # noqa: S106
+        exp=exp,
+        iat=exp - 10000,
+        jti="",
+        session_id=str(uuid.uuid4()),
+        consumer_site="http://fake-lms.com",
+        course_id="course-v1:openfun+mathematics101+session01",
+        roles=["instructor"],
+        user=JOHN_DOE_USER,
+        locale="fr",
+        resource_link_id="",
+        resource_link_description="",
+    )
+
+
+@freeze_time("2023-01-01 00:00:00")
+def test_lti_token_cache():
+    """Test the LTI token cache evicts expired and least recently used tokens."""
+    now = int(datetime.datetime.now().timestamp())
+    cache = LTITokenCache(maxsize=2)
+    foo, bar, baz = (get_payload(now + 60) for _ in range(3))
+
+    assert cache.get("foo") is None
+    cache.set("foo", foo)
+    cache.set("bar", bar)
+    assert cache.get("foo") == foo
+    assert cache.get("bar") == bar
+    assert len(cache) == 2
+
+    # The least recently used token is evicted
+    assert cache.get("foo") == foo
+    cache.set("baz", baz)
+    assert len(cache) == 2
+    assert cache.get("bar") is None
+    assert cache.get("foo") == foo
+    assert cache.get("baz") == baz
+
+    assert cache.stats() == {
+        "size": 2,
+        "maxsize": 2,
+        "hits": 5,
+        "misses": 2,
+        "hit_ratio": 5 / 7,
+    }
+
+    # Expired tokens are evicted
+    with freeze_time("2023-01-01 00:01:00"):
+        assert cache.get("foo") is None
+    assert len(cache) == 1
+
+    # Tokens are cached for the current signing key
+    with mock.patch.object(settings, "APP_SIGNING_KEY", "OtherKey"):
+        assert cache.get("baz") is None
+
+    cache.clear()
+    assert len(cache) == 0
+    assert cache.hit_ratio == 0.0
+
+
+def test_lti_token_cache_disabled():
+    """Test tokens are not cached when the cache size is 0."""
+    cache = LTITokenCache(maxsize=0)
+    cache.set("foo", get_payload(int(datetime.datetime.now().timestamp()) + 60))
+    assert cache.get("foo") is None
+    assert len(cache) == 0
+
+
+def test_get_lti_token_cache(monkeypatch):
+    """Test verified tokens are cached."""
+    cache = LTITokenCache(maxsize=10)
+    monkeypatch.setattr("warren.utils.lti_token_cache", cache)
+    token = forge_lti_token()
+
+    def get_requests(result):
+        return REGISTRY.get_sample_value(
+            "warren_lti_token_cache_requests_total", {"result": result}
+        )
+
+    hits, misses = get_requests("hit") or 0, get_requests("miss") or 0
+
+    with mock.patch.object(jwt, "decode", wraps=jwt.decode) as decode:
+        payload = get_lti_token(token)
+        assert get_lti_token(token) == payload
+        assert get_lti_token(token) == payload
+    decode.assert_called_once()
+    assert cache.hits == 2
+    assert cache.misses == 1
+    # Cache statistics are exported to Prometheus
+    assert get_requests("hit") == hits + 2
+    assert get_requests("miss") == misses + 1
+
+    # Invalid tokens are not cached
+    with pytest.raises(HTTPException):
+        get_lti_token("foo")
+    assert len(cache) == 1
@@ -214,3 +214,33 @@ async def test_crud_experience_create_or_update_existing(
 
     crud_instance.create.assert_not_awaited()
     crud_instance.update.assert_awaited_once()
+
+
+@pytest.mark.anyio
+async def test_crud_experience_bulk_upsert(
+    http_auth_client: AsyncClient, db_session: Session, monkeypatch
+):
+    """Test creating or updating experiences by batches using 'bulk_upsert'."""
+    ExperienceFactory.__session__ = db_session
+    monkeypatch.setattr(CRUDExperience, "_base_url", "/api/v1/experiences")
+    crud_instance = CRUDExperience(client=http_auth_client)
+    post = AsyncMock(wraps=http_auth_client.post)
+    monkeypatch.setattr(http_auth_client, "post", post)
+
+    # Upsert an existing experience and new experiences
+    existing = ExperienceFactory.create_sync()
+    data = [
+        ExperienceCreate(**ExperienceFactory.build_dict(iri=existing.iri)),
+        *(ExperienceCreate(**ExperienceFactory.build_dict()) for _ in range(4)),
+    ]
+    ids = await crud_instance.bulk_upsert(iter(data), batch_size=2)
+
+    # Experiences are upserted by batches
+    assert post.await_count == 3
+    assert list(ids) == [experience.iri for experience in data]
+    assert ids[existing.iri] == existing.id
+    assert all(isinstance(experience_id, uuid.UUID) for experience_id in ids.values())
+
+    # Nothing to upsert
+    assert await crud_instance.bulk_upsert([]) == {}
+    assert post.await_count == 3
@@ -10,8 +10,13 @@ from sqlmodel import Session
 
 from warren.xi.client import CRUDRelation
 from warren.xi.enums import RelationType
-from warren.xi.factories import RelationFactory
-from warren.xi.models import RelationCreate, RelationRead, RelationUpdate
+from warren.xi.factories import ExperienceFactory, RelationFactory
+from warren.xi.models import (
+    BidirectionalRelationCreate,
+    RelationCreate,
+    RelationRead,
+    RelationUpdate,
+)
 
 
 @pytest.mark.anyio
@@ -236,3 +241,45 @@ async def test_crud_relation_create_bidirectional(
             ),
         ]
     )
+
+
+@pytest.mark.anyio
+async def test_crud_relation_bulk_upsert_bidirectional(
+    http_auth_client: AsyncClient, db_session: Session, monkeypatch
+):
+    """Test upserting bidirectional relations by batches."""
+    ExperienceFactory.__session__ = db_session
+    monkeypatch.setattr(CRUDRelation, "_base_url", "/api/v1/relations")
+    crud_instance = CRUDRelation(client=http_auth_client)
+    post = AsyncMock(wraps=http_auth_client.post)
+    monkeypatch.setattr(http_auth_client, "post", post)
+
+    course, *contents = ExperienceFactory.create_batch_sync(4)
+    data = [
+        BidirectionalRelationCreate(
+            source_id=course.id,
+            target_id=content.id,
+            kind=RelationType.ISPARTOF,
+            inverse_kind=RelationType.HASPART,
+        )
+        for content in contents
+    ]
+    relations = await crud_instance.bulk_upsert_bidirectional(iter(data), batch_size=2)
+
+    # Relations are upserted by batches, in both directions
+    assert post.await_count == 2
+    assert [
+        (relation.source_id, relation.target_id, relation.kind)
+        for relation in relations
+    ] == [
+        relation
+        for content in contents
+        for relation in (
+            (course.id, content.id, RelationType.ISPARTOF),
+            (content.id, course.id, RelationType.HASPART),
+        )
+    ]
+
+    # Nothing to upsert
+    assert await crud_instance.bulk_upsert_bidirectional([]) == []
+    assert post.await_count == 2
@@ -12,12 +12,16 @@ from sqlmodel import Session
 
 from warren.conf import settings
 from warren.xi.client import ExperienceIndex
-from warren.xi.enums import AggregationLevel, Structure
+from warren.xi.enums import AggregationLevel, RelationType, Structure
 from warren.xi.factories import ExperienceFactory
 from warren.xi.indexers.moodle.client import Moodle
 from warren.xi.indexers.moodle.etl import CourseContent, Courses
 from warren.xi.indexers.moodle.models import Course, Module, Section
-from warren.xi.models import ExperienceCreate, ExperienceRead
+from warren.xi.models import (
+    BidirectionalRelationCreate,
+    ExperienceCreate,
+    ExperienceRead,
+)
 
 
 @pytest.mark.anyio
@@ -301,6 +305,59 @@ async def test_courses_load_errors(
     await indexer._load(data=[])
 
 
+@pytest.mark.anyio
+async def test_courses_load_batches(http_client: AsyncClient, monkeypatch):
+    """Test '_load' method from 'Courses' upserts experiences by batches."""
+    monkeypatch.setattr(settings, "XI_BULK_MAX_SIZE", 2)
+
+    # Instantiate the 'Courses' indexer
+    indexer = Courses(
+        lms=Moodle(),
+        xi=ExperienceIndex(),
+    )
+    indexer._xi.experience.bulk_upsert = AsyncMock(return_value={})
+
+    # Load data by batches
+    data = [ExperienceCreate(**ExperienceFactory.build_dict()) for _ in range(5)]
+    await indexer._load(data=iter(data))
+
+    assert [
+        call.args[0] for call in indexer._xi.experience.bulk_upsert.await_args_list
+    ] == [data[:2], data[2:4], data[4:]]
+
+
+@pytest.mark.anyio
+async def test_courses_load_failing_batch(http_client: AsyncClient, monkeypatch):
+    """Test '_load' method from 'Courses' skips failing experiences only."""
+    monkeypatch.setattr(settings, "XI_BULK_MAX_SIZE", 3)
+
+    # Instantiate the 'Courses' indexer
+    indexer = Courses(
+        lms=Moodle(),
+        xi=ExperienceIndex(),
+    )
+    data = [ExperienceCreate(**ExperienceFactory.build_dict()) for _ in range(4)]
+
+    # The second experience cannot be upserted
+    async def bulk_upsert(batch):
+        if data[1] in batch:
+            raise HTTPError("Unprocessable entity")
+        return {}
+
+    indexer._xi.experience.bulk_upsert = AsyncMock(side_effect=bulk_upsert)
+
+    # Experiences of the failing batch are upserted one by one
+    await indexer._load(data=iter(data))
+    assert [
+        call.args[0] for call in indexer._xi.experience.bulk_upsert.await_args_list
+    ] == [data[:3], data[:1], data[1:2], data[2:3], data[3:]]
+
+    # Errors are raised when they are not ignored
+    indexer._ignore_errors = False
+    with pytest.raises(HTTPError):
+        await indexer._load(data=iter(data))
+
+
 @pytest.mark.anyio
 async def test_course_content_load_errors(
     httpx_mock: HTTPXMock, http_client: AsyncClient, monkeypatch
@@ -373,15 +430,76 @@ async def test_course_content_load_create(
     # Mock data to be loaded
     content = ExperienceRead(**ExperienceFactory.build_dict(exclude={}))
 
-    # Mock relation 'create_bidirectional' operation
-    indexer._xi.relation.create_bidirectional = AsyncMock()
+    # Mock relation 'bulk_upsert_bidirectional' operation
+    indexer._xi.relation.bulk_upsert_bidirectional = AsyncMock()
 
-    # Mock experience 'create_or_update' operation to fake creation
-    indexer._xi.experience.create_or_update = AsyncMock(return_value=content)
+    # Mock experience 'bulk_upsert' operation to fake creation
+    indexer._xi.experience.bulk_upsert = AsyncMock(
+        return_value={content.iri: content.id}
+    )
 
     # Load data with mocked CRUD operations
     await indexer._load(data=[ExperienceCreate(**content.dict())])
 
-    # Assert 'create_bidirectional' has been called
-    # It should be called only when creating new experiences
-    indexer._xi.relation.create_bidirectional.assert_awaited_once()
+    # Assert experiences and relations have been upserted at once
+    indexer._xi.experience.bulk_upsert.assert_awaited_once()
+    indexer._xi.relation.bulk_upsert_bidirectional.assert_awaited_once()
+    relations = indexer._xi.relation.bulk_upsert_bidirectional.await_args.args[0]
+    assert list(relations) == [
+        BidirectionalRelationCreate(
+            source_id=experience.id,
+            target_id=content.id,
+            kind=RelationType.ISPARTOF,
+            inverse_kind=RelationType.HASPART,
+        )
+    ]
+
+
+@pytest.mark.anyio
+async def test_course_content_load_failing_batch(http_client: AsyncClient, monkeypatch):
+    """Test '_load' method from 'CourseContent' skips failing experiences only."""
+    monkeypatch.setattr(settings, "XI_BULK_MAX_SIZE", 3)
+
+    course = ExperienceRead(**ExperienceFactory.build_dict(exclude={}))
+
+    # Instantiate the 'CourseContent' indexer
+    indexer = CourseContent(
+        lms=Moodle(),
+        xi=ExperienceIndex(),
+        course=course,
+    )
+    contents = [
+        ExperienceRead(**ExperienceFactory.build_dict(exclude={})) for _ in range(3)
+    ]
+    data = [ExperienceCreate(**content.dict()) for content in contents]
+
+    # The second content cannot be upserted
+    async def bulk_upsert(batch):
+        if data[1] in batch:
+            raise HTTPError("Unprocessable entity")
+        return {
+            content.iri: content.id
+            for content in contents
+            if ExperienceCreate(**content.dict()) in batch
+        }
+
+    indexer._xi.experience.bulk_upsert = AsyncMock(side_effect=bulk_upsert)
+    indexer._xi.relation.bulk_upsert_bidirectional = AsyncMock()
+
+    # Relations are created for the experiences that have been upserted
+    await indexer._load(data=iter(data))
+    relations = [
+        list(call.args[0])
+        for call in indexer._xi.relation.bulk_upsert_bidirectional.await_args_list
+    ]
+    assert relations == [
+        [
+            BidirectionalRelationCreate(
+                source_id=course.id,
+                target_id=content.id,
+                kind=RelationType.ISPARTOF,
+                inverse_kind=RelationType.HASPART,
+            )
+        ]
+        for content in (contents[0], contents[2])
+    ]
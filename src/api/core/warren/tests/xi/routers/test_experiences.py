@@ -9,8 +9,11 @@ from uuid import uuid4
 import pytest
 from freezegun import freeze_time
 from httpx import AsyncClient
+from sqlalchemy import event
 from sqlmodel import Session, select
 
+from warren.conf import settings
+from warren.utils import forge_lti_token
 from warren.xi.enums import AggregationLevel, Structure
 from warren.xi.factories import (
     ExperienceFactory,
@@ -24,6 +27,9 @@ async def test_experience_auth(http_client: AsyncClient):
     """Test required authentication for experience endpoints."""
     assert (await http_client.get("/api/v1/experiences/")).status_code == 401
     assert (await http_client.post("/api/v1/experiences/", json={})).status_code == 401
+    assert (
+        await http_client.post("/api/v1/experiences/bulk", json=[])
+    ).status_code == 401
     assert (await http_client.get("/api/v1/experiences/foo")).status_code == 401
     assert (
         await http_client.put("/api/v1/experiences/foo", json={})
@@ -229,6 +235,94 @@ async def test_experience_create_invalid(
     assert len(experiences) == 0
 
 
+@pytest.mark.anyio
+async def test_experiences_bulk_upsert(
+    http_client: AsyncClient, auth_headers: dict, db_session: Session
+):
+    """Test creating and updating experiences in bulk."""
+    ExperienceFactory.__session__ = db_session
+
+    # Create an existing experience
+    existing = ExperienceFactory.create_sync()
+    created_at = existing.created_at
+
+    # Upsert the existing experience (updated) and new experiences
+    updated_data = ExperienceFactory.build_dict(iri=existing.iri, language="foo")
+    new_data = [ExperienceFactory.build_dict() for _ in range(3)]
+    duplicated_data = ExperienceFactory.build_dict(iri=new_data[0]["iri"])
+    response = await http_client.post(
+        "/api/v1/experiences/bulk",
+        headers=auth_headers,
+        json=[updated_data, *new_data, duplicated_data],
+    )
+    assert response.status_code == 200
+    response_data = response.json()
+
+    # Assert ids are returned for each IRI
+    assert set(response_data) == {existing.iri, *(data["iri"] for data in new_data)}
+    assert response_data[existing.iri] == str(existing.id)
+
+    # Assert the existing experience has been updated
+    db_session.expire_all()
+    experience = db_session.get(Experience, existing.id)
+    assert experience.language == "foo"
+    assert experience.created_at == created_at
+    assert experience.updated_at > created_at
+
+    # Assert new experiences have been created (the last duplicate wins)
+    experiences = db_session.exec(select(Experience)).all()
+    assert len(experiences) == 4
+    experience = db_session.get(Experience, response_data[new_data[0]["iri"]])
+    assert experience.language == duplicated_data["language"]
+    assert experience.duration == duplicated_data["duration"]
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "invalid_data",
+    [
+        [],
+        [{}],
+        [{"iri": "foo"}],
+        {"iri": "foo"},
+    ],
+)
+async def test_experiences_bulk_upsert_invalid(
+    http_client: AsyncClient,
+    auth_headers: dict,
+    db_session: Session,
+    invalid_data: Any,
+):
+    """Test upserting invalid experiences in bulk."""
+    response = await http_client.post(
+        "/api/v1/experiences/bulk", headers=auth_headers, json=invalid_data
+    )
+    assert response.status_code == 422
+
+    # Assert the database is still empty
+    experiences = db_session.exec(select(Experience)).all()
+    assert len(experiences) == 0
+
+
+@pytest.mark.anyio
+async def test_experiences_bulk_upsert_too_many(
+    http_client: AsyncClient, auth_headers: dict, db_session: Session
+):
+    """Test upserting more experiences than allowed in bulk."""
+    response = await http_client.post(
+        "/api/v1/experiences/bulk",
+        headers=auth_headers,
+        json=[
+            ExperienceFactory.build_dict() for _ in range(settings.XI_BULK_MAX_SIZE + 1)
+        ],
+    )
+    assert response.status_code == 422
+
+    # Assert the database is still empty
+    experiences = db_session.exec(select(Experience)).all()
+    assert len(experiences) == 0
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize(
     "number_experiences",
@@ -622,7 +716,9 @@ async def test_experiences_read_default(
     number_experiences = 200
     ExperienceFactory.create_batch_sync(number_experiences)
 
-    experiences = db_session.exec(select(Experience)).all()
+    experiences = db_session.exec(
+        select(Experience).order_by(Experience.created_at, Experience.id)
+    ).all()
 
     # Retrieve experiences without any query parameters
     response = await http_client.get(
@@ -676,7 +772,9 @@ async def test_experiences_read_pagination(
     ExperienceFactory.create_batch_sync(number_experiences)
 
     # Assert the expected number of experiences have been created
-    experiences = db_session.exec(select(Experience)).all()
+    experiences = db_session.exec(
+        select(Experience).order_by(Experience.created_at, Experience.id)
+    ).all()
     assert len(experiences) == number_experiences
 
     # Get experiences with pagination
@@ -706,6 +804,76 @@ async def test_experiences_read_pagination(
     assert len(experiences) == number_experiences
 
 
+@pytest.mark.anyio
+async def test_experiences_read_cursor_pagination(
+    http_client: AsyncClient,
+    auth_headers: dict,
+    db_session: Session,
+):
+    """Test retrieving experiences page by page with cursors."""
+    ExperienceFactory.__session__ = db_session
+
+    # Create some experiences in the database
+    number_experiences = 20
+    ExperienceFactory.create_batch_sync(number_experiences)
+    experiences = db_session.exec(
+        select(Experience).order_by(Experience.created_at, Experience.id)
+    ).all()
+
+    # Follow cursors until the last page
+    retrieved = []
+    requests = []
+    params: dict = {"limit": 10}
+    while True:
+        response = await http_client.get(
+            "/api/v1/experiences/", headers=auth_headers, params=params
+        )
+        assert response.status_code == 200
+        requests.append(params.copy())
+        retrieved += [experience["id"] for experience in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    # Assert all experiences have been retrieved once, in order (the last full
+    # page has a cursor to an empty page)
+    assert len(requests) == 3
+    assert retrieved == [str(experience.id) for experience in experiences]
+
+
+@pytest.mark.anyio
+async def test_experiences_read_service_page_size(
+    http_client: AsyncClient,
+    auth_headers: dict,
+    db_session: Session,
+):
+    """Test service clients (administrators) may retrieve larger pages."""
+    ExperienceFactory.__session__ = db_session
+    ExperienceFactory.create_batch_sync(10)
+
+    response = await http_client.get(
+        "/api/v1/experiences/", headers=auth_headers, params={"limit": 500}
+    )
+    assert response.status_code == 422
+    assert response.json() == {
+        "detail": "The maximum number of items to retrieve is 100"
+    }
+
+    service_headers = {
+        "Authorization": f"Bearer {forge_lti_token(roles=('administrator',))}"
+    }
+    response = await http_client.get(
+        "/api/v1/experiences/", headers=service_headers, params={"limit": 500}
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 10
+
+    response = await http_client.get(
+        "/api/v1/experiences/", headers=service_headers, params={"limit": 1001}
+    )
+    assert response.status_code == 422
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize(
     "invalid_params",
@@ -714,6 +882,7 @@ async def test_experiences_read_pagination(
         {"aggregation_level": 5},
         {"structure": "Atomic"},
         {"limit": 101},
+        {"cursor": "foo"},
         {"offset": -1},
         {"iri": -1},
     ],
@@ -835,3 +1004,59 @@ async def test_experiences_read_filter_on_iri(
     # Assert the database still contains the right number of experiences
     experiences = db_session.exec(select(Experience)).all()
     assert len(experiences) == number_experiences + 1
+
+
+@pytest.mark.anyio
+async def test_experiences_read_expand_relations(
+    http_client: AsyncClient, auth_headers: dict, db_session: Session
+):
+    """Test experiences relations are only loaded when expanded, in batch."""
+    ExperienceFactory.__session__ = RelationFactory.__session__ = db_session
+    relations = RelationFactory.create_batch_sync(5)
+    relations_ids = [str(relation.id) for relation in relations]
+    db_session.expire_all()
+
+    statements = []
+    event.listen(
+        db_session.connection(),
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2]),
+    )
+
+    # Relations are not loaded by default
+    response = await http_client.get("/api/v1/experiences/", headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json()) == 10
+    assert all(set(experience) == {"id", "title"} for experience in response.json())
+    assert len(statements) == 1
+
+    db_session.expire_all()
+    statements.clear()
+    response = await http_client.get(
+        "/api/v1/experiences/",
+        params={"expand": "relations"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    experiences = response.json()
+    assert len(experiences) == 10
+    assert sorted(
+        relation["id"]
+        for experience in experiences
+        for relation in experience["relations_source"]
+    ) == sorted(relations_ids)
+    assert sorted(
+        relation["id"]
+        for experience in experiences
+        for relation in experience["relations_target"]
+    ) == sorted(relations_ids)
+    assert all(experience["iri"] for experience in experiences)
+    # Experiences, then relations of each side
+    assert len(statements) == 3
+
+    response = await http_client.get(
+        "/api/v1/experiences/",
+        params={"expand": "foo"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
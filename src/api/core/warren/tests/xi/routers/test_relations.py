@@ -10,6 +10,7 @@ from freezegun import freeze_time
 from httpx import AsyncClient
 from sqlmodel import Session, select
 
+from warren.utils import forge_lti_token
 from warren.xi.enums import RelationType
 from warren.xi.factories import (
     ExperienceFactory,
@@ -23,6 +24,9 @@ async def test_relation_auth(http_client: AsyncClient):
     """Test required authentication for relation endpoints."""
     assert (await http_client.get("/api/v1/relations/")).status_code == 401
     assert (await http_client.post("/api/v1/relations/", json={})).status_code == 401
+    assert (
+        await http_client.post("/api/v1/relations/bulk", json=[])
+    ).status_code == 401
     assert (await http_client.get("/api/v1/relations/foo")).status_code == 401
     assert (await http_client.put("/api/v1/relations/foo", json={})).status_code == 401
 
@@ -105,7 +109,9 @@ async def test_relations_read_default(
     number_relations = 200
     RelationFactory.create_batch_sync(number_relations)
 
-    relations = db_session.exec(select(Relation)).all()
+    relations = db_session.exec(
+        select(Relation).order_by(Relation.created_at, Relation.id)
+    ).all()
 
     # Retrieve relations without any query parameters
     response = await http_client.get(
@@ -158,7 +164,9 @@ async def test_relations_read_pagination(
     # Create some relations in the database
     RelationFactory.create_batch_sync(number_relations)
 
-    relations = db_session.exec(select(Relation)).all()
+    relations = db_session.exec(
+        select(Relation).order_by(Relation.created_at, Relation.id)
+    ).all()
     assert len(relations) == number_relations
 
     # Get relations with pagination
@@ -188,11 +196,82 @@ async def test_relations_read_pagination(
     assert len(relations) == number_relations
 
 
+@pytest.mark.anyio
+async def test_relations_read_cursor_pagination(
+    http_client: AsyncClient,
+    auth_headers: dict,
+    db_session: Session,
+):
+    """Test retrieving relations page by page with cursors."""
+    RelationFactory.__session__ = db_session
+
+    # Create some relations in the database
+    number_relations = 20
+    RelationFactory.create_batch_sync(number_relations)
+    relations = db_session.exec(
+        select(Relation).order_by(Relation.created_at, Relation.id)
+    ).all()
+
+    # Follow cursors until the last page
+    retrieved = []
+    requests = []
+    params: dict = {"limit": 10}
+    while True:
+        response = await http_client.get(
+            "/api/v1/relations/", headers=auth_headers, params=params
+        )
+        assert response.status_code == 200
+        requests.append(params.copy())
+        retrieved += [relation["id"] for relation in response.json()]
+        if "X-Next-Cursor" not in response.headers:
+            break
+        params["cursor"] = response.headers["X-Next-Cursor"]
+
+    # Assert all relations have been retrieved once, in order (the last full
+    # page has a cursor to an empty page)
+    assert len(requests) == 3
+    assert retrieved == [str(relation.id) for relation in relations]
+
+
+@pytest.mark.anyio
+async def test_relations_read_service_page_size(
+    http_client: AsyncClient,
+    auth_headers: dict,
+    db_session: Session,
+):
+    """Test service clients (administrators) may retrieve larger pages."""
+    RelationFactory.__session__ = db_session
+    RelationFactory.create_batch_sync(10)
+
+    response = await http_client.get(
+        "/api/v1/relations/", headers=auth_headers, params={"limit": 500}
+    )
+    assert response.status_code == 422
+    assert response.json() == {
+        "detail": "The maximum number of items to retrieve is 100"
+    }
+
+    service_headers = {
+        "Authorization": f"Bearer {forge_lti_token(roles=('administrator',))}"
+    }
+    response = await http_client.get(
+        "/api/v1/relations/", headers=service_headers, params={"limit": 500}
+    )
+    assert response.status_code == 200
+    assert len(response.json()) == 10
+
+    response = await http_client.get(
+        "/api/v1/relations/", headers=service_headers, params={"limit": 1001}
+    )
+    assert response.status_code == 422
+
+
 @pytest.mark.anyio
 @pytest.mark.parametrize(
     "invalid_params",
     [
         {"limit": 101},
+        {"cursor": "foo"},
         {"offset": -1},
         {"offset": "a"},
         {"limit": "b"},
@@ -623,6 +702,118 @@ async def test_relation_create_duplicated(
     }
 
 
+@pytest.mark.anyio
+async def test_relations_bulk_upsert_bidirectional(
+    http_client: AsyncClient, auth_headers: dict, db_session: Session
+):
+    """Test creating and updating bidirectional relations in bulk."""
+    ExperienceFactory.__session__ = db_session
+    RelationFactory.__session__ = db_session
+
+    # Create a course, its contents and an existing relation
+    course, *contents = ExperienceFactory.create_batch_sync(4)
+    existing = RelationFactory.create_sync(
+        source_id=course.id, target_id=contents[0].id, kind=RelationType.ISPARTOF
+    )
+
+    # Link the course to its contents (with a duplicate)
+    relations = [
+        {
+            "source_id": str(course.id),
+            "target_id": str(content.id),
+            "kind": RelationType.ISPARTOF,
+            "inverse_kind": RelationType.HASPART,
+        }
+        for content in [*contents, contents[1]]
+    ]
+    response = await http_client.post(
+        "/api/v1/relations/bulk", headers=auth_headers, json=relations
+    )
+    assert response.status_code == 200
+    response_data = response.json()
+
+    # Assert relations of both directions have been upserted
+    assert [
+        (relation["source_id"], relation["target_id"], relation["kind"])
+        for relation in response_data
+    ] == [
+        (str(source.id), str(target.id), kind)
+        for content in contents
+        for source, target, kind in (
+            (course, content, RelationType.ISPARTOF),
+            (content, course, RelationType.HASPART),
+        )
+    ]
+    assert response_data[0]["id"] == str(existing.id)
+    assert response_data[0]["updated_at"] > response_data[0]["created_at"]
+
+    # Assert the existing relation has not been duplicated
+    relations = db_session.exec(select(Relation)).all()
+    assert len(relations) == 6
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "invalid_data",
+    [
+        [],
+        [{}],
+        [{"source_id": str(uuid4()), "target_id": str(uuid4()), "kind": "haspart"}],
+        {
+            "source_id": str(uuid4()),
+            "target_id": str(uuid4()),
+            "kind": "haspart",
+            "inverse_kind": "ispartof",
+        },
+    ],
+)
+async def test_relations_bulk_upsert_bidirectional_invalid(
+    http_client: AsyncClient,
+    auth_headers: dict,
+    db_session: Session,
+    invalid_data: any,
+):
+    """Test upserting invalid bidirectional relations in bulk."""
+    response = await http_client.post(
+        "/api/v1/relations/bulk", headers=auth_headers, json=invalid_data
+    )
+    assert response.status_code == 422
+
+    # Assert the database is still empty
+    relations = db_session.exec(select(Relation)).all()
+    assert len(relations) == 0
+
+
+@pytest.mark.anyio
+async def test_relations_bulk_upsert_bidirectional_nonexistent(
+    http_client: AsyncClient, auth_headers: dict, db_session: Session
+):
+    """Test upserting bidirectional relations with a nonexistent experience."""
+    ExperienceFactory.__session__ = db_session
+    experience = ExperienceFactory.create_sync()
+
+    response = await http_client.post(
+        "/api/v1/relations/bulk",
+        headers=auth_headers,
+        json=[
+            {
+                "source_id": str(experience.id),
+                "target_id": str(uuid4()),
+                "kind": RelationType.ISPARTOF,
+                "inverse_kind": RelationType.HASPART,
+            }
+        ],
+    )
+    assert response.status_code == 500
+    assert response.json() == {
+        "detail": "An error occurred while upserting the relations"
+    }
+
+    # Assert no relation has been created
+    relations = db_session.exec(select(Relation)).all()
+    assert len(relations) == 0
+
+
 @pytest.mark.anyio
 async def test_relation_update(
     http_client: AsyncClient, auth_headers: dict, db_session: Session
@@ -0,0 +1,111 @@
+"""Tracing of indicators computation phases.
+
+Phases of indicators computations (cache lookup, LRS fetch, statements
+preprocessing, aggregation, merge and save) are traced as Sentry spans of the
+request transaction (if Sentry tracing is enabled) and logged at the debug
+level.
+
+The time spent in each phase during a request is summarized by the
+`Server-Timing` response header (see `ServerTimingMiddleware`), displayed by
+browsers developer tools. Phases running concurrently (_e.g._ frames computed
+concurrently) are summed, hence a phase duration may exceed the request
+duration.
+"""
+
+import inspect
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, Optional, TypeVar, cast
+
+import sentry_sdk
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from warren.conf import settings
+
+logger = logging.getLogger(__name__)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# Phases durations (in seconds) of the current request (if any)
+phases_timings: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "phases_timings", default=None
+)
+
+
+@contextmanager
+def span(phase: str, description: Optional[str] = None) -> Iterator[None]:
+    """Trace a computation phase."""
+    start = time.perf_counter()
+    with sentry_sdk.start_span(op=f"warren.{phase}", description=description):
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            logger.debug("%s (%s): %.2fms", phase, description, duration * 1000)
+            timings = phases_timings.get()
+            if timings is not None:
+                timings[phase] = timings.get(phase, 0.0) + duration
+
+
+def trace(phase: str) -> Callable[[F], F]:
+    """Decorate a (coroutine) function to trace calls as a computation phase."""
+
+    def decorator(func: F) -> F:
+        if inspect.iscoroutinefunction(func):
+
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with span(phase, func.__qualname__):
+                    return await func(*args, **kwargs)
+
+            return cast(F, async_wrapper)
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(phase, func.__qualname__):
+                return func(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    return decorator
+
+
+def get_server_timing(timings: Dict[str, float]) -> str:
+    """Format phases durations as a `Server-Timing` header value."""
+    return ", ".join(
+        f"{phase};dur={duration * 1000:.1f}" for phase, duration in timings.items()
+    )
+
+
+class ServerTimingMiddleware:
+    """Add a `Server-Timing` header to responses of traced requests."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wrap the ASGI application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Record phases durations of the request."""
+        if scope["type"] != "http" or not settings.SERVER_TIMING:
+            await self.app(scope, receive, send)
+            return
+
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
+
+        async def send_with_server_timing(message: Message) -> None:
+            if message["type"] == "http.response.start" and timings:
+                timings["total"] = time.perf_counter() - start
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", get_server_timing(timings))
+            await send(message)
+
+        token = phases_timings.set(timings)
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            phases_timings.reset(token)
@@ -2,9 +2,12 @@
 
 import datetime
 import logging
+import threading
+import time
 import uuid
+from collections import OrderedDict
 from functools import reduce
-from typing import Callable, List
+from typing import Callable, Dict, List, Optional, Tuple
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
@@ -14,6 +17,7 @@ from pydantic import ValidationError
 from typing_extensions import Annotated  # python <3.9 compat
 
 from .conf import settings
+from .metrics import LTI_TOKEN_CACHE_REQUESTS
 from .models import LTIToken, LTIUser
 
 logger = logging.getLogger(__name__)
@@ -36,8 +40,95 @@ def pipe(*functions: Callable) -> Callable:
     return reduce(lambda f, g: lambda x: g(f(x)), functions, lambda x: x)
 
 
+class LTITokenCache:
+    """A bounded cache of verified LTI tokens payloads.
+
+    Entries are evicted once the token expires (`exp` claim) or, when the cache
+    is full, least recently used first. The cache is thread-safe as synchronous
+    FastAPI dependencies run in a thread pool.
+    """
+
+    def __init__(self, maxsize: int):
+        """Instantiate an empty cache storing up to `maxsize` tokens."""
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._payloads: OrderedDict[Tuple[str, ...], LTIToken] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        """Number of cached tokens."""
+        return len(self._payloads)
+
+    @staticmethod
+    def _get_key(token: str) -> Tuple[str, ...]:
+        """Tokens are verified using the current signing key and algorithm."""
+        return (token, settings.APP_SIGNING_KEY, settings.APP_SIGNING_ALGORITHM)
+
+    def get(self, token: str) -> Optional[LTIToken]:
+        """Get the verified payload of a token, if cached and not expired."""
+        key = self._get_key(token)
+        with self._lock:
+            payload = self._payloads.get(key)
+            if payload is not None and payload.exp <= time.time():
+                del self._payloads[key]
+                payload = None
+            if payload is None:
+                self.misses += 1
+                LTI_TOKEN_CACHE_REQUESTS.labels(result="miss").inc()
+                return None
+            self._payloads.move_to_end(key)
+            self.hits += 1
+            LTI_TOKEN_CACHE_REQUESTS.labels(result="hit").inc()
+            return payload
+
+    def set(self, token: str, payload: LTIToken):
+        """Cache the verified payload of a token."""
+        if self.maxsize <= 0:
+            return
+        key = self._get_key(token)
+        with self._lock:
+            self._payloads[key] = payload
+            self._payloads.move_to_end(key)
+            while len(self._payloads) > self.maxsize:
+                self._payloads.popitem(last=False)
+
+    def clear(self):
+        """Remove all cached tokens and reset statistics."""
+        with self._lock:
+            self._payloads.clear()
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        """Ratio of token verifications served from the cache."""
+        requests = self.hits + self.misses
+        return self.hits / requests if requests else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Cache statistics."""
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+        }
+
+
+lti_token_cache = LTITokenCache(maxsize=settings.LTI_TOKEN_CACHE_SIZE)
+
+
 def get_lti_token(token: Annotated[str, Depends(oauth2_scheme)]) -> LTIToken:
-    """Get the JWT, decode its payload and verify its signature."""
+    """Get the JWT, decode its payload and verify its signature.
+
+    Verified payloads are cached until the token expires.
+    """
+    cached = lti_token_cache.get(token)
+    if cached is not None:
+        return cached
+
     try:
         payload = LTIToken.parse_obj(
             jwt.decode(
@@ -62,6 +153,7 @@ def get_lti_token(token: Annotated[str, Depends(oauth2_scheme)]) -> LTIToken:
             detail=message,
         ) from exception
 
+    lti_token_cache.set(token, payload)
     return payload
 
 
@@ -2,16 +2,149 @@
 
 import hashlib
 import logging
-from typing import List, Optional
+import operator
+from datetime import datetime
+from functools import reduce
+from typing import Any, Callable, Dict, List, Optional, Sequence, Set, Tuple
 
+import arrow
+import numpy as np
 import pandas as pd
 
 from warren.conf import settings
 from warren.models import XAPI_STATEMENT
+from warren.tracing import trace
 from warren.utils import pipe
 
 logger = logging.getLogger(__name__)
 
+UTC_DATETIME = pd.DatetimeTZDtype(tz="UTC")
+
+
+def parse_timestamps(values: Any) -> Any:
+    """Parse ISO 8601 timestamps to UTC datetimes.
+
+    Declaring the format explicitly avoids pandas format inference, that is
+    performed for each call and falls back to a slow per-element parsing for
+    mixed UTC offsets.
+    """
+    return pd.to_datetime(values, utc=True, format="ISO8601")
+
+
+def get_statement_timestamp(statement: XAPI_STATEMENT) -> Optional[datetime]:
+    """Get the timestamp of a raw statement as an aware datetime.
+
+    Returns `None` if the statement has no timestamp or if it is not a valid
+    ISO 8601 date/time.
+    """
+    timestamp = statement.get("timestamp")
+    if not isinstance(timestamp, str):
+        return None
+    try:
+        return arrow.get(timestamp).datetime
+    except ValueError:
+        return None
+
+
+# Typed columns built by the columnar normalizer, other paths have their dtype
+# inferred from extracted values
+XAPI_COLUMNS_CONVERTERS: Dict[str, Callable[[List[Any]], pd.Series]] = {
+    "timestamp": lambda values: pd.Series(parse_timestamps(values)),
+    "verb.id": lambda values: pd.Series(values, dtype="category"),
+    "object.id": lambda values: pd.Series(values, dtype="category"),
+    **{
+        path: lambda values: pd.Series(values, dtype="category")
+        for path in settings.XAPI_ACTOR_IDENTIFIER_PATHS
+    },
+}
+
+
+def hash_actor_identifier(identifier: str) -> str:
+    """Get the hexadecimal digest of an actor identifier."""
+    if settings.XAPI_ACTOR_UID_HASH == "blake2b":
+        return hashlib.blake2b(identifier.encode(), digest_size=8).hexdigest()
+    return hashlib.sha256(identifier.encode()).hexdigest()
+
+
+def get_path_keys(statement: Any, path: str) -> Optional[Tuple[str, ...]]:
+    """Get the keys leading to a dotted path value in a statement.
+
+    As keys may contain dots (_e.g._ extensions IRIs), the path cannot be
+    naively split. Returns None if the path does not exist in the statement.
+    """
+    if not isinstance(statement, dict):
+        return None
+    if path in statement:
+        return (path,)
+    index = path.find(".")
+    while index != -1:
+        key = path[:index]
+        if key in statement:
+            keys = get_path_keys(statement[key], path[index + 1 :])
+            if keys is not None:
+                return (key, *keys)
+        index = path.find(".", index + 1)
+    return None
+
+
+def extract_columns(
+    statements: List[XAPI_STATEMENT], paths: Sequence[str]
+) -> Dict[str, List[Any]]:
+    """Extract dotted `paths` values from statements in a single pass.
+
+    Paths missing from all statements are ignored and missing values are `NaN`.
+    """
+    keys: Dict[str, Tuple[str, ...]] = {path: tuple(path.split(".")) for path in paths}
+    columns: Dict[str, List[Any]] = {path: [] for path in keys}
+    found: Set[str] = set()
+    for statement in statements:
+        for path, values in columns.items():
+            path_keys = keys[path]
+            value: Any = statement
+            for depth, key in enumerate(path_keys, start=1):
+                value = value.get(key, np.nan) if type(value) is dict else np.nan
+                if value is np.nan:
+                    # Keys may contain dots: look for the actual path keys
+                    if depth < len(path_keys):
+                        actual_keys = get_path_keys(statement, path)
+                        if actual_keys is not None:
+                            keys[path] = actual_keys
+                            value = reduce(operator.getitem, actual_keys, statement)
+                            found.add(path)
+                    break
+            else:
+                found.add(path)
+            values.append(value)
+    return {path: values for path, values in columns.items() if path in found}
+
+
+def get_actor_uids(columns: Dict[str, List[Any]]) -> List[str]:
+    """Get actors uids from extracted columns (see `extract_columns`).
+
+    Uids are the same as the ones computed by
+    `StatementsTransformer.add_actor_uid_column`.
+    """
+    identifier_columns = [
+        columns[path]
+        for path in sorted(settings.XAPI_ACTOR_IDENTIFIER_PATHS.intersection(columns))
+    ]
+    if not identifier_columns:
+        raise ValueError(
+            "There is no way of identifying the agent in submitted statements."
+        )
+
+    hashes: Dict[str, str] = {}
+    uids = []
+    for values in zip(*identifier_columns):
+        identifier = "-".join(
+            "nan" if value is None else str(value) for value in values
+        )
+        uid = hashes.get(identifier)
+        if uid is None:
+            uid = hashes[identifier] = hash_actor_identifier(identifier)
+        uids.append(uid)
+    return uids
+
 
 class StatementsTransformer:
     """xAPI statements transformer.
@@ -20,21 +153,55 @@ class StatementsTransformer:
     and add an 'actor.uid' column that uniquely identifies the agent.
     It also includes a method to preprocess the statements and apply all
     the necessary transformations all at once.
+
+    Transformations do not alter their input dataframe, but they only copy
+    the dataframe structure (shallow copy) before replacing or adding a
+    column: column values are shared with the input dataframe.
     """
 
     @staticmethod
-    def normalize(statements: List[XAPI_STATEMENT]) -> pd.DataFrame:
-        """Parse LRS statements to a Pandas dataframe. All fields are columns."""
-        return pd.json_normalize(statements)
+    @trace("normalize")
+    def normalize(
+        statements: List[XAPI_STATEMENT], paths: Optional[Sequence[str]] = None
+    ) -> pd.DataFrame:
+        """Parse LRS statements to a Pandas dataframe.
+
+        If no `paths` are given, all fields are columns. Otherwise, only
+        required dotted `paths` (_e.g._ `verb.id`) are extracted in a single
+        pass over statements to build typed columns. Paths that do not lead to
+        a scalar value are normalized using `pd.json_normalize`.
+
+        Like `pd.json_normalize`, paths missing from all statements have no
+        column and missing values are `NaN`.
+        """
+        if paths is None:
+            return pd.json_normalize(statements)
+
+        columns = extract_columns(statements, paths)
+        normalized: Dict[str, pd.Series] = {}
+        for path, values in columns.items():
+            if dict in set(map(type, values)):
+                nested = pd.json_normalize(
+                    [value if isinstance(value, dict) else {} for value in values]
+                )
+                for column, series in nested.items():
+                    normalized[f"{path}.{column}"] = series
+                continue
+            converter = XAPI_COLUMNS_CONVERTERS.get(path, pd.Series)
+            normalized[path] = converter(values)
+        return pd.DataFrame(normalized, index=pd.RangeIndex(len(statements)))
 
     @staticmethod
     def to_datetime(statements: pd.DataFrame) -> pd.DataFrame:
-        """Convert statement's timestamp from string to datetime."""
-        statements = statements.copy()
-        statements["timestamp"] = pd.to_datetime(statements["timestamp"])
+        """Convert statement's timestamp from string to UTC datetime."""
+        if statements["timestamp"].dtype == UTC_DATETIME:
+            return statements
+        statements = statements.copy(deep=False)
+        statements["timestamp"] = parse_timestamps(statements["timestamp"])
         return statements
 
     @staticmethod
+    @trace("actor_uid")
     def add_actor_uid_column(statements: pd.DataFrame) -> pd.DataFrame:
         """Add a 'actor.uid' column that uniquely identifies the agent.
 
@@ -42,9 +209,13 @@ class StatementsTransformer:
         https://github.com/adlnet/xAPI-Spec/blob/master/xAPI-Data.md#details-4. This
         function handles the 4 cases and creates a `uid` column that can be used later
         without worrying about the 4 IFIs.
+
+        Identifier columns are concatenated column-wise (in alphabetical order)
+        and only distinct identifiers are hashed, using the `XAPI_ACTOR_UID_HASH`
+        algorithm.
         """
-        statements = statements.copy()
-        xapi_actor_identifier_columns = (
+        statements = statements.copy(deep=False)
+        xapi_actor_identifier_columns = sorted(
             settings.XAPI_ACTOR_IDENTIFIER_PATHS.intersection(statements.columns)
         )
 
@@ -53,27 +224,34 @@ class StatementsTransformer:
                 "There is no way of identifying the agent in submitted statements."
             )
 
-        def get_uid(row):
-            return hashlib.sha256(
-                "-".join(
-                    str(row[col]) for col in xapi_actor_identifier_columns
-                ).encode()
-            ).hexdigest()
-
-        statements["actor.uid"] = statements.apply(get_uid, axis=1)
+        identifiers = reduce(
+            lambda x, y: x + "-" + y,
+            (statements[col].astype(str) for col in xapi_actor_identifier_columns),
+        )
+        codes, uniques = pd.factorize(identifiers)
+        uids = np.array([hash_actor_identifier(uid) for uid in uniques], dtype=object)
+        statements["actor.uid"] = uids[codes]
         return statements
 
     @staticmethod
     def preprocess(
         statements: Optional[List[XAPI_STATEMENT]] = None,
+        paths: Optional[Sequence[str]] = None,
     ) -> Optional[pd.DataFrame]:
-        """Normalize raw statements, and add utility columns."""
+        """Normalize raw statements, and add utility columns.
+
+        If `paths` are given, only those paths and actor identifiers are
+        extracted from statements (see `StatementsTransformer.normalize`).
+        """
         if statements is None or not len(statements):
             logger.info("There are no statements to process")
             return None
 
+        if paths is not None:
+            paths = [*paths, *sorted(settings.XAPI_ACTOR_IDENTIFIER_PATHS)]
+
         return pipe(
-            StatementsTransformer.normalize,
+            lambda statements: StatementsTransformer.normalize(statements, paths),
             StatementsTransformer.add_actor_uid_column,
             StatementsTransformer.to_datetime,
         )(statements)
@@ -4,8 +4,9 @@ import json
 import logging
 from abc import ABC, abstractmethod
 from http import HTTPStatus
+from itertools import islice
 from pathlib import PurePath
-from typing import List, Optional, Protocol, Tuple, Union
+from typing import Dict, Iterable, List, Optional, Protocol, Tuple, Union
 from urllib.parse import quote_plus
 from uuid import UUID
 
@@ -21,6 +22,7 @@ from .enums import (
     RelationType,
 )
 from .models import (
+    BidirectionalRelationCreate,
     ExperienceCreate,
     ExperienceRead,
     ExperienceReadSnapshot,
@@ -165,6 +167,30 @@ class CRUDExperience(BaseCRUD):
 
         return await self.update(db_experience.id, ExperienceUpdate(**data.dict()))
 
+    async def bulk_upsert(
+        self, data: Iterable[ExperienceCreate], batch_size: Optional[int] = None
+    ) -> Dict[IRI, UUID]:
+        """Create or update experiences depending on their existence (by IRI).
+
+        Experiences are sent by batches of `batch_size` experiences (defaults to
+        the `XI_BULK_MAX_SIZE` setting), each batch is upserted in a single
+        request.
+
+        Returns:
+            Dict[IRI, UUID]: The ids of the upserted experiences, keyed by IRI.
+        """
+        batch_size = batch_size or settings.XI_BULK_MAX_SIZE
+        experiences = iter(data)
+        ids: Dict[IRI, UUID] = {}
+        while batch := list(islice(experiences, batch_size)):
+            response = await self._client.post(
+                url=self._construct_url("bulk"),
+                json=[json.loads(experience.json()) for experience in batch],
+            )
+            response.raise_for_status()
+            ids.update(parse_obj_as(Dict[IRI, UUID], response.json()))
+        return ids
+
 
 class CRUDRelation(BaseCRUD):
     """Handle asynchronous CRUD operations on relations."""
@@ -249,6 +275,29 @@ class CRUDRelation(BaseCRUD):
 
         return relation, inverted_relation
 
+    async def bulk_upsert_bidirectional(
+        self,
+        data: Iterable[BidirectionalRelationCreate],
+        batch_size: Optional[int] = None,
+    ) -> List[RelationRead]:
+        """Create or update relations and their inverse relations.
+
+        Relations are sent by batches of `batch_size` relations (defaults to the
+        `XI_BULK_MAX_SIZE` setting), each batch is upserted (in both directions)
+        in a single request.
+        """
+        batch_size = batch_size or settings.XI_BULK_MAX_SIZE
+        relations = iter(data)
+        upserted: List[RelationRead] = []
+        while batch := list(islice(relations, batch_size)):
+            response = await self._client.post(
+                url=self._construct_url("bulk"),
+                json=[json.loads(relation.json()) for relation in batch],
+            )
+            response.raise_for_status()
+            upserted += parse_obj_as(List[RelationRead], response.json())
+        return upserted
+
 
 class ExperienceIndex(Client):
     """A client to interact with the Experience Index.
@@ -1,13 +1,107 @@
 """Experience Index API filters."""
 
-from fastapi import Query
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional, Sequence, Tuple, Type, TypeVar, Union
+from uuid import UUID
+
+from fastapi import Depends, HTTPException, Query, Response, status
+from lti_toolbox.launch_params import LTIRole
 from pydantic import BaseModel
+from sqlalchemy import tuple_
+from sqlmodel.sql.expression import SelectOfScalar
+from typing_extensions import Annotated  # python <3.9 compat
+
+from warren.conf import settings
+from warren.models import LTIToken
+from warren.utils import get_lti_token
+
+from .schema import Experience, Relation
+
+T = TypeVar("T")
 
 
 class Pagination(BaseModel):
-    """Common query filters used for pagination."""
+    """Common query filters used for pagination.
+
+    Pages may be requested with an `offset`, or with the `cursor` returned in
+    the `X-Next-Cursor` header of the previous page response (keyset
+    pagination): the cost of retrieving a page does not depend on its depth.
+    """
 
     offset: int = Query(default=0, ge=0, description="The number of items to offset")
     limit: int = Query(
-        default=100, le=100, description="The maximum number of items to retrieve"
+        default=100, ge=0, description="The maximum number of items to retrieve"
+    )
+    cursor: Optional[str] = Query(
+        default=None,
+        description=(
+            "The cursor of the page to retrieve (`X-Next-Cursor` header of the "
+            "previous page)"
+        ),
+    )
+
+
+def get_pagination(
+    pagination: Annotated[Pagination, Depends()],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+) -> Pagination:
+    """Check the page size, service clients (administrators) may get larger pages."""
+    max_limit = (
+        settings.XI_SERVICE_MAX_PAGE_SIZE
+        if LTIRole.ADMINISTRATOR in token.roles
+        else settings.XI_MAX_PAGE_SIZE
     )
+    if pagination.limit > max_limit:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"The maximum number of items to retrieve is {max_limit}",
+        )
+    return pagination
+
+
+def encode_cursor(item: Union[Experience, Relation]) -> str:
+    """Get the opaque cursor of the page following `item`."""
+    key = [item.created_at.isoformat(), str(item.id)]
+    return base64.urlsafe_b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Get the key of the last item of the previous page from a cursor."""
+    try:
+        created_at, id_ = json.loads(base64.urlsafe_b64decode(cursor))
+        return datetime.fromisoformat(created_at), UUID(id_)
+    except (binascii.Error, TypeError, ValueError) as exception:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail="Invalid cursor"
+        ) from exception
+
+
+def paginate(
+    statement: SelectOfScalar[T],
+    model: Union[Type[Experience], Type[Relation]],
+    pagination: Pagination,
+) -> SelectOfScalar[T]:
+    """Select a page of items, ordered by creation date (and id)."""
+    key = (model.created_at, model.id)
+    if pagination.cursor is not None:
+        statement = statement.where(
+            tuple_(*key) > tuple_(*decode_cursor(pagination.cursor))  # type: ignore[arg-type]
+        )
+    return (
+        statement.order_by(*key)  # type: ignore[arg-type]
+        .offset(pagination.offset)
+        .limit(pagination.limit)
+    )
+
+
+def set_next_cursor(
+    response: Response,
+    items: Sequence[Union[Experience, Relation]],
+    pagination: Pagination,
+):
+    """Set the `X-Next-Cursor` header if there may be a next page."""
+    if pagination.limit and len(items) == pagination.limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(items[-1])
@@ -2,17 +2,19 @@
 
 import logging
 import re
-from itertools import chain
-from typing import Iterator, List
+from itertools import chain, islice
+from typing import Any, Awaitable, Callable, Iterable, Iterator, List
 
 from httpx import HTTPError
 from pydantic import ValidationError
 
+from warren.conf import settings
 from warren.fields import IRI
 
 from ...client import ExperienceIndex
 from ...enums import RelationType
 from ...models import (
+    BidirectionalRelationCreate,
     ExperienceCreate,
     ExperienceRead,
 )
@@ -23,6 +25,35 @@ from .models import Course, Section
 logger = logging.getLogger(__name__)
 
 
+async def load_by_batches(
+    data: Iterable[ExperienceCreate],
+    load: Callable[[List[ExperienceCreate]], Awaitable[Any]],
+    ignore_errors: bool,
+) -> None:
+    """Load experiences by batches of `XI_BULK_MAX_SIZE` experiences.
+
+    If a batch cannot be loaded and errors are ignored, its experiences are
+    loaded one by one so that only the failing ones are skipped.
+    """
+    experiences = iter(data)
+    while batch := list(islice(experiences, settings.XI_BULK_MAX_SIZE)):
+        try:
+            await load(batch)
+        except HTTPError as err:
+            if not ignore_errors:
+                raise err
+            logger.warning(
+                "Error occurred, loading %d experiences one by one", len(batch)
+            )
+            for experience in batch:
+                try:
+                    await load([experience])
+                except HTTPError:
+                    logger.exception(
+                        "Error occurred, skipping experience %s", experience.iri
+                    )
+
+
 class Courses(ETL[Course, ExperienceCreate], ETLRunnerMixin):
     """Index Moodle courses.
 
@@ -59,16 +90,10 @@ class Courses(ETL[Course, ExperienceCreate], ETLRunnerMixin):
                 pass
 
     async def _load(self, data: Iterator[ExperienceCreate]) -> None:
-        """Load experiences into the Experience Index (XI)."""
-        for experience in data:
-            try:
-                await self._xi.experience.create_or_update(experience)
-            except HTTPError as err:
-                if not self._ignore_errors:
-                    raise err
-                logger.exception(
-                    "Error occurred, skipping experience %s", experience.iri
-                )
+        """Load experiences into the Experience Index (XI) by batches."""
+        await load_by_batches(
+            data, self._xi.experience.bulk_upsert, self._ignore_errors
+        )
 
 
 class CourseContent(ETL[Section, ExperienceCreate], ETLRunnerMixin):
@@ -130,21 +155,22 @@ class CourseContent(ETL[Section, ExperienceCreate], ETLRunnerMixin):
                 logger.exception("Skipping invalid module %s", module.id)
                 pass
 
+    async def _load_batch(self, batch: List[ExperienceCreate]) -> None:
+        """Upsert a batch of experiences and their relations with the course."""
+        ids = await self._xi.experience.bulk_upsert(batch)
+        await self._xi.relation.bulk_upsert_bidirectional(
+            BidirectionalRelationCreate(
+                source_id=self._course.id,
+                target_id=content_id,
+                kind=RelationType.ISPARTOF,
+                inverse_kind=RelationType.HASPART,
+            )
+            for content_id in ids.values()
+        )
+
     async def _load(self, data: Iterator[ExperienceCreate]) -> None:
-        """Load experiences into the Experience Index (XI) and create relations."""
-        for experience in data:
-            try:
-                content: ExperienceRead = await self._xi.experience.create_or_update(
-                    experience
-                )
-                await self._xi.relation.create_bidirectional(
-                    self._course.id,
-                    content.id,
-                    (RelationType.ISPARTOF, RelationType.HASPART),
-                )
-            except HTTPError as err:
-                if not self._ignore_errors:
-                    raise err
-                logger.exception(
-                    "Error occurred, skipping experience %s", experience.iri
-                )
+        """Load experiences into the Experience Index (XI) and create relations.
+
+        Experiences and their relations with the course are upserted by batches.
+        """
+        await load_by_batches(data, self._load_batch, self._ignore_errors)
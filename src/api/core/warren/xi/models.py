@@ -28,6 +28,12 @@ class RelationCreate(BaseModel):
     kind: RelationType
 
 
+class BidirectionalRelationCreate(RelationCreate):
+    """Model for creating a relation and its inverse relation."""
+
+    inverse_kind: RelationType
+
+
 class RelationUpdate(BaseModel):
     """Model for updating a relation."""
 
@@ -1,22 +1,25 @@
 """Experience Index API Experiences router."""
 
 import logging
-from typing import List, Optional
+from typing import Dict, List, Literal, Optional, Union
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
 from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload
 from sqlmodel import Session, select
 from typing_extensions import Annotated  # python <3.9 compat
 
+from warren.conf import settings
 from warren.db import get_session
 from warren.fields import IRI
 from warren.models import LTIToken
 from warren.utils import get_lti_token
 
 from ..enums import AggregationLevel, Structure
-from ..filters import Pagination
+from ..filters import Pagination, get_pagination, paginate, set_next_cursor
 from ..models import (
     ExperienceCreate,
     ExperienceRead,
@@ -32,32 +35,51 @@ router = APIRouter(
 logger = logging.getLogger(__name__)
 
 
-@router.get("/", response_model=List[ExperienceReadSnapshot])
+# Experience relations are loaded in a single query per relationship
+RELATIONS_LOADING_OPTIONS = (
+    selectinload(Experience.relations_source),  # type: ignore[arg-type]
+    selectinload(Experience.relations_target),  # type: ignore[arg-type]
+)
+
+
+@router.get(
+    "/", response_model=Union[List[ExperienceRead], List[ExperienceReadSnapshot]]
+)
 async def read_experiences(  # noqa: PLR0913
-    pagination: Annotated[Pagination, Depends()],
+    pagination: Annotated[Pagination, Depends(get_pagination)],
     token: Annotated[LTIToken, Depends(get_lti_token)],
+    response: Response,
     session: Session = Depends(get_session),
     structure: Optional[Structure] = None,
     aggregation_level: Optional[AggregationLevel] = None,
     technical_datatypes: Optional[list[str]] = None,
     iri: Optional[IRI] = None,
+    expand: Optional[Literal["relations"]] = None,
 ):
     """Retrieve a list of experiences based on query parameters.
 
     Args:
-        pagination (Pagination): The filters for pagination (offset and limit).
+        pagination (Pagination): The filters for pagination (offset or cursor,
+            and limit).
         token (LTIToken): The LTI token used to authenticate user.
+        response (Response): The response, with the cursor of the next page
+            (if any) in its `X-Next-Cursor` header.
         session (Session, optional): The database session.
         structure (Structure, optional): Filter by experience structure.
         aggregation_level (AggregationLevel, optional): Filter by aggregation level.
         technical_datatypes (list, optional): Filter by mime type.
         iri (IRI, optional): Filter by iri.
+        expand (str, optional): Set to `relations` to retrieve detailed
+            information about experiences, including their relations.
 
     Returns:
-        List[ExperienceReadSnapshot]: List of experiences matching the query.
+        List[ExperienceReadSnapshot]: List of experiences matching the query, or
+            List[ExperienceRead] if relations are expanded.
     """
     logger.debug("Reading experiences")
     statement = select(Experience)
+    if expand == "relations":
+        statement = statement.options(*RELATIONS_LOADING_OPTIONS)
     # todo - discuss of a more 'factorized' approach of passing query params
 
     if structure:
@@ -71,12 +93,16 @@ async def read_experiences(  # noqa: PLR0913
             Experience.technical_datatypes.comparator.contains(technical_datatypes)  # type: ignore[union-attr]
         )
 
-    experiences = session.exec(
-        statement.offset(pagination.offset).limit(pagination.limit)
-    ).all()
+    experiences = session.exec(paginate(statement, Experience, pagination)).all()
+    set_next_cursor(response, experiences, pagination)
 
     logger.debug("Results = %s", experiences)
-    return experiences
+    if expand == "relations":
+        return [ExperienceRead.from_orm(experience) for experience in experiences]
+    return [
+        ExperienceReadSnapshot(id=experience.id, title=experience.title)
+        for experience in experiences
+    ]
 
 
 @router.post("/", response_model=UUID)
@@ -121,6 +147,69 @@ async def create_experience(
     return db_experience.id
 
 
+@router.post("/bulk", response_model=Dict[str, UUID])
+async def bulk_upsert_experiences(
+    experiences: Annotated[
+        List[ExperienceCreate],
+        Body(min_items=1, max_items=settings.XI_BULK_MAX_SIZE),
+    ],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    session: Session = Depends(get_session),
+):
+    """Create or update experiences given their IRI.
+
+    Experiences are upserted in a single query: existing experiences (with the
+    same IRI) are updated, others are created. If an IRI is given more than
+    once, the last experience wins.
+
+    Args:
+        experiences (List[ExperienceCreate]): The data of the experiences to create
+            or update.
+        token (LTIToken): The LTI token used to authenticate user.
+        session (Session, optional): The database session.
+
+    Returns:
+        Dict[str, UUID]: The ids of the upserted experiences, keyed by IRI.
+    """
+    logger.debug("Upserting %d experiences", len(experiences))
+    try:
+        values = {
+            experience.iri: Experience.model_validate(experience).model_dump()
+            for experience in experiences
+        }
+    except ValidationError as exception:
+        message = "An error occurred while validating the experiences"
+        logger.debug("%s. Exception:", message, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=message
+        ) from exception
+
+    statement = insert(Experience).values(list(values.values()))
+    statement = statement.on_conflict_do_update(
+        index_elements=[Experience.iri],
+        set_={
+            column.name: column
+            for column in statement.excluded
+            if column.name not in ("id", "created_at")
+        },
+    )
+    statement = statement.returning(Experience.iri, Experience.id)  # type: ignore[call-overload]
+
+    try:
+        ids = dict(session.execute(statement).tuples().all())
+        session.commit()
+    except IntegrityError as exception:
+        session.rollback()
+        message = "An error occurred while upserting the experiences"
+        logger.debug("%s. Exception:", message, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=message
+        ) from exception
+
+    logger.debug("Result = %s", ids)
+    return ids
+
+
 @router.put("/{experience_id}", response_model=ExperienceRead)
 async def update_experience(
     experience_id: UUID,
@@ -187,7 +276,9 @@ async def read_experience(
         ExperienceRead: Detailed information about the requested experience.
     """
     logger.debug("Reading the experience")
-    experience = session.get(Experience, experience_id)
+    experience = session.get(
+        Experience, experience_id, options=RELATIONS_LOADING_OPTIONS
+    )
     if not experience:
         message = "Experience not found"
         logger.debug("%s: %s", message, experience_id)
@@ -4,19 +4,22 @@ import logging
 from typing import List, Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Response, status
 from pydantic import ValidationError
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 from typing_extensions import Annotated  # python <3.9 compat
 
+from warren.conf import settings
 from warren.db import get_session
 from warren.models import LTIToken
 from warren.utils import get_lti_token
 
 from ..enums import RelationType
-from ..filters import Pagination
+from ..filters import Pagination, get_pagination, paginate, set_next_cursor
 from ..models import (
+    BidirectionalRelationCreate,
     RelationCreate,
     RelationRead,
     RelationUpdate,
@@ -32,8 +35,9 @@ logger = logging.getLogger(__name__)
 
 @router.get("/", response_model=List[RelationRead])
 async def read_relations(  # noqa: PLR0913
-    pagination: Annotated[Pagination, Depends()],
+    pagination: Annotated[Pagination, Depends(get_pagination)],
     token: Annotated[LTIToken, Depends(get_lti_token)],
+    response: Response,
     session: Session = Depends(get_session),
     source: Optional[UUID] = None,
     target: Optional[UUID] = None,
@@ -42,8 +46,11 @@ async def read_relations(  # noqa: PLR0913
     """Retrieve a list of relations based on query parameters.
 
     Args:
-        pagination (Pagination): The filters for pagination (offset and limit).
+        pagination (Pagination): The filters for pagination (offset or cursor,
+            and limit).
         token (LTIToken): The LTI token used to authenticate user.
+        response (Response): The response, with the cursor of the next page
+            (if any) in its `X-Next-Cursor` header.
         session (Session, optional): The database session.
         source (UUID, optional): Filter relations having experience ID as source.
         target (UUID, optional): Filter relations having experience ID as target.
@@ -62,9 +69,8 @@ async def read_relations(  # noqa: PLR0913
     if kind:
         statement = statement.where(Relation.kind == kind)
 
-    relations = session.exec(
-        statement.offset(pagination.offset).limit(pagination.limit)
-    ).all()
+    relations = session.exec(paginate(statement, Relation, pagination)).all()
+    set_next_cursor(response, relations, pagination)
 
     logger.debug("Results = %s", relations)
     return relations
@@ -112,6 +118,71 @@ async def create_relation(
     return db_relation.id
 
 
+@router.post("/bulk", response_model=List[RelationRead])
+async def bulk_upsert_bidirectional_relations(
+    relations: Annotated[
+        List[BidirectionalRelationCreate],
+        Body(min_items=1, max_items=settings.XI_BULK_MAX_SIZE),
+    ],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    session: Session = Depends(get_session),
+):
+    """Create or update relations and their inverse relations.
+
+    Relations of both directions are upserted in a single query: existing
+    relations (with the same source, target and kind) are updated, others are
+    created.
+
+    Args:
+        relations (List[BidirectionalRelationCreate]): The data of the relations
+            to create or update, with the kind of their inverse relation.
+        token (LTIToken): The LTI token used to authenticate user.
+        session (Session, optional): The database session.
+
+    Returns:
+        List[RelationRead]: The upserted relations.
+    """
+    logger.debug("Upserting %d bidirectional relations", len(relations))
+    try:
+        values = {}
+        for relation in relations:
+            for source_id, target_id, kind in (
+                (relation.source_id, relation.target_id, relation.kind),
+                (relation.target_id, relation.source_id, relation.inverse_kind),
+            ):
+                db_relation = Relation.model_validate(
+                    RelationCreate(source_id=source_id, target_id=target_id, kind=kind)
+                )
+                values[(source_id, target_id, kind)] = db_relation.model_dump()
+    except ValidationError as exception:
+        message = "An error occurred while validating the relations"
+        logger.debug("%s. Exception:", message, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY, detail=message
+        ) from exception
+
+    statement = insert(Relation).values(list(values.values()))
+    upsert = statement.on_conflict_do_update(
+        index_elements=["source_id", "target_id", "kind"],
+        set_={"updated_at": statement.excluded.updated_at},
+    )
+    columns = Relation.__table__.columns  # type: ignore[attr-defined]
+
+    try:
+        db_relations = session.execute(upsert.returning(*columns)).mappings().all()
+        session.commit()
+    except IntegrityError as exception:
+        session.rollback()
+        message = "An error occurred while upserting the relations"
+        logger.debug("%s. Exception:", message, exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=message
+        ) from exception
+
+    logger.debug("Result = %s", db_relations)
+    return db_relations
+
+
 @router.put("/{relation_id}", response_model=RelationRead)
 async def update_relation(
     relation_id: UUID,
@@ -5,7 +5,7 @@ from typing import List, Optional, Tuple, Union
 from uuid import UUID, uuid4
 
 from pydantic import Json, PositiveInt
-from sqlalchemy import CheckConstraint, Column, Constraint, UniqueConstraint
+from sqlalchemy import CheckConstraint, Column, Constraint, Index, UniqueConstraint
 from sqlalchemy import Enum as SAEnum
 from sqlalchemy.types import JSON, DateTime
 from sqlmodel import Field, Relationship, SQLModel
@@ -24,7 +24,7 @@ class BaseTimestamp(SQLModel):  # type: ignore[misc]
     time whenever the record is modified.
     """
 
-    __table_args__: Tuple[Constraint, ...] = (
+    __table_args__: Tuple[Union[Constraint, Index], ...] = (
         CheckConstraint("created_at <= updated_at", name="pre-creation-update"),
     )
     created_at: datetime = Field(
@@ -48,6 +48,8 @@ class Relation(BaseTimestamp, table=True):  # type: ignore[call-arg, misc]
         *BaseTimestamp.__table_args__,
         UniqueConstraint("source_id", "target_id", "kind"),
         CheckConstraint("source_id != target_id", name="no-self-referential"),
+        # Keyset pagination
+        Index("ix_relation_created_at_id", "created_at", "id"),
     )
     id: Optional[UUID] = Field(default_factory=lambda: uuid4().hex, primary_key=True)
     source_id: UUID = Field(
@@ -85,6 +87,8 @@ class Experience(BaseTimestamp, table=True):  # type: ignore[call-arg, misc]
         *BaseTimestamp.__table_args__,
         UniqueConstraint("iri"),
         CheckConstraint("duration > 0", name="positive-duration"),
+        # Keyset pagination
+        Index("ix_experience_created_at_id", "created_at", "id"),
     )
     id: Optional[UUID] = Field(default_factory=lambda: uuid4().hex, primary_key=True)
     iri: IRI = Field(
@@ -126,20 +130,14 @@ class Experience(BaseTimestamp, table=True):  # type: ignore[call-arg, misc]
         )
     )
     relations_source: Optional[List[Relation]] = Relationship(
-        link_model=Relation,
         sa_relationship_kwargs={
-            "lazy": "immediate",
             "primaryjoin": "Experience.id==Relation.source_id",
-            "secondaryjoin": "Experience.id==Relation.target_id",
             "viewonly": True,
         },
     )
     relations_target: Optional[List[Relation]] = Relationship(
-        link_model=Relation,
         sa_relationship_kwargs={
-            "lazy": "immediate",
             "primaryjoin": "Experience.id==Relation.target_id",
-            "secondaryjoin": "Experience.id==Relation.source_id",
             "viewonly": True,
         },
     )
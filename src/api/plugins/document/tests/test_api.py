@@ -269,3 +269,71 @@ async def test_unique_downloads_backend_query(
     }
 
     assert response.json() == expected_document_downloads
+
+
+@pytest.mark.anyio
+async def test_batch_downloads(
+    http_client: httpx.AsyncClient,
+    httpx_mock: HTTPXMock,
+    auth_headers: dict,
+    db_session,
+):
+    """Test the document batch downloads endpoint."""
+    document_ids = ["uuid://foo", "uuid://bar"]
+
+    def lrs_response(request: httpx.Request):
+        """Return a download for the first document only."""
+        params = urllib.parse.parse_qs(request.url.query)
+        statements = []
+        if params.get(b"activity")[0].decode() == document_ids[0]:
+            statements = [
+                json.loads(
+                    LMSDownloadedDocumentFactory.build(
+                        [
+                            {"object": {"id": document_ids[0]}},
+                            {"timestamp": params.get(b"since")[0].decode()},
+                        ]
+                    ).json()
+                )
+            ]
+        return httpx.Response(status_code=200, json={"statements": statements})
+
+    lrs_client.base_url = "http://fake-lrs.com"
+    httpx_mock.add_callback(
+        callback=lrs_response,
+        url=re.compile(r"^http://fake-lrs\.com/xAPI/statements\?.*$"),
+        method="GET",
+    )
+
+    response = await http_client.post(
+        url="/api/v1/document/downloads",
+        params={"since": "2020-01-01", "until": "2020-01-01"},
+        json=document_ids,
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        document_ids[0]: {"total": 1, "counts": [{"date": "2020-01-01", "count": 1}]},
+        document_ids[1]: {"total": 0, "counts": [{"date": "2020-01-01", "count": 0}]},
+    }
+    assert len(httpx_mock.get_requests()) == 2
+
+    # Duplicated documents are computed (and returned) once
+    response = await http_client.post(
+        url="/api/v1/document/downloads",
+        params={"since": "2020-01-01", "until": "2020-01-02", "unique": True},
+        json=[document_ids[1], document_ids[1]],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert list(response.json()) == [document_ids[1]]
+    assert len(httpx_mock.get_requests()) == 4
+
+    response = await http_client.post(
+        url="/api/v1/document/downloads",
+        params={"since": "2020-01-01", "until": "2020-01-01"},
+        json=[],
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
@@ -1,13 +1,20 @@
 """Warren API v1 document router."""
 
 import logging
+from typing import Dict, List, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, Response, status
 from typing_extensions import Annotated  # python <3.9 compat
+from warren.conf import settings
 from warren.exceptions import LrsClientException
 from warren.fields import IRI
-from warren.filters import BaseQueryFilters, DatetimeRange
-from warren.models import DailyCounts, DailyUniqueCounts, LTIToken
+from warren.filters import DatetimeRange, GranularityQueryFilters
+from warren.indicators import IncrementalCacheMixin
+from warren.indicators.admission import set_current_tenant
+from warren.indicators.http import check_not_modified, set_cache_headers
+from warren.indicators.jobs import submit_job
+from warren.indicators.models import JobRead
+from warren.models import DailyCounts, DailyUniqueCounts, HourlyCounts, LTIToken
 from warren.utils import get_lti_token
 
 from .indicators import (
@@ -17,29 +24,89 @@ from .indicators import (
 
 router = APIRouter(
     prefix="/document",
+    dependencies=[Depends(set_current_tenant)],
 )
 
 logger = logging.getLogger(__name__)
 
 
+@router.post("/downloads")
+async def batch_downloads(  # noqa: PLR0913
+    document_ids: Annotated[
+        List[IRI], Body(min_items=1, max_items=settings.INDICATORS_BATCH_MAX_SIZE)
+    ],
+    filters: Annotated[GranularityQueryFilters, Depends()],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    request: Request,
+    response: Response,
+    unique: bool = False,
+) -> Dict[str, Union[DailyCounts, HourlyCounts]]:
+    """Number of downloads for each of `document_ids` in the date range."""
+    # Identical documents are computed (and returned) once
+    document_ids = list(dict.fromkeys(document_ids))
+    logger.debug(
+        "Start computing 'downloads' indicator for %d documents", len(document_ids)
+    )
+    span_range = DatetimeRange.parse_obj(filters)
+    indicator_klass = DailyUniqueDownloads if unique else DailyDownloads
+    indicators = [
+        indicator_klass(
+            object_id=document_id,
+            span_range=span_range,
+            granularity=filters.granularity,
+        )
+        for document_id in document_ids
+    ]
+
+    await check_not_modified(request, indicators)
+
+    try:
+        results = await IncrementalCacheMixin.get_or_compute_many(indicators)
+    except (KeyError, AttributeError, LrsClientException) as exception:
+        message = "An error occurred while computing the number of downloads"
+        logger.exception("%s. Exception:", message)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=message
+        ) from exception
+
+    logger.debug(
+        "Finish computing 'downloads' indicator for %d documents", len(document_ids)
+    )
+    await set_cache_headers(response, indicators)
+    return {
+        document_id: (
+            result.to_daily_counts()
+            if isinstance(result, DailyUniqueCounts)
+            else result
+        )
+        for document_id, result in zip(document_ids, results)
+    }
+
+
 @router.get("/{document_id:path}/downloads")
-async def downloads(
+async def downloads(  # noqa: PLR0913
     document_id: IRI,
-    filters: Annotated[BaseQueryFilters, Depends()],
+    filters: Annotated[GranularityQueryFilters, Depends()],
     token: Annotated[LTIToken, Depends(get_lti_token)],
+    request: Request,
+    response: Response,
     unique: bool = False,
-) -> DailyCounts:
+) -> Union[DailyCounts, HourlyCounts]:
     """Number of downloads for `document_id` in the `since` -> `until` date range."""
     logger.debug("Start computing 'downloads' indicator")
     indicator_klass = DailyUniqueDownloads if unique else DailyDownloads
     indicator = indicator_klass(
-        object_id=document_id, span_range=DatetimeRange.parse_obj(filters)
+        object_id=document_id,
+        span_range=DatetimeRange.parse_obj(filters),
+        granularity=filters.granularity,
     )
     logger.debug("Will compute indicator %s", type(indicator).__name__)
     logger.debug(
         "From %s to %s", indicator.span_range.since, indicator.span_range.until
     )
 
+    await check_not_modified(request, [indicator])
+
     try:
         results = await indicator.get_or_compute()
     except (KeyError, AttributeError, LrsClientException) as exception:
@@ -53,4 +120,25 @@ async def downloads(
         results = results.to_daily_counts()
     logger.debug("Results = %s", results)
     logger.debug("Finish computing 'downloads' indicator")
+    await set_cache_headers(response, [indicator])
     return results
+
+
+@router.post("/{document_id:path}/downloads/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def downloads_job(
+    document_id: IRI,
+    filters: Annotated[GranularityQueryFilters, Depends()],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    unique: bool = False,
+) -> JobRead:
+    """Submit a job computing the number of downloads for `document_id`.
+
+    The job status and result are available from the `/jobs` endpoints.
+    """
+    indicator_klass = DailyUniqueDownloads if unique else DailyDownloads
+    indicator = indicator_klass(
+        object_id=document_id,
+        span_range=DatetimeRange.parse_obj(filters),
+        granularity=filters.granularity,
+    )
+    return await submit_job(indicator, token)
@@ -1,17 +1,27 @@
 """Tests for the activity API endpoints."""
 
 import re
-from unittest.mock import patch
+from unittest.mock import AsyncMock, patch
 
 import httpx
 import pytest
 from pytest_httpx import HTTPXMock
 from warren.backends import lrs_client
-from warren.models import DailyCounts, DailyUniqueCount, DailyUniqueCounts
+from warren.exceptions import LrsClientException
+from warren.filters import DatetimeRange
+from warren.indicators.models import CacheEntry
+from warren.models import (
+    ActivityCount,
+    DailyCounts,
+    DailyUniqueCount,
+    DailyUniqueCounts,
+)
 from warren.utils import forge_lti_token
 from warren_moodle.indicators import (
     CourseDailyUniqueViews,
     CourseDailyViews,
+    CourseTopUniqueViews,
+    CourseTopViews,
     DailyUniqueViews,
     DailyViews,
 )
@@ -434,3 +444,150 @@ async def test_course_views_daily_unique_views_with_modname(
 
     # Ensure the method was called correctly
     mock_get_or_compute.assert_called_once()
+
+
+@pytest.mark.anyio
+async def test_course_views_cached_results(
+    http_client: httpx.AsyncClient, auth_headers: dict, db_session
+):
+    """Test the course views endpoint returns cached results as is."""
+    course_id = "uuid://c16e5e8e-d0c3-47a8-81b6-0d8fb971d2e0"
+    token = forge_lti_token(course_id=course_id)
+    indicator = CourseDailyViews(
+        course_id=course_id,
+        span_range=DatetimeRange(since="2023-01-01", until="2023-01-03"),
+        modname=None,
+    )
+    cached = [
+        {
+            "iri": "uuid://activity1",
+            "modname": "mod_forum",
+            "views": {"total": 1, "counts": [{"date": "2023-01-01", "count": 1}]},
+        }
+    ]
+    db_session.add(CacheEntry(key=indicator.cache_key, value=cached))
+    db_session.commit()
+
+    with patch.object(CourseDailyViews, "get_or_compute") as mock_get_or_compute:
+        response = await http_client.get(
+            "/api/v1/moodle/views",
+            params={"since": "2023-01-01", "until": "2023-01-03"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == cached
+    mock_get_or_compute.assert_not_called()
+
+    # Cached results have not been modified
+    etag = response.headers["ETag"]
+    with patch.object(CourseDailyViews, "get_or_compute_json") as mock_get_json:
+        response = await http_client.get(
+            "/api/v1/moodle/views",
+            params={"since": "2023-01-01", "until": "2023-01-03"},
+            headers={"Authorization": f"Bearer {token}", "If-None-Match": etag},
+        )
+
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+    mock_get_json.assert_not_called()
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize(
+    "unique,indicator_klass,views_klass",
+    [
+        (False, CourseTopViews, DailyViews),
+        (True, CourseTopUniqueViews, DailyUniqueViews),
+    ],
+)
+async def test_course_top_views(
+    http_client: httpx.AsyncClient,
+    monkeypatch,
+    unique,
+    indicator_klass,
+    views_klass,
+):
+    """Test the course top views endpoint."""
+    token = forge_lti_token(course_id="uuid://c16e5e8e-d0c3-47a8-81b6-0d8fb971d2e0")
+    span_range = DatetimeRange(since="2023-01-01", until="2023-01-03")
+    indicators = [
+        views_klass(object_id=f"uuid://activity{i}", span_range=span_range)
+        for i in range(3)
+    ]
+    get_top_counts_mock = AsyncMock(
+        return_value=[ActivityCount(iri="uuid://activity1", count=2)]
+    )
+    monkeypatch.setattr("warren_moodle.api.get_top_counts", get_top_counts_mock)
+
+    with patch.object(
+        indicator_klass, "get_views_indicators", return_value=indicators
+    ) as mock_get_views_indicators:
+        response = await http_client.get(
+            "/api/v1/moodle/top",
+            params={
+                "since": "2023-01-01",
+                "until": "2023-01-03",
+                "unique": unique,
+                "size": 1,
+            },
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert response.status_code == 200
+    assert response.json() == [{"iri": "uuid://activity1", "count": 2}]
+    mock_get_views_indicators.assert_called_once()
+    get_top_counts_mock.assert_awaited_once_with(indicators, 1)
+
+    response = await http_client.get(
+        "/api/v1/moodle/top",
+        params={"size": 0},
+        headers={"Authorization": f"Bearer {token}"},
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("if_none_match", [None, "*"])
+async def test_course_top_views_empty_course(
+    http_client: httpx.AsyncClient, if_none_match
+):
+    """Test the course top views endpoint when the course has no activities."""
+    token = forge_lti_token(course_id="uuid://c16e5e8e-d0c3-47a8-81b6-0d8fb971d2e0")
+    headers = {"Authorization": f"Bearer {token}"}
+    if if_none_match is not None:
+        headers["If-None-Match"] = if_none_match
+
+    with patch.object(CourseTopViews, "get_views_indicators", return_value=[]):
+        response = await http_client.get(
+            "/api/v1/moodle/top",
+            params={"since": "2023-01-01", "until": "2023-01-03"},
+            headers=headers,
+        )
+
+    assert response.status_code == 200
+    assert response.json() == []
+    assert "ETag" not in response.headers
+
+
+@pytest.mark.anyio
+async def test_course_top_views_errors(http_client: httpx.AsyncClient):
+    """Test the course top views endpoint when activities cannot be fetched."""
+    token = forge_lti_token(course_id="uuid://c16e5e8e-d0c3-47a8-81b6-0d8fb971d2e0")
+
+    with patch.object(
+        CourseTopViews,
+        "get_views_indicators",
+        side_effect=LrsClientException("Failed to fetch statements"),
+    ):
+        response = await http_client.get(
+            "/api/v1/moodle/top",
+            params={"since": "2023-01-01", "until": "2023-01-03"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+
+    assert response.status_code == 500
+    assert response.json() == {
+        "detail": "An error occurred while computing the most viewed ressources"
+    }
@@ -14,7 +14,13 @@ from pytest_httpx import HTTPXMock
 from sqlmodel import Session
 from warren.backends import lrs_client
 from warren.filters import DatetimeRange
-from warren.models import DailyCount, DailyCounts, DailyUniqueCount, DailyUniqueCounts
+from warren.models import (
+    ActivityCount,
+    DailyCount,
+    DailyCounts,
+    DailyUniqueCount,
+    DailyUniqueCounts,
+)
 from warren.xapi import StatementsTransformer
 from warren.xi.client import CRUDExperience
 from warren.xi.enums import AggregationLevel
@@ -27,6 +33,7 @@ from warren_moodle.indicators import (
     CourseDailyMixin,
     CourseDailyUniqueViews,
     CourseDailyViews,
+    CourseTopViews,
     DailyUniqueViews,
     DailyViews,
 )
@@ -962,3 +969,55 @@ async def test_course_daily_unique_views_compute_with_modname(
                 ],
             ),
         )
+
+
+@pytest.mark.anyio
+async def test_course_top_views_compute(db_session: Session, monkeypatch):
+    """Test CourseTopViews computing returns the most viewed course activities."""
+    RelationFactory.__session__ = db_session
+
+    # Mock XI response
+    course = ExperienceRead(
+        **ExperienceFactory.build_dict(
+            exclude=set(),
+            id="ce0927fa-5f72-4623-9d29-37ef45c39609",
+            aggregation_level=AggregationLevel.THREE,
+        )
+    )
+    course.relations_target = [RelationFactory.build() for _ in range(3)]
+    contents = [
+        ExperienceRead(
+            **ExperienceFactory.build_dict(
+                exclude=set(),
+                id=relation.source_id,
+                aggregation_level=AggregationLevel.TWO,
+                technical_datatypes=["mod_url"],
+                relations_source=[relation],
+            )
+        )
+        for relation in course.relations_target
+    ]
+    monkeypatch.setattr(
+        CRUDExperience, "get", AsyncMock(side_effect=[course] + contents)
+    )
+
+    # The second activity is the most viewed, then the third one
+    views = {content.iri: count for content, count in zip(contents, (1, 5, 2))}
+
+    async def compute(self) -> DailyCounts:
+        return DailyCounts(
+            total=views[self.object_id],
+            counts=[DailyCount(date=self.since.date(), count=views[self.object_id])],
+        )
+
+    monkeypatch.setattr(DailyViews, "compute", compute)
+
+    indicator = CourseTopViews(
+        course_id="course1",
+        span_range=DatetimeRange(since="2020-01-01", until="2020-01-01"),
+        size=2,
+    )
+    assert await indicator.compute() == [
+        ActivityCount(iri=contents[1].iri, count=5),
+        ActivityCount(iri=contents[2].iri, count=2),
+    ]
@@ -1,49 +1,77 @@
 """Warren API v1 Moodle router."""
 
 import logging
-from typing import List, Optional
+from typing import List, Optional, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from typing_extensions import Annotated  # python <3.9 compat
 from warren.exceptions import LrsClientException
 from warren.fields import IRI
-from warren.filters import BaseQueryFilters, DatetimeRange
-from warren.models import DailyCounts, DailyUniqueCounts, LTIToken
+from warren.filters import BaseQueryFilters, DatetimeRange, GranularityQueryFilters
+from warren.indicators.admission import set_current_tenant
+from warren.indicators.http import check_not_modified, set_cache_headers
+from warren.indicators.jobs import submit_job
+from warren.indicators.models import JobRead
+from warren.indicators.ranking import get_top_counts
+from warren.models import (
+    ActivityCount,
+    DailyCounts,
+    DailyUniqueCounts,
+    HourlyCounts,
+    LTIToken,
+)
 from warren.utils import get_lti_course_id, get_lti_token
 
 from .indicators import (
     CourseDailyUniqueViews,
     CourseDailyViews,
+    CourseTopUniqueViews,
+    CourseTopViews,
     DailyUniqueViews,
     DailyViews,
 )
 
 router = APIRouter(
     prefix="/moodle",
+    dependencies=[Depends(set_current_tenant)],
 )
 
 logger = logging.getLogger(__name__)
 
 
 @router.get("/{activity_id:path}/views")
-async def views(
+async def views(  # noqa: PLR0913
     activity_id: IRI,
-    filters: Annotated[BaseQueryFilters, Depends()],
+    filters: Annotated[GranularityQueryFilters, Depends()],
     token: Annotated[LTIToken, Depends(get_lti_token)],
+    request: Request,
+    response: Response,
     unique: bool = False,
-) -> DailyCounts:
+) -> Union[DailyCounts, HourlyCounts]:
     """Number of views of course ressource in the `since` -> `until` date range."""
     # Switch/case pattern matching with the unique boolean tuple
     logger.debug("Start computing 'views' indicator")
     indicator_klass = DailyUniqueViews if unique else DailyViews
     indicator = indicator_klass(
-        object_id=activity_id, span_range=DatetimeRange.parse_obj(filters)
+        object_id=activity_id,
+        span_range=DatetimeRange.parse_obj(filters),
+        granularity=filters.granularity,
     )  # type: ignore[abstract]
     logger.debug("Will compute indicator %s", type(indicator).__name__)
     logger.debug(
         "From %s to %s", indicator.span_range.since, indicator.span_range.until
     )
 
+    await check_not_modified(request, [indicator])
+
     try:
         results = await indicator.get_or_compute()
     except (KeyError, AttributeError, LrsClientException) as exception:
@@ -57,14 +85,36 @@ async def views(
         results = results.to_daily_counts()
     logger.debug("Results = %s", results)
     logger.debug("Finish computing 'views' indicator")
+    await set_cache_headers(response, [indicator])
     return results
 
 
+@router.post("/{activity_id:path}/views/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def views_job(
+    activity_id: IRI,
+    filters: Annotated[GranularityQueryFilters, Depends()],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    unique: bool = False,
+) -> JobRead:
+    """Submit a job computing the number of views of a course ressource.
+
+    The job status and result are available from the `/jobs` endpoints.
+    """
+    indicator_klass = DailyUniqueViews if unique else DailyViews
+    indicator = indicator_klass(
+        object_id=activity_id,
+        span_range=DatetimeRange.parse_obj(filters),
+        granularity=filters.granularity,
+    )  # type: ignore[abstract]
+    return await submit_job(indicator, token)
+
+
 @router.get("/views")
-async def course_views(
+async def course_views(  # noqa: PLR0913
     course_id: Annotated[str, Depends(get_lti_course_id)],
     filters: Annotated[BaseQueryFilters, Depends()],
     token: Annotated[LTIToken, Depends(get_lti_token)],
+    request: Request,
     unique: bool = False,
     modname: Optional[List[str]] = None,
 ):
@@ -82,8 +132,11 @@ async def course_views(
         "From %s to %s", indicator.span_range.since, indicator.span_range.until
     )
 
+    await check_not_modified(request, [indicator])
+
     try:
-        results = await indicator.get_or_compute()
+        # Cached results are returned as is, without being deserialized
+        results = await indicator.get_or_compute_json()
     except (KeyError, AttributeError, LrsClientException) as exception:
         message = "An error occurred while computing the number of views"
         logger.exception("%s. Exception:", message)
@@ -93,4 +146,63 @@ async def course_views(
 
     logger.debug("Results = %s", results)
     logger.debug("Finish computing 'views' indicator")
+    response = Response(content=results, media_type="application/json")
+    await set_cache_headers(response, [indicator])
+    return response
+
+
+@router.post("/views/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def course_views_job(
+    course_id: Annotated[str, Depends(get_lti_course_id)],
+    filters: Annotated[BaseQueryFilters, Depends()],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    unique: bool = False,
+    modname: Optional[List[str]] = None,
+) -> JobRead:
+    """Submit a job computing the number of views of course ressources.
+
+    The job status and result are available from the `/jobs` endpoints.
+    """
+    indicator_klass = CourseDailyUniqueViews if unique else CourseDailyViews
+    indicator = indicator_klass(
+        course_id=course_id,
+        span_range=DatetimeRange.parse_obj(filters),
+        modname=modname,
+    )  # type: ignore[abstract]
+    return await submit_job(indicator, token)
+
+
+@router.get("/top")
+async def course_top_views(  # noqa: PLR0913
+    course_id: Annotated[str, Depends(get_lti_course_id)],
+    filters: Annotated[BaseQueryFilters, Depends()],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    request: Request,
+    response: Response,
+    size: Annotated[int, Query(ge=1, le=100)] = 10,
+    unique: bool = False,
+    modname: Optional[List[str]] = None,
+) -> List[ActivityCount]:
+    """Most viewed course ressources in the `since` -> `until` date range."""
+    logger.debug("Start computing 'top views' indicator")
+    indicator_klass = CourseTopUniqueViews if unique else CourseTopViews
+    indicator = indicator_klass(
+        course_id=course_id,
+        span_range=DatetimeRange.parse_obj(filters),
+        modname=modname,
+        size=size,
+    )  # type: ignore[abstract]
+    try:
+        indicators = await indicator.get_views_indicators()
+        await check_not_modified(request, indicators)
+        results = await get_top_counts(indicators, size)
+    except (KeyError, AttributeError, LrsClientException) as exception:
+        message = "An error occurred while computing the most viewed ressources"
+        logger.exception("%s. Exception:", message)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=message
+        ) from exception
+
+    logger.debug("Finish computing 'top views' indicator")
+    await set_cache_headers(response, indicators)
     return results
@@ -12,7 +12,8 @@ from warren.indicators import (
     DailyEvent,
     DailyUniqueEvent,
 )
-from warren.models import DailyCount, DailyUniqueCount
+from warren.indicators.ranking import get_top_counts
+from warren.models import ActivityCount, DailyCount, DailyUniqueCount
 from warren.xi.client import ExperienceIndex
 from warren.xi.exceptions import ExperienceIndexException
 
@@ -50,18 +51,18 @@ class DailyUniqueViews(DailyUniqueEvent):
     verb_id: str = "http://id.tincanapi.com/verb/viewed"
 
 
-class CourseDailyMixin(BaseIndicator, CacheMixin):
-    """Mixin class for computing daily and unique views of course activities.
+class CourseActivitiesMixin(BaseIndicator):
+    """Mixin class for indicators computed from course activities.
 
-    This class provides a common interface for fetching activities and computing
-    views or unique views for course-related activities.
+    This class provides a common interface for fetching course-related activities
+    from the Experience Index.
     """
 
-    views_indicator: Optional[Type[BaseDailyEvent]]
-
-    def __init__(self, course_id, span_range, modname=None):
-        """Instantiate the mixin for course daily indicator."""
-        super().__init__(course_id=course_id, span_range=span_range, modname=modname)
+    def __init__(self, course_id, span_range, modname=None, **kwargs):
+        """Instantiate the mixin for course activities indicator."""
+        super().__init__(
+            course_id=course_id, span_range=span_range, modname=modname, **kwargs
+        )
 
     def get_lrs_query(self):
         """Construct the LRS query for statements whose object is the course.
@@ -102,6 +103,16 @@ class CourseDailyMixin(BaseIndicator, CacheMixin):
 
         return activities
 
+
+class CourseDailyMixin(CourseActivitiesMixin, CacheMixin):
+    """Mixin class for computing daily and unique views of course activities.
+
+    This class provides a common interface for fetching activities and computing
+    views or unique views for course-related activities.
+    """
+
+    views_indicator: Optional[Type[BaseDailyEvent]]
+
     async def compute(self) -> List:
         """Compute and return the views of course-related activities."""
         if self.views_indicator is None:
@@ -143,3 +154,43 @@ class CourseDailyUniqueViews(CourseDailyMixin):
     """Class to compute daily unique views for course-related activities."""
 
     views_indicator = DailyUniqueViews
+
+
+class CourseTopMixin(CourseActivitiesMixin):
+    """Mixin class for ranking course activities by their number of views.
+
+    Views of course activities are computed from their cached daily frames,
+    only the `size` most viewed activities are returned.
+    """
+
+    views_indicator: Type[BaseDailyEvent]
+    size: int
+
+    def __init__(self, course_id, span_range, modname=None, size: int = 10):
+        """Instantiate the mixin for course top indicator."""
+        super().__init__(
+            course_id=course_id, span_range=span_range, modname=modname, size=size
+        )
+
+    async def get_views_indicators(self) -> List[BaseDailyEvent]:
+        """Get the views indicators of course-related activities."""
+        return [
+            self.views_indicator(object_id=activity.iri, span_range=self.span_range)
+            for activity in await self.fetch_activities()
+        ]
+
+    async def compute(self) -> List[ActivityCount]:
+        """Compute and return the most viewed course-related activities."""
+        return await get_top_counts(await self.get_views_indicators(), self.size)
+
+
+class CourseTopViews(CourseTopMixin):
+    """Class to rank course-related activities by their number of views."""
+
+    views_indicator = DailyViews
+
+
+class CourseTopUniqueViews(CourseTopMixin):
+    """Class to rank course-related activities by their number of unique views."""
+
+    views_indicator = DailyUniqueViews
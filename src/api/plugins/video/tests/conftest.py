@@ -10,6 +10,7 @@ from warren.tests.fixtures.db import (
     db_engine,
     db_session,
     force_db_test_session,
+    override_db_test_session,
 )
 
 
@@ -9,6 +9,8 @@ import pytest
 from pytest_httpx import HTTPXMock
 from ralph.models.xapi.concepts.constants.video import RESULT_EXTENSION_TIME
 from warren.backends import lrs_client
+from warren.indicators.admission import AdmissionController
+from warren.indicators.jobs import claim_job, run_job
 from warren_video.factories import LMSDownloadedVideoFactory, VideoPlayedFactory
 
 
@@ -538,3 +540,428 @@ async def test_unique_downloads_backend_query(
     }
 
     assert response.json() == expected_video_downloads
+
+
+@pytest.mark.anyio
+async def test_batch_views(
+    http_client: httpx.AsyncClient,
+    httpx_mock: HTTPXMock,
+    auth_headers: dict,
+    db_session,
+):
+    """Test the video batch views endpoint."""
+    video_ids = [
+        "uuid://ba4252ce-d042-43b0-92e8-f033f45612ee",
+        "uuid://2a0a0e52-7d4c-4d41-8e2b-5c2b8d1e5a5e",
+    ]
+
+    def lrs_response(request: httpx.Request):
+        """Return a view per day for the first video and none for the other."""
+        params = urllib.parse.parse_qs(request.url.query)
+        statements = []
+        if params.get(b"activity")[0].decode() == video_ids[0]:
+            statements = [
+                json.loads(
+                    VideoPlayedFactory.build(
+                        [
+                            {"object": {"id": video_ids[0]}},
+                            {"result": {"extensions": {RESULT_EXTENSION_TIME: 5}}},
+                            {"timestamp": params.get(b"since")[0].decode()},
+                        ]
+                    ).json()
+                )
+            ]
+        return httpx.Response(status_code=200, json={"statements": statements})
+
+    lrs_client.base_url = "http://fake-lrs.com"
+    httpx_mock.add_callback(
+        callback=lrs_response,
+        url=re.compile(r"^http://fake-lrs\.com/xAPI/statements\?.*$"),
+        method="GET",
+    )
+
+    response = await http_client.post(
+        url="/api/v1/video/views",
+        params={"since": "2020-01-01", "until": "2020-01-02"},
+        json=video_ids,
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        video_ids[0]: {
+            "total": 2,
+            "counts": [
+                {"date": "2020-01-01", "count": 1},
+                {"date": "2020-01-02", "count": 1},
+            ],
+        },
+        video_ids[1]: {
+            "total": 0,
+            "counts": [
+                {"date": "2020-01-01", "count": 0},
+                {"date": "2020-01-02", "count": 0},
+            ],
+        },
+    }
+    # A query per video and per day
+    assert len(httpx_mock.get_requests()) == 4
+
+    # Results are now cached
+    response = await http_client.post(
+        url="/api/v1/video/views",
+        params={"since": "2020-01-01", "until": "2020-01-02", "unique": True},
+        json=video_ids[:1],
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json()[video_ids[0]]["total"] == 1
+    assert len(httpx_mock.get_requests()) == 6
+
+
+@pytest.mark.anyio
+async def test_views_granularity(
+    http_client: httpx.AsyncClient,
+    httpx_mock: HTTPXMock,
+    auth_headers: dict,
+    db_session,
+):
+    """Test the video views endpoint results in time buckets."""
+    video_id = "uuid://ba4252ce-d042-43b0-92e8-f033f45612ee"
+
+    def lrs_response(request: httpx.Request):
+        """Return a view per cached frame."""
+        params = urllib.parse.parse_qs(request.url.query)
+        statement = VideoPlayedFactory.build(
+            [
+                {"object": {"id": video_id}},
+                {"result": {"extensions": {RESULT_EXTENSION_TIME: 5}}},
+                {"timestamp": params.get(b"since")[0].decode()},
+            ]
+        )
+        return httpx.Response(
+            status_code=200, json={"statements": [json.loads(statement.json())]}
+        )
+
+    lrs_client.base_url = "http://fake-lrs.com"
+    httpx_mock.add_callback(
+        callback=lrs_response,
+        url=re.compile(r"^http://fake-lrs\.com/xAPI/statements\?.*$"),
+        method="GET",
+    )
+    url = f"/api/v1/video/{video_id}/views"
+
+    # 2020-01-01 is a Wednesday
+    response = await http_client.get(
+        url,
+        params={"since": "2020-01-01", "until": "2020-01-07", "granularity": "week"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "total": 7,
+        "counts": [
+            {"date": "2019-12-30", "count": 5},
+            {"date": "2020-01-06", "count": 2},
+        ],
+    }
+    assert len(httpx_mock.get_requests()) == 7
+
+    # Monthly results are summed from cached daily frames
+    response = await http_client.get(
+        url,
+        params={"since": "2020-01-01", "until": "2020-01-07", "granularity": "month"},
+        headers=auth_headers,
+    )
+    assert response.json() == {
+        "total": 7,
+        "counts": [{"date": "2020-01-01", "count": 7}],
+    }
+    assert len(httpx_mock.get_requests()) == 7
+
+    # Hourly results are computed from hourly frames
+    response = await http_client.get(
+        url,
+        params={
+            "since": "2020-01-01T10:00:00+00:00",
+            "until": "2020-01-01T11:30:00+00:00",
+            "granularity": "hour",
+        },
+        headers=auth_headers,
+    )
+    assert response.json() == {
+        "total": 2,
+        "counts": [
+            {"date": "2020-01-01T10:00:00+00:00", "count": 1},
+            {"date": "2020-01-01T11:00:00+00:00", "count": 1},
+        ],
+    }
+    assert len(httpx_mock.get_requests()) == 9
+
+    response = await http_client.get(
+        url,
+        params={"since": "2020-01-01", "until": "2020-01-31", "granularity": "hour"},
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+    assert response.json() == {
+        "detail": "Date/time range is too greedy for hourly results."
+    }
+
+
+@pytest.mark.anyio
+async def test_top_views(
+    http_client: httpx.AsyncClient,
+    httpx_mock: HTTPXMock,
+    auth_headers: dict,
+    db_session,
+):
+    """Test the video top views endpoint."""
+    views = {
+        "uuid://ba4252ce-d042-43b0-92e8-f033f45612ee": 1,
+        "uuid://2a0a0e52-7d4c-4d41-8e2b-5c2b8d1e5a5e": 3,
+        "uuid://5d3f3e8a-0c8e-4d3a-9f0b-6f3c1b2a7e4d": 2,
+    }
+
+    def lrs_response(request: httpx.Request):
+        """Return views of each video."""
+        params = urllib.parse.parse_qs(request.url.query)
+        video_id = params.get(b"activity")[0].decode()
+        statements = [
+            json.loads(
+                VideoPlayedFactory.build(
+                    [
+                        {"object": {"id": video_id}},
+                        {"result": {"extensions": {RESULT_EXTENSION_TIME: 5}}},
+                        {"timestamp": params.get(b"since")[0].decode()},
+                    ]
+                ).json()
+            )
+            for _ in range(views[video_id])
+        ]
+        return httpx.Response(status_code=200, json={"statements": statements})
+
+    lrs_client.base_url = "http://fake-lrs.com"
+    httpx_mock.add_callback(
+        callback=lrs_response,
+        url=re.compile(r"^http://fake-lrs\.com/xAPI/statements\?.*$"),
+        method="GET",
+    )
+
+    response = await http_client.post(
+        url="/api/v1/video/top",
+        params={"since": "2020-01-01", "until": "2020-01-02", "size": 2},
+        json=list(views),
+        headers=auth_headers,
+    )
+    assert response.status_code == 200
+    assert response.json() == [
+        {"iri": "uuid://2a0a0e52-7d4c-4d41-8e2b-5c2b8d1e5a5e", "count": 6},
+        {"iri": "uuid://5d3f3e8a-0c8e-4d3a-9f0b-6f3c1b2a7e4d", "count": 4},
+    ]
+    assert "ETag" in response.headers
+    # A query per video and per day
+    assert len(httpx_mock.get_requests()) == 6
+
+    # Results are computed from cached daily views
+    response = await http_client.post(
+        url="/api/v1/video/top",
+        params={"since": "2020-01-01", "until": "2020-01-02", "size": 1},
+        json=list(views),
+        headers=auth_headers,
+    )
+    assert response.json() == [
+        {"iri": "uuid://2a0a0e52-7d4c-4d41-8e2b-5c2b8d1e5a5e", "count": 6},
+    ]
+    assert len(httpx_mock.get_requests()) == 6
+
+    # Duplicated videos are ranked once
+    response = await http_client.post(
+        url="/api/v1/video/top",
+        params={"since": "2020-01-01", "until": "2020-01-02", "size": 2},
+        json=[*views, *views],
+        headers=auth_headers,
+    )
+    assert [count["count"] for count in response.json()] == [6, 4]
+
+    response = await http_client.post(
+        url="/api/v1/video/top",
+        params={"size": 101},
+        json=list(views),
+        headers=auth_headers,
+    )
+    assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_batch_downloads(
+    http_client: httpx.AsyncClient,
+    httpx_mock: HTTPXMock,
+    auth_headers: dict,
+    db_session,
+):
+    """Test the video batch downloads endpoint."""
+    lrs_client.base_url = "http://fake-lrs.com"
+    httpx_mock.add_response(
+        url=re.compile(r"^http://fake-lrs\.com/xAPI/statements\?.*$"),
+        method="GET",
+        json={"statements": []},
+    )
+
+    response = await http_client.post(
+        url="/api/v1/video/downloads",
+        params={"since": "2020-01-01", "until": "2020-01-01"},
+        json=["uuid://foo", "uuid://bar", "uuid://foo"],
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 200
+    assert response.json() == {
+        video_id: {"total": 0, "counts": [{"date": "2020-01-01", "count": 0}]}
+        for video_id in ("uuid://foo", "uuid://bar")
+    }
+    # Duplicated videos are computed once
+    assert len(httpx_mock.get_requests()) == 2
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("endpoint", ["views", "downloads"])
+async def test_batch_invalid_video_ids(
+    http_client: httpx.AsyncClient, auth_headers: dict, endpoint: str
+):
+    """Test the video batch endpoints validate requested video ids."""
+    for video_ids in ([], ["foo"], [f"uuid://{i}" for i in range(101)]):
+        response = await http_client.post(
+            url=f"/api/v1/video/{endpoint}",
+            params={"since": "2020-01-01", "until": "2020-01-01"},
+            json=video_ids,
+            headers=auth_headers,
+        )
+        assert response.status_code == 422
+
+
+@pytest.mark.anyio
+async def test_views_conditional_requests(
+    http_client: httpx.AsyncClient,
+    httpx_mock: HTTPXMock,
+    auth_headers: dict,
+    db_session,
+):
+    """Test the video views endpoint supports HTTP conditional requests."""
+    lrs_client.base_url = "http://fake-lrs.com"
+    httpx_mock.add_response(
+        url=re.compile(r"^http://fake-lrs\.com/xAPI/statements\?.*$"),
+        method="GET",
+        json={"statements": []},
+    )
+    url = "/api/v1/video/uuid://ba4252ce-d042-43b0-92e8-f033f45612ee/views"
+    params = {"since": "2020-01-01", "until": "2020-01-02"}
+
+    response = await http_client.get(url, params=params, headers=auth_headers)
+    assert response.status_code == 200
+    assert response.headers["Cache-Control"] == "private, max-age=86400"
+    assert "Last-Modified" in response.headers
+    etag = response.headers["ETag"]
+    assert len(httpx_mock.get_requests()) == 2
+
+    # Cached results have not been modified: they are not computed again
+    response = await http_client.get(
+        url, params=params, headers={**auth_headers, "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert len(httpx_mock.get_requests()) == 2
+
+    # Another indicator is requested
+    response = await http_client.get(
+        url,
+        params={**params, "unique": True},
+        headers={**auth_headers, "If-None-Match": etag},
+    )
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+
+
+@pytest.mark.anyio
+async def test_views_job(
+    http_client: httpx.AsyncClient,
+    httpx_mock: HTTPXMock,
+    auth_headers: dict,
+    db_session,
+):
+    """Test computing video views asynchronously."""
+    lrs_client.base_url = "http://fake-lrs.com"
+    httpx_mock.add_response(
+        url=re.compile(r"^http://fake-lrs\.com/xAPI/statements\?.*$"),
+        method="GET",
+        json={"statements": []},
+    )
+    url = "/api/v1/video/uuid://ba4252ce-d042-43b0-92e8-f033f45612ee/views/jobs"
+    params = {"since": "2020-01-01", "until": "2020-01-02", "unique": True}
+
+    response = await http_client.post(url, params=params, headers=auth_headers)
+    assert response.status_code == 202
+    job = response.json()
+    assert job["status"] == "pending"
+
+    # Identical pending jobs are not submitted twice
+    response = await http_client.post(url, params=params, headers=auth_headers)
+    assert response.json()["id"] == job["id"]
+
+    await run_job(db_session, claim_job(db_session))
+
+    response = await http_client.get(f"/api/v1/jobs/{job['id']}", headers=auth_headers)
+    assert response.json()["status"] == "done"
+    response = await http_client.get(
+        f"/api/v1/jobs/{job['id']}/result", headers=auth_headers
+    )
+    assert response.json() == {
+        "total": 0,
+        "counts": [
+            {"date": "2020-01-01", "count": 0},
+            {"date": "2020-01-02", "count": 0},
+        ],
+    }
+
+
+@pytest.mark.anyio
+async def test_views_admission_control(
+    http_client: httpx.AsyncClient,
+    httpx_mock: HTTPXMock,
+    auth_headers: dict,
+    db_session,
+    monkeypatch,
+):
+    """Test cold computations are charged to the LTI consumer site quota."""
+    controller = AdmissionController()
+    monkeypatch.setattr("warren.indicators.mixins.admission", controller)
+    lrs_client.base_url = "http://fake-lrs.com"
+    httpx_mock.add_response(
+        url=re.compile(r"^http://fake-lrs\.com/xAPI/statements\?.*$"),
+        method="GET",
+        json={"statements": []},
+        status_code=200,
+    )
+    url = "/api/v1/video/uuid://fake-uuid/views"
+
+    response = await http_client.get(
+        url, params={"since": "2023-01-01", "until": "2023-01-03"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+    quota = controller.quotas["http://fake-lms.com"]
+    assert quota.burst - quota.tokens == pytest.approx(3, abs=1)
+
+    # Cached results are returned to tenants exceeding their quota
+    quota.tokens = -10.5 * quota.rate
+    response = await http_client.get(
+        url, params={"since": "2023-01-01", "until": "2023-01-03"}, headers=auth_headers
+    )
+    assert response.status_code == 200
+
+    response = await http_client.get(
+        url, params={"since": "2023-01-01", "until": "2023-01-04"}, headers=auth_headers
+    )
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "11"
+    assert response.json() == {"detail": "Indicators computation quota exceeded"}
@@ -13,8 +13,9 @@ from warren.backends import lrs_client
 from warren.filters import DatetimeRange
 from warren.models import DailyUniqueCount
 from warren.xapi import StatementsTransformer
+from warren_video.conf import settings as video_plugin_settings
 from warren_video.factories import VideoPlayedFactory
-from warren_video.indicators import DailyUniqueViews
+from warren_video.indicators import DailyUniqueViews, DailyViews
 
 
 @pytest.mark.anyio
@@ -105,3 +106,51 @@ async def test_daily_unique_views(httpx_mock: HTTPXMock, db_session):
         DailyUniqueCount(date="2020-01-02", count=0, users=set()),
         DailyUniqueCount(date="2020-01-03", count=0, users=set()),
     ]
+
+
+def test_daily_views_missing_time_extension():
+    """Test views without a time result extension are not counted."""
+    statements = [
+        json.loads(
+            VideoPlayedFactory.build(
+                [
+                    {"result": {"extensions": {RESULT_EXTENSION_TIME: 10}}},
+                    {"timestamp": f"2020-01-01T00:00:{second}.000+00:00"},
+                ]
+            ).json()
+        )
+        for second in (10, 20)
+    ]
+    span_range = DatetimeRange(since="2020-01-01", until="2020-01-01")
+    indicator = DailyViews(object_id="uuid://foo", span_range=span_range)
+
+    assert indicator.compute_from_statements(statements).total == 2
+
+    statements[0]["result"]["extensions"].pop(RESULT_EXTENSION_TIME)
+    assert indicator.compute_from_statements(statements).total == 1
+
+    statements[1].pop("result")
+    assert indicator.compute_from_statements(statements).total == 0
+
+
+def test_daily_views_time_threshold(monkeypatch):
+    """Test the views time threshold is read when computing the indicator."""
+    statements = [
+        json.loads(
+            VideoPlayedFactory.build(
+                [
+                    {"result": {"extensions": {RESULT_EXTENSION_TIME: time}}},
+                    {"timestamp": "2020-01-01T00:00:10.000+00:00"},
+                ]
+            ).json()
+        )
+        for time in (10, 40)
+    ]
+    span_range = DatetimeRange(since="2020-01-01", until="2020-01-01")
+    indicator = DailyViews(object_id="uuid://foo", span_range=span_range)
+
+    monkeypatch.setattr(video_plugin_settings, "VIEWS_COUNT_TIME_THRESHOLD", 30)
+    assert indicator.compute_from_statements(statements).total == 1
+
+    monkeypatch.setattr(video_plugin_settings, "VIEWS_COUNT_TIME_THRESHOLD", 50)
+    assert indicator.compute_from_statements(statements).total == 2
@@ -1,13 +1,36 @@
 """Warren API v1 video router."""
 
 import logging
+from typing import Dict, List, Union
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
 from typing_extensions import Annotated  # python <3.9 compat
+from warren.conf import settings
 from warren.exceptions import LrsClientException
 from warren.fields import IRI
-from warren.filters import BaseQueryFilters, DatetimeRange
-from warren.models import DailyCounts, DailyUniqueCounts, LTIToken
+from warren.filters import BaseQueryFilters, DatetimeRange, GranularityQueryFilters
+from warren.indicators import IncrementalCacheMixin
+from warren.indicators.admission import set_current_tenant
+from warren.indicators.http import check_not_modified, set_cache_headers
+from warren.indicators.jobs import submit_job
+from warren.indicators.models import JobRead
+from warren.indicators.ranking import get_top_counts
+from warren.models import (
+    ActivityCount,
+    DailyCounts,
+    DailyUniqueCounts,
+    HourlyCounts,
+    LTIToken,
+)
 from warren.utils import get_lti_token
 
 from .indicators import (
@@ -21,36 +44,178 @@ from .indicators import (
 
 router = APIRouter(
     prefix="/video",
+    dependencies=[Depends(set_current_tenant)],
 )
 
 logger = logging.getLogger(__name__)
 
+VIEWS_INDICATORS = {
+    (True, True): DailyUniqueCompletedViews,
+    (True, False): DailyCompletedViews,
+    (False, True): DailyUniqueViews,
+    (False, False): DailyViews,
+}
+VideoIds = Annotated[
+    List[IRI], Body(min_items=1, max_items=settings.INDICATORS_BATCH_MAX_SIZE)
+]
+
+
+@router.post("/views")
+async def batch_views(  # noqa: PLR0913
+    video_ids: VideoIds,
+    filters: Annotated[GranularityQueryFilters, Depends()],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    request: Request,
+    response: Response,
+    complete: bool = False,
+    unique: bool = False,
+) -> Dict[str, Union[DailyCounts, HourlyCounts]]:
+    """Number of views for each of `video_ids` in the `since` -> `until` range."""
+    # Identical videos are computed (and returned) once
+    video_ids = list(dict.fromkeys(video_ids))
+    logger.debug("Start computing 'views' indicator for %d videos", len(video_ids))
+    span_range = DatetimeRange.parse_obj(filters)
+    indicators = [
+        VIEWS_INDICATORS[(complete, unique)](
+            object_id=video_id,
+            span_range=span_range,
+            granularity=filters.granularity,
+        )  # type: ignore[abstract]
+        for video_id in video_ids
+    ]
+
+    await check_not_modified(request, indicators)
+
+    try:
+        results = await IncrementalCacheMixin.get_or_compute_many(indicators)
+    except (KeyError, AttributeError, LrsClientException) as exception:
+        message = "An error occurred while computing the number of views"
+        logger.exception("%s. Exception:", message)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=message
+        ) from exception
+
+    logger.debug("Finish computing 'views' indicator for %d videos", len(video_ids))
+    await set_cache_headers(response, indicators)
+    return {
+        video_id: (
+            result.to_daily_counts()
+            if isinstance(result, DailyUniqueCounts)
+            else result
+        )
+        for video_id, result in zip(video_ids, results)
+    }
+
+
+@router.post("/downloads")
+async def batch_downloads(  # noqa: PLR0913
+    video_ids: VideoIds,
+    filters: Annotated[GranularityQueryFilters, Depends()],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    request: Request,
+    response: Response,
+    unique: bool = False,
+) -> Dict[str, Union[DailyCounts, HourlyCounts]]:
+    """Number of downloads for each of `video_ids` in the `since` -> `until` range."""
+    # Identical videos are computed (and returned) once
+    video_ids = list(dict.fromkeys(video_ids))
+    logger.debug("Start computing 'downloads' indicator for %d videos", len(video_ids))
+    span_range = DatetimeRange.parse_obj(filters)
+    indicator_klass = DailyUniqueDownloads if unique else DailyDownloads
+    indicators = [
+        indicator_klass(
+            object_id=video_id,
+            span_range=span_range,
+            granularity=filters.granularity,
+        )
+        for video_id in video_ids
+    ]
+
+    await check_not_modified(request, indicators)
+
+    try:
+        results = await IncrementalCacheMixin.get_or_compute_many(indicators)
+    except (KeyError, AttributeError, LrsClientException) as exception:
+        message = "An error occurred while computing the number of downloads"
+        logger.exception("%s. Exception:", message)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=message
+        ) from exception
+
+    logger.debug("Finish computing 'downloads' indicator for %d videos", len(video_ids))
+    await set_cache_headers(response, indicators)
+    return {
+        video_id: (
+            result.to_daily_counts()
+            if isinstance(result, DailyUniqueCounts)
+            else result
+        )
+        for video_id, result in zip(video_ids, results)
+    }
+
+
+@router.post("/top")
+async def top_views(  # noqa: PLR0913
+    video_ids: VideoIds,
+    filters: Annotated[BaseQueryFilters, Depends()],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    request: Request,
+    response: Response,
+    size: Annotated[int, Query(ge=1, le=100)] = 10,
+    complete: bool = False,
+    unique: bool = False,
+) -> List[ActivityCount]:
+    """Most viewed videos of `video_ids` in the `since` -> `until` range."""
+    # Identical videos are ranked once
+    video_ids = list(dict.fromkeys(video_ids))
+    logger.debug("Start computing 'top views' indicator for %d videos", len(video_ids))
+    span_range = DatetimeRange.parse_obj(filters)
+    indicators = [
+        VIEWS_INDICATORS[(complete, unique)](object_id=video_id, span_range=span_range)  # type: ignore[abstract]
+        for video_id in video_ids
+    ]
+
+    await check_not_modified(request, indicators)
+
+    try:
+        results = await get_top_counts(indicators, size)
+    except (KeyError, AttributeError, LrsClientException) as exception:
+        message = "An error occurred while computing the most viewed videos"
+        logger.exception("%s. Exception:", message)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=message
+        ) from exception
+
+    logger.debug("Finish computing 'top views' indicator")
+    await set_cache_headers(response, indicators)
+    return results
+
 
 @router.get("/{video_id:path}/views")
-async def views(
+async def views(  # noqa: PLR0913
     video_id: IRI,
-    filters: Annotated[BaseQueryFilters, Depends()],
+    filters: Annotated[GranularityQueryFilters, Depends()],
     token: Annotated[LTIToken, Depends(get_lti_token)],
+    request: Request,
+    response: Response,
     complete: bool = False,
     unique: bool = False,
-) -> DailyCounts:
+) -> Union[DailyCounts, HourlyCounts]:
     """Number of views for `video_id` in the `since` -> `until` date range."""
     # Switch/case pattern matching with the (complete, unique) boolean tuple
     logger.debug("Start computing 'views' indicator")
-    klass_mapping = {
-        (True, True): DailyUniqueCompletedViews,
-        (True, False): DailyCompletedViews,
-        (False, True): DailyUniqueViews,
-        (False, False): DailyViews,
-    }
-    indicator = klass_mapping.get((complete, unique), DailyViews)(
-        object_id=video_id, span_range=DatetimeRange.parse_obj(filters)
+    indicator = VIEWS_INDICATORS.get((complete, unique), DailyViews)(
+        object_id=video_id,
+        span_range=DatetimeRange.parse_obj(filters),
+        granularity=filters.granularity,
     )  # type: ignore[abstract]
     logger.debug("Will compute indicator %s", type(indicator).__name__)
     logger.debug(
         "From %s to %s", indicator.span_range.since, indicator.span_range.until
     )
 
+    await check_not_modified(request, [indicator])
+
     try:
         results = await indicator.get_or_compute()
     except (KeyError, AttributeError, LrsClientException) as exception:
@@ -64,27 +229,54 @@ async def views(
         results = results.to_daily_counts()
     logger.debug("Results = %s", results)
     logger.debug("Finish computing 'views' indicator")
+    await set_cache_headers(response, [indicator])
     return results
 
 
+@router.post("/{video_id:path}/views/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def views_job(
+    video_id: IRI,
+    filters: Annotated[GranularityQueryFilters, Depends()],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    complete: bool = False,
+    unique: bool = False,
+) -> JobRead:
+    """Submit a job computing the number of views for `video_id`.
+
+    The job status and result are available from the `/jobs` endpoints.
+    """
+    indicator = VIEWS_INDICATORS[(complete, unique)](
+        object_id=video_id,
+        span_range=DatetimeRange.parse_obj(filters),
+        granularity=filters.granularity,
+    )  # type: ignore[abstract]
+    return await submit_job(indicator, token)
+
+
 @router.get("/{video_id:path}/downloads")
-async def downloads(
+async def downloads(  # noqa: PLR0913
     video_id: IRI,
-    filters: Annotated[BaseQueryFilters, Depends()],
+    filters: Annotated[GranularityQueryFilters, Depends()],
     token: Annotated[LTIToken, Depends(get_lti_token)],
+    request: Request,
+    response: Response,
     unique: bool = False,
-) -> DailyCounts:
+) -> Union[DailyCounts, HourlyCounts]:
     """Number of downloads for `video_id` in the `since` -> `until` date range."""
     logger.debug("Start computing 'downloads' indicator")
     indicator_klass = DailyUniqueDownloads if unique else DailyDownloads
     indicator = indicator_klass(
-        object_id=video_id, span_range=DatetimeRange.parse_obj(filters)
+        object_id=video_id,
+        span_range=DatetimeRange.parse_obj(filters),
+        granularity=filters.granularity,
     )
     logger.debug("Will compute indicator %s", type(indicator).__name__)
     logger.debug(
         "From %s to %s", indicator.span_range.since, indicator.span_range.until
     )
 
+    await check_not_modified(request, [indicator])
+
     try:
         results = await indicator.get_or_compute()
     except (KeyError, AttributeError, LrsClientException) as exception:
@@ -98,4 +290,25 @@ async def downloads(
         results = results.to_daily_counts()
     logger.debug("Results = %s", results)
     logger.debug("Finish computing 'downloads' indicator")
+    await set_cache_headers(response, [indicator])
     return results
+
+
+@router.post("/{video_id:path}/downloads/jobs", status_code=status.HTTP_202_ACCEPTED)
+async def downloads_job(
+    video_id: IRI,
+    filters: Annotated[GranularityQueryFilters, Depends()],
+    token: Annotated[LTIToken, Depends(get_lti_token)],
+    unique: bool = False,
+) -> JobRead:
+    """Submit a job computing the number of downloads for `video_id`.
+
+    The job status and result are available from the `/jobs` endpoints.
+    """
+    indicator_klass = DailyUniqueDownloads if unique else DailyDownloads
+    indicator = indicator_klass(
+        object_id=video_id,
+        span_range=DatetimeRange.parse_obj(filters),
+        granularity=filters.granularity,
+    )
+    return await submit_job(indicator, token)
@@ -1,13 +1,13 @@
 """"Warren video indicators."""
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Tuple
 
-import pandas as pd
 from ralph.models.xapi.concepts.constants.video import RESULT_EXTENSION_TIME
 from ralph.models.xapi.concepts.verbs.scorm_profile import CompletedVerb
 from ralph.models.xapi.concepts.verbs.tincan_vocabulary import DownloadedVerb
 from ralph.models.xapi.concepts.verbs.video import PlayedVerb
 from warren.indicators import BaseDailyEvent, DailyEvent, DailyUniqueEvent
+from warren.predicates import Column, Predicate
 
 from .conf import settings as video_plugin_settings
 
@@ -23,22 +23,18 @@ class DailyViewsMixin(_Base):
     Calculate the total and daily counts of views.
     """
 
-    def filter_statements(self, statements: pd.DataFrame) -> pd.DataFrame:
-        """Filter view statements based on additional conditions.
-
-        This method filters the view statements inherited from the base indicator.
-        In addition to the base filtering, view statements are further filtered
-        based on their duration to match a minimum viewing threshold.
-        """
-        statements = super().filter_statements(statements)
-
-        def filter_view_duration(row):
-            return (
-                row[f"result.extensions.{RESULT_EXTENSION_TIME}"]
-                <= video_plugin_settings.VIEWS_COUNT_TIME_THRESHOLD
-            )
-
-        return statements[statements.apply(filter_view_duration, axis=1)]
+    statement_paths = (
+        *BaseDailyEvent.statement_paths,
+        f"result.extensions.{RESULT_EXTENSION_TIME}",
+    )
+
+    @property
+    def predicates(self) -> Tuple[Predicate, ...]:
+        """Filter views based on their duration to match a viewing threshold."""
+        return (
+            Column(f"result.extensions.{RESULT_EXTENSION_TIME}")
+            <= video_plugin_settings.VIEWS_COUNT_TIME_THRESHOLD,
+        )
 
 
 class DailyViews(DailyViewsMixin, DailyEvent):